@@ -1,8 +1,8 @@
 """Developments API - 開発進捗管理"""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Response, Query
 from fastapi.responses import StreamingResponse
-from typing import List, Optional
+from typing import List, Optional, Literal, Union
 from datetime import datetime
 import uuid
 import asyncio
@@ -10,8 +10,11 @@ import io
 import zipfile
 from pydantic import BaseModel
 
-from app.models.development import Development, DevelopmentStatus, AgentLogEntry
-from app.services.database import db
+from app.models.development import Development, DevelopmentStatus, DevelopmentSummary, AgentLogEntry
+from app.services.database import db, LIST_PAGE_SIZE, MAX_LIST_PAGE_SIZE
+from app.services.db_metrics import call_budget
+from app.services.artifact_store import artifact_store
+from app.services.development_progress import DevelopmentProgressBuffer
 from app.services.github_service import github_service
 from app.agents.tech_lead import TechLeadAgent
 from app.agents.coder import CoderAgent
@@ -25,40 +28,67 @@ class StartDevelopmentRequest(BaseModel):
     project_id: str = "default"
 
 
-@router.get("/", response_model=List[Development])
+@router.get("/", response_model=Union[List[Development], List[DevelopmentSummary]])
+@call_budget(reads=2)
 async def list_developments(
+    response: Response,
     project_id: str = "default",
     status: Optional[DevelopmentStatus] = None,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=MAX_LIST_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
 ):
-    """開発進捗一覧を取得"""
+    """
+    開発進捗一覧を取得（作成日時の新しい順）
+
+    limit 件（既定 100・最大 500）ずつ返し、続きがあれば X-Next-Cursor ヘッダーのカーソルを cursor に渡す。
+    view=summary では生成コード・ログ・設計書を取得しない（詳細は個別取得APIで）
+    """
+    summary = view == "summary"
     devs_data = await db.list_developments(
         project_id=project_id,
         status=status.value if status else None,
+        limit=limit,
+        start_after=cursor,
+        fields=list(DevelopmentSummary.model_fields) if summary else None,
     )
-    devs = [Development(**d) for d in devs_data]
-    return sorted(devs, key=lambda x: x.created_at, reverse=True)
+    if len(devs_data) == limit:
+        response.headers["X-Next-Cursor"] = db.document_cursor(devs_data[-1], "created_at")
+    if summary:
+        return [DevelopmentSummary(**d) for d in devs_data]
+    devs_data = await artifact_store.load_developments(devs_data)
+    return [Development(**d) for d in devs_data]
 
 
 @router.get("/{development_id}", response_model=Development)
+@call_budget(reads=2)
 async def get_development(development_id: str):
     """開発進捗詳細を取得"""
     dev_data = await db.get_development(development_id)
     if not dev_data:
         raise HTTPException(status_code=404, detail="Development not found")
+    dev_data["generated_files"] = await artifact_store.load_files(dev_data.get("generated_files", []))
     return Development(**dev_data)
 
 
 @router.get("/{development_id}/logs", response_model=List[AgentLogEntry])
-async def get_agent_logs(development_id: str):
-    """エージェント動作ログを取得"""
-    dev_data = await db.get_development(development_id)
-    if not dev_data:
+@call_budget(reads=1)
+async def get_agent_logs(development_id: str, response: Response, since: int = 0):
+    """
+    エージェント動作ログを取得
+
+    since に前回レスポンスの X-Next-Cursor ヘッダーの値を渡すと、それ以降の新着分だけを返す
+    """
+    result = await db.get_development_logs(development_id, since=max(0, since))
+    if result is None:
         raise HTTPException(status_code=404, detail="Development not found")
-    dev = Development(**dev_data)
-    return dev.agent_logs
+    logs, total = result
+    response.headers["X-Next-Cursor"] = str(total)
+    return [AgentLogEntry(**log) for log in logs]
 
 
 @router.post("/start")
+@call_budget(writes=1)
 async def start_development(
     request: StartDevelopmentRequest,
     background_tasks: BackgroundTasks,
@@ -95,6 +125,7 @@ async def start_development(
 
 
 @router.get("/github/status")
+@call_budget()
 async def get_github_status():
     """GitHub連携の設定状況を取得"""
     return {
@@ -104,6 +135,7 @@ async def get_github_status():
 
 
 @router.post("/{development_id}/create-pr")
+@call_budget(reads=3, writes=1)
 async def create_pull_request(development_id: str):
     """生成されたコードをGitHubにプッシュしてPRを作成"""
     dev_data = await db.get_development(development_id)
@@ -117,6 +149,7 @@ async def create_pull_request(development_id: str):
             detail="GitHub連携が設定されていません。.envファイルでGITHUB_TOKENとGITHUB_REPOを設定してください。"
         )
 
+    dev_data["generated_files"] = await artifact_store.load_files(dev_data.get("generated_files", []))
     dev = Development(**dev_data)
 
     # 既にPRが作成されている場合は重複を防止
@@ -183,7 +216,7 @@ async def create_pull_request(development_id: str):
             "github_pr_url": pr_result["pr_url"],
             "status": DevelopmentStatus.REVIEW.value,
             "updated_at": datetime.now(),
-        })
+        }, return_document=False)
 
         return {
             "status": "created",
@@ -197,12 +230,14 @@ async def create_pull_request(development_id: str):
 
 
 @router.get("/{development_id}/download")
+@call_budget(reads=2)
 async def download_generated_code(development_id: str):
     """生成されたコードをZIPファイルでダウンロード"""
     dev_data = await db.get_development(development_id)
     if not dev_data:
         raise HTTPException(status_code=404, detail="Development not found")
 
+    dev_data["generated_files"] = await artifact_store.load_files(dev_data.get("generated_files", []))
     dev = Development(**dev_data)
 
     if not dev.generated_files:
@@ -229,30 +264,9 @@ async def download_generated_code(development_id: str):
     )
 
 
-async def _add_log(development_id: str, agent: str, message: str, level: str = "info"):
-    """ログエントリを追加"""
-    dev_data = await db.get_development(development_id)
-    if dev_data:
-        logs = dev_data.get("agent_logs", [])
-        logs.append({
-            "timestamp": datetime.now(),
-            "agent": agent,
-            "message": message,
-            "level": level,
-        })
-        await db.update_development(development_id, {"agent_logs": logs})
-
-
-async def _update_status(development_id: str, status: DevelopmentStatus):
-    """ステータスを更新"""
-    await db.update_development(development_id, {
-        "status": status.value,
-        "updated_at": datetime.now(),
-    })
-
-
 async def _run_development_pipeline(development_id: str):
-    """開発パイプラインの実行"""
+    """開発パイプラインの実行（進捗はバッファ経由でまとめて書き込む）"""
+    progress = DevelopmentProgressBuffer(development_id)
     try:
         # 開発情報を取得
         dev_data = await db.get_development(development_id)
@@ -264,53 +278,42 @@ async def _run_development_pipeline(development_id: str):
         # 要件定義を取得
         req_data = await db.get_requirement(requirement_id)
         if not req_data:
-            await _add_log(development_id, "system", f"要件定義が見つかりません: {requirement_id}", "error")
-            await _update_status(development_id, DevelopmentStatus.FAILED)
+            progress.log("system", f"要件定義が見つかりません: {requirement_id}", "error")
+            await progress.set_status(DevelopmentStatus.FAILED)
             return
 
         requirement_content = req_data.get("markdown_content", "")
 
         # Phase 1: Tech Lead - 設計
-        await _add_log(development_id, "tech_lead", "設計を開始します...")
-        await _update_status(development_id, DevelopmentStatus.DESIGNING)
+        progress.log("tech_lead", "設計を開始します...")
+        await progress.set_status(DevelopmentStatus.DESIGNING)
 
         tech_lead = TechLeadAgent()
         design = await tech_lead.design(requirement_content)
 
-        await _add_log(
-            development_id,
+        progress.log(
             "tech_lead",
             f"設計完了: {len(design.get('file_structure', []))}ファイルを生成予定"
         )
 
         # 設計書を保存
-        await db.update_development(development_id, {
-            "design_doc": str(design),
-            "updated_at": datetime.now(),
-        })
+        progress.update({"design_doc": str(design)})
 
         # Phase 2: Coder - 実装
-        await _add_log(development_id, "coder", "コード生成を開始します...")
-        await _update_status(development_id, DevelopmentStatus.CODING)
+        progress.log("coder", "コード生成を開始します...")
+        await progress.set_status(DevelopmentStatus.CODING)
 
         coder = CoderAgent()
         files = await coder.generate_all(design)
 
-        await _add_log(
-            development_id,
-            "coder",
-            f"コード生成完了: {len(files)}ファイル"
-        )
+        progress.log("coder", f"コード生成完了: {len(files)}ファイル")
 
         # 生成ファイルを保存
-        await db.update_development(development_id, {
-            "generated_files": [f.model_dump() for f in files],
-            "updated_at": datetime.now(),
-        })
+        progress.update({"generated_files": await artifact_store.save_files(files)})
 
         # Phase 3: Tester - テスト
-        await _add_log(development_id, "tester", "テストを実行します...")
-        await _update_status(development_id, DevelopmentStatus.TESTING)
+        progress.log("tester", "テストを実行します...")
+        await progress.set_status(DevelopmentStatus.TESTING)
 
         tester = TesterAgent()
         all_passed = True
@@ -318,29 +321,30 @@ async def _run_development_pipeline(development_id: str):
         final_files = []
 
         for file in files:
-            await _add_log(development_id, "tester", f"テスト中: {file.path}")
+            progress.log("tester", f"テスト中: {file.path}")
             fixed_file, passed, message = await tester.test_and_fix(file)
             final_files.append(fixed_file)
             test_results.append(f"{file.path}: {message}")
 
             if not passed:
                 all_passed = False
-                await _add_log(development_id, "tester", f"テスト失敗: {file.path} - {message}", "warning")
+                progress.log("tester", f"テスト失敗: {file.path} - {message}", "warning")
 
         # 最終結果を保存
-        await db.update_development(development_id, {
-            "generated_files": [f.model_dump() for f in final_files],
+        progress.update({
+            "generated_files": await artifact_store.save_files(final_files),
             "test_results": "\n".join(test_results),
-            "updated_at": datetime.now(),
         })
 
         if all_passed:
-            await _add_log(development_id, "system", "すべてのテストが成功しました")
-            await _update_status(development_id, DevelopmentStatus.REVIEW)
+            progress.log("system", "すべてのテストが成功しました")
+            await progress.set_status(DevelopmentStatus.REVIEW)
         else:
-            await _add_log(development_id, "system", "一部のテストが失敗しました", "warning")
-            await _update_status(development_id, DevelopmentStatus.FAILED)
+            progress.log("system", "一部のテストが失敗しました", "warning")
+            await progress.set_status(DevelopmentStatus.FAILED)
 
     except Exception as e:
-        await _add_log(development_id, "system", f"エラーが発生しました: {str(e)}", "error")
-        await _update_status(development_id, DevelopmentStatus.FAILED)
+        progress.log("system", f"エラーが発生しました: {str(e)}", "error")
+        progress.update({"status": DevelopmentStatus.FAILED.value})
+    finally:
+        await progress.close()
@@ -1,6 +1,6 @@
 """Issues API - 課題管理"""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Response, Query
 from typing import List, Optional
 from datetime import datetime
 import uuid
@@ -8,7 +8,8 @@ from pydantic import BaseModel
 
 from app.models.issue import Issue, IssueStatus, PainLevel
 from app.agents.extractor import ExtractorAgent
-from app.services.database import db
+from app.services.database import db, LIST_PAGE_SIZE, MAX_LIST_PAGE_SIZE
+from app.services.db_metrics import call_budget
 
 router = APIRouter()
 
@@ -20,24 +21,36 @@ class ExtractRequest(BaseModel):
 
 
 @router.get("/", response_model=List[Issue])
+@call_budget(reads=1)
 async def list_issues(
+    response: Response,
     project_id: str = "default",
     source_id: Optional[str] = None,
     status: Optional[IssueStatus] = None,
     pain_level: Optional[PainLevel] = None,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=MAX_LIST_PAGE_SIZE),
+    cursor: Optional[str] = None,
 ):
-    """課題一覧を取得"""
+    """
+    課題一覧を取得（抽出日時の新しい順）
+
+    limit 件（既定 100・最大 500）ずつ返し、続きがあれば X-Next-Cursor ヘッダーのカーソルを cursor に渡す
+    """
     issues_data = await db.list_issues(
         project_id=project_id,
         source_id=source_id,
         status=status.value if status else None,
         pain_level=pain_level.value if pain_level else None,
+        limit=limit,
+        start_after=cursor,
     )
-    issues = [Issue(**i) for i in issues_data]
-    return sorted(issues, key=lambda x: x.extracted_at, reverse=True)
+    if len(issues_data) == limit:
+        response.headers["X-Next-Cursor"] = db.document_cursor(issues_data[-1], "extracted_at")
+    return [Issue(**i) for i in issues_data]
 
 
 @router.get("/{issue_id}", response_model=Issue)
+@call_budget(reads=1)
 async def get_issue(issue_id: str):
     """課題詳細を取得"""
     issue_data = await db.get_issue(issue_id)
@@ -47,6 +60,7 @@ async def get_issue(issue_id: str):
 
 
 @router.post("/extract")
+@call_budget()
 async def extract_issues(
     request: ExtractRequest,
     background_tasks: BackgroundTasks,
@@ -80,8 +94,8 @@ async def _run_extraction(
     extractor = ExtractorAgent()
     extracted = await extractor.extract(content)
 
-    for item in extracted:
-        issue = Issue(
+    issues = [
+        Issue(
             id=str(uuid.uuid4()),
             project_id=project_id,
             source_id=source_id,
@@ -97,10 +111,13 @@ async def _run_extraction(
             extraction_batch_id=batch_id,
             extracted_at=datetime.now(),
         )
-        await db.create_issue(issue)
+        for item in extracted
+    ]
+    await db.create_issues(issues)
 
 
 @router.patch("/{issue_id}/status")
+@call_budget(reads=1, writes=1)
 async def update_issue_status(issue_id: str, status: IssueStatus):
     """課題ステータスを更新"""
     issue_data = await db.get_issue(issue_id)
@@ -110,11 +127,12 @@ async def update_issue_status(issue_id: str, status: IssueStatus):
     updated_data = await db.update_issue(issue_id, {
         "status": status.value,
         "updated_at": datetime.now(),
-    })
+    }, current=issue_data)
     return Issue(**updated_data)
 
 
 @router.post("/{issue_id}/select")
+@call_budget(reads=1, writes=1)
 async def select_issue(issue_id: str):
     """課題を選択（要件定義生成へ進む）"""
     issue_data = await db.get_issue(issue_id)
@@ -124,11 +142,12 @@ async def select_issue(issue_id: str):
     updated_data = await db.update_issue(issue_id, {
         "status": IssueStatus.SELECTED.value,
         "updated_at": datetime.now(),
-    })
+    }, current=issue_data)
     return Issue(**updated_data)
 
 
 @router.delete("/{issue_id}")
+@call_budget(reads=1, writes=1)
 async def delete_issue(issue_id: str):
     """課題を削除"""
     issue_data = await db.get_issue(issue_id)
@@ -4,15 +4,19 @@ from fastapi import APIRouter, HTTPException
 from typing import Optional
 from pydantic import BaseModel
 
+from app.exceptions import LeaseNotHeldError
+from app.models.source import SourceType
 from app.services.polling_service import polling_service
 from app.services.chatwork_service import chatwork_service
 from app.services.database import db
+from app.services.db_metrics import call_budget
 
 router = APIRouter()
 
 
 class PollingConfigRequest(BaseModel):
     interval_seconds: int = 60
+    max_concurrency: Optional[int] = None
 
 
 class SyncRequest(BaseModel):
@@ -20,6 +24,7 @@ class SyncRequest(BaseModel):
 
 
 @router.get("/status")
+@call_budget()
 async def get_polling_status():
     """Polling状態を取得"""
     return {
@@ -28,7 +33,15 @@ async def get_polling_status():
     }
 
 
+@router.get("/metrics")
+@call_budget()
+async def get_polling_metrics():
+    """ルームごとの取得メトリクス（レイテンシ・取り込み件数・重複率・レート制限残量）を取得"""
+    return polling_service.metrics
+
+
 @router.post("/start")
+@call_budget()
 async def start_polling():
     """Pollingを開始"""
     if not chatwork_service.is_configured():
@@ -48,6 +61,7 @@ async def start_polling():
 
 
 @router.post("/stop")
+@call_budget()
 async def stop_polling():
     """Pollingを停止"""
     if not polling_service.is_running:
@@ -58,9 +72,12 @@ async def stop_polling():
 
 
 @router.post("/config")
+@call_budget()
 async def configure_polling(config: PollingConfigRequest):
     """Polling設定を変更"""
     polling_service.set_interval(config.interval_seconds)
+    if config.max_concurrency is not None:
+        polling_service.set_max_concurrency(config.max_concurrency)
     return {
         "message": f"Polling interval set to {config.interval_seconds} seconds",
         "status": polling_service.status,
@@ -68,6 +85,7 @@ async def configure_polling(config: PollingConfigRequest):
 
 
 @router.post("/sync")
+# 同期対象のルーム数に比例するため call_budget は宣言しない
 async def sync_now(request: SyncRequest = None):
     """即時同期を実行（Pollingが停止中でも実行可能）"""
     if not chatwork_service.is_configured():
@@ -84,31 +102,41 @@ async def sync_now(request: SyncRequest = None):
             "message": "Sync completed",
             "source_id": source_id,
         }
+    except LeaseNotHeldError:
+        # 他のインスタンスがポーリング中（409）
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/sync-status")
-async def get_all_sync_status():
-    """全ソースの同期状態を取得"""
-    # 全Chatworkソースを取得
-    sources = await db.list_sources(project_id="default")
-    chatwork_sources = [s for s in sources if s.get("type") == "chatwork_room"]
+@call_budget(reads=2)
+async def get_all_sync_status(project_id: Optional[str] = None):
+    """Chatworkソースの同期状態を取得（project_id 省略時は全プロジェクト）"""
+    if project_id:
+        sources = await db.list_sources(project_id=project_id)
+        chatwork_sources = [s for s in sources if s.get("type") == SourceType.CHATWORK_ROOM.value]
+    else:
+        chatwork_sources = await db.list_sources_by_type(SourceType.CHATWORK_ROOM.value)
+
+    # 同期状態は一括取得（ルーム数に依存せず1往復）
+    sync_statuses = await db.get_sync_statuses([s["id"] for s in chatwork_sources])
 
     result = []
     for source in chatwork_sources:
-        sync_status = await db.get_sync_status(source["id"])
         result.append({
             "source_id": source["id"],
+            "project_id": source.get("project_id"),
             "label": source.get("label"),
             "room_id": source.get("chatwork", {}).get("room_id"),
-            "sync_status": sync_status,
+            "sync_status": sync_statuses.get(source["id"]),
         })
 
     return {"sources": result}
 
 
 @router.get("/sync-status/{source_id}")
+@call_budget(reads=2)
 async def get_source_sync_status(source_id: str):
     """特定ソースの同期状態を取得"""
     source = await db.get_source(source_id)
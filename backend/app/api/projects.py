@@ -1,17 +1,20 @@
 """Projects API - プロジェクト管理"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks
 from typing import List
 from datetime import datetime
 import uuid
 
 from app.models.project import Project, ProjectCreate, ProjectUpdate
 from app.services.database import db
+from app.services.db_metrics import call_budget
+from app.services.cascade_delete_service import cascade_delete_service
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Project])
+@call_budget(reads=1, writes=1)
 async def list_projects():
     """プロジェクト一覧を取得"""
     projects_data = await db.list_projects()
@@ -32,6 +35,7 @@ async def list_projects():
 
 
 @router.get("/{project_id}", response_model=Project)
+@call_budget(reads=1)
 async def get_project(project_id: str):
     """プロジェクト詳細を取得"""
     project_data = await db.get_project(project_id)
@@ -41,6 +45,7 @@ async def get_project(project_id: str):
 
 
 @router.post("/", response_model=Project)
+@call_budget(writes=1)
 async def create_project(request: ProjectCreate):
     """プロジェクトを作成"""
     project = Project(
@@ -55,6 +60,7 @@ async def create_project(request: ProjectCreate):
 
 
 @router.patch("/{project_id}", response_model=Project)
+@call_budget(reads=1, writes=1)
 async def update_project(project_id: str, request: ProjectUpdate):
     """プロジェクトを更新"""
     project_data = await db.get_project(project_id)
@@ -67,13 +73,14 @@ async def update_project(project_id: str, request: ProjectUpdate):
     if request.description is not None:
         updates["description"] = request.description
 
-    updated_data = await db.update_project(project_id, updates)
+    updated_data = await db.update_project(project_id, updates, current=project_data)
     return Project(**updated_data)
 
 
 @router.delete("/{project_id}")
-async def delete_project(project_id: str):
-    """プロジェクトを削除"""
+@call_budget(reads=1, writes=1)
+async def delete_project(project_id: str, background_tasks: BackgroundTasks):
+    """プロジェクトを削除（関連データはバックグラウンドで削除）"""
     if project_id == "default":
         raise HTTPException(status_code=400, detail="デフォルトプロジェクトは削除できません")
 
@@ -82,4 +89,17 @@ async def delete_project(project_id: str):
         raise HTTPException(status_code=404, detail="Project not found")
 
     await db.delete_project(project_id)
-    return {"status": "deleted", "id": project_id}
+
+    job = cascade_delete_service.create_job("project", project_id)
+    background_tasks.add_task(cascade_delete_service.run_job, job["job_id"])
+    return {"status": "deleted", "id": project_id, "cleanup_job_id": job["job_id"]}
+
+
+@router.get("/delete-jobs/{job_id}")
+@call_budget()
+async def get_delete_job(job_id: str):
+    """関連データ削除ジョブの進捗を取得"""
+    job = cascade_delete_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,15 +1,16 @@
 """Requirements API - 要件定義書管理"""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Response, Query
+from typing import List, Optional, Literal, Union
 from datetime import datetime
 import uuid
 from pydantic import BaseModel
 
-from app.models.requirement import Requirement, RequirementStatus
+from app.models.requirement import Requirement, RequirementStatus, RequirementSummary
 from app.models.issue import Issue
 from app.agents.pm import PMAgent
-from app.services.database import db
+from app.services.database import db, LIST_PAGE_SIZE, MAX_LIST_PAGE_SIZE
+from app.services.db_metrics import call_budget
 from app.services.github_service import github_service
 
 router = APIRouter()
@@ -20,21 +21,39 @@ class GenerateRequest(BaseModel):
     project_id: str = "default"
 
 
-@router.get("/", response_model=List[Requirement])
+@router.get("/", response_model=Union[List[Requirement], List[RequirementSummary]])
+@call_budget(reads=1)
 async def list_requirements(
+    response: Response,
     project_id: str = "default",
     status: Optional[RequirementStatus] = None,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=MAX_LIST_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
 ):
-    """要件定義書一覧を取得"""
+    """
+    要件定義書一覧を取得（作成日時の新しい順）
+
+    limit 件（既定 100・最大 500）ずつ返し、続きがあれば X-Next-Cursor ヘッダーのカーソルを cursor に渡す。
+    view=summary では本文・要件詳細を取得しない（詳細は個別取得APIで）
+    """
+    summary = view == "summary"
     reqs_data = await db.list_requirements(
         project_id=project_id,
         status=status.value if status else None,
+        limit=limit,
+        start_after=cursor,
+        fields=list(RequirementSummary.model_fields) if summary else None,
     )
-    reqs = [Requirement(**r) for r in reqs_data]
-    return sorted(reqs, key=lambda x: x.created_at, reverse=True)
+    if len(reqs_data) == limit:
+        response.headers["X-Next-Cursor"] = db.document_cursor(reqs_data[-1], "created_at")
+    if summary:
+        return [RequirementSummary(**r) for r in reqs_data]
+    return [Requirement(**r) for r in reqs_data]
 
 
 @router.get("/{requirement_id}", response_model=Requirement)
+@call_budget(reads=1)
 async def get_requirement(requirement_id: str):
     """要件定義書詳細を取得"""
     req_data = await db.get_requirement(requirement_id)
@@ -44,6 +63,7 @@ async def get_requirement(requirement_id: str):
 
 
 @router.post("/generate")
+@call_budget(reads=1)
 async def generate_requirement(
     request: GenerateRequest,
     background_tasks: BackgroundTasks,
@@ -51,12 +71,8 @@ async def generate_requirement(
     """課題から要件定義書を生成"""
     requirement_id = str(uuid.uuid4())
 
-    # 課題情報を取得
-    issues_data = []
-    for issue_id in request.issue_ids:
-        issue_data = await db.get_issue(issue_id)
-        if issue_data:
-            issues_data.append(Issue(**issue_data))
+    # 課題情報を取得（一括）
+    issues_data = [Issue(**i) for i in await db.get_issues(request.issue_ids)]
 
     if not issues_data:
         raise HTTPException(status_code=404, detail="No valid issues found")
@@ -114,6 +130,7 @@ async def _run_generation(
 
 
 @router.patch("/{requirement_id}")
+@call_budget(reads=1, writes=1)
 async def update_requirement(
     requirement_id: str,
     markdown_content: Optional[str] = None,
@@ -130,11 +147,12 @@ async def update_requirement(
     if status:
         updates["status"] = status.value
 
-    updated_data = await db.update_requirement(requirement_id, updates)
+    updated_data = await db.update_requirement(requirement_id, updates, current=req_data)
     return Requirement(**updated_data)
 
 
 @router.post("/{requirement_id}/approve")
+@call_budget(reads=1, writes=1)
 async def approve_requirement(requirement_id: str):
     """要件定義書を承認"""
     req_data = await db.get_requirement(requirement_id)
@@ -144,11 +162,12 @@ async def approve_requirement(requirement_id: str):
     updated_data = await db.update_requirement(requirement_id, {
         "status": RequirementStatus.APPROVED.value,
         "updated_at": datetime.now(),
-    })
+    }, current=req_data)
     return Requirement(**updated_data)
 
 
 @router.post("/{requirement_id}/create-github-issue")
+@call_budget(reads=1, writes=1)
 async def create_github_issue(requirement_id: str):
     """GitHub Issueを作成"""
     req_data = await db.get_requirement(requirement_id)
@@ -191,7 +210,7 @@ async def create_github_issue(requirement_id: str):
             "github_issue_id": result["issue_number"],
             "github_issue_url": result["issue_url"],
             "updated_at": datetime.now(),
-        })
+        }, return_document=False)
 
         return {
             "status": "created",
@@ -203,6 +222,7 @@ async def create_github_issue(requirement_id: str):
 
 
 @router.delete("/{requirement_id}")
+@call_budget(reads=1, writes=1)
 async def delete_requirement(requirement_id: str):
     """要件定義書を削除"""
     req_data = await db.get_requirement(requirement_id)
@@ -1,13 +1,15 @@
 """Sources API - データソース管理"""
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from typing import List
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Query
+from typing import List, Optional
 from datetime import datetime
 import uuid
 from pydantic import BaseModel
 
 from app.models.source import Source, SourceType
-from app.services.database import db
+from app.services.database import db, LIST_PAGE_SIZE, MAX_LIST_PAGE_SIZE
+from app.services.db_metrics import call_budget
+from app.services.cascade_delete_service import cascade_delete_service
 from app.services.chatwork_service import chatwork_service
 
 router = APIRouter()
@@ -20,6 +22,7 @@ class ChatworkConnectRequest(BaseModel):
 
 
 @router.get("/chatwork/status")
+@call_budget()
 async def get_chatwork_status():
     """Chatwork連携の設定状況を取得"""
     return {
@@ -28,6 +31,7 @@ async def get_chatwork_status():
 
 
 @router.get("/chatwork/rooms")
+@call_budget()
 async def get_chatwork_rooms():
     """参加中のChatworkルーム一覧を取得"""
     if not chatwork_service.is_configured():
@@ -44,6 +48,7 @@ async def get_chatwork_rooms():
 
 
 @router.get("/chatwork/rooms/{room_id}")
+@call_budget()
 async def get_chatwork_room_info(room_id: str):
     """ルームIDから部屋情報を取得（登録前のプレビュー用）"""
     if not chatwork_service.is_configured():
@@ -69,6 +74,7 @@ async def get_chatwork_room_info(room_id: str):
 
 
 @router.get("/", response_model=List[Source])
+@call_budget(reads=1)
 async def list_sources(project_id: str = "default"):
     """ソース一覧を取得"""
     sources_data = await db.list_sources(project_id)
@@ -76,6 +82,7 @@ async def list_sources(project_id: str = "default"):
 
 
 @router.get("/{source_id}", response_model=Source)
+@call_budget(reads=1)
 async def get_source(source_id: str):
     """ソース詳細を取得"""
     source_data = await db.get_source(source_id)
@@ -85,6 +92,7 @@ async def get_source(source_id: str):
 
 
 @router.post("/upload", response_model=Source)
+@call_budget(writes=1)
 async def upload_file(
     file: UploadFile = File(...),
     label: str = None,
@@ -113,6 +121,7 @@ async def upload_file(
 
 
 @router.post("/chatwork", response_model=Source)
+@call_budget(writes=1)
 async def connect_chatwork(request: ChatworkConnectRequest):
     """Chatworkルームを連携"""
     room_name = request.room_name
@@ -146,8 +155,20 @@ async def connect_chatwork(request: ChatworkConnectRequest):
 
 
 @router.get("/{source_id}/messages")
+@call_budget(reads=1)
 async def get_source_messages(source_id: str, force: bool = True):
-    """ソースからメッセージを取得（Chatworkの場合はAPIから取得）"""
+    """
+    ソースからメッセージを取得（Chatworkの場合はAPIから最新100件を取得）
+
+    未読差分（force=false）は API トークン単位で既読位置が進み、ポーリングが
+    受け取るはずのメッセージを消費してしまうため受け付けない
+    """
+    if not force:
+        raise HTTPException(
+            status_code=400,
+            detail="force=false（未読差分の取得）はポーリング専用です。最新メッセージは force=true で取得してください。"
+        )
+
     source_data = await db.get_source(source_id)
     if not source_data:
         raise HTTPException(status_code=404, detail="Source not found")
@@ -174,12 +195,6 @@ async def get_source_messages(source_id: str, force: bool = True):
             room_id = source.chatwork.room_id
         messages = await chatwork_service.get_messages(room_id, force=force)
 
-        # メッセージ数を更新
-        await db.update_source(source_id, {
-            "message_count": len(messages),
-            "updated_at": datetime.now(),
-        })
-
         # 課題抽出用のフォーマットに変換
         formatted_content = chatwork_service.format_messages_for_extraction(messages)
 
@@ -194,12 +209,18 @@ async def get_source_messages(source_id: str, force: bool = True):
 
 
 @router.get("/{source_id}/stored-messages")
+@call_budget(reads=3)
 async def get_stored_messages(
     source_id: str,
-    limit: int = 100,
-    offset: int = 0,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=MAX_LIST_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
 ):
-    """Firestoreに蓄積されたメッセージを取得"""
+    """
+    Firestoreに蓄積されたメッセージを取得
+
+    次ページは offset ではなく、レスポンスの next_cursor を cursor に渡して取得する
+    """
     source_data = await db.get_source(source_id)
     if not source_data:
         raise HTTPException(status_code=404, detail="Source not found")
@@ -210,7 +231,9 @@ async def get_stored_messages(
         raise HTTPException(status_code=400, detail="This source is not a Chatwork room")
 
     # Firestoreから蓄積メッセージを取得
-    messages = await db.get_messages_by_source(source_id, limit=limit, offset=offset)
+    messages = await db.get_messages_by_source(
+        source_id, limit=limit, offset=offset, start_after=cursor,
+    )
     total_count = await db.get_message_count_by_source(source_id)
 
     # 課題抽出用のフォーマットに変換
@@ -231,16 +254,31 @@ async def get_stored_messages(
         "total_count": total_count,
         "limit": limit,
         "offset": offset,
+        "next_cursor": db.message_cursor(messages[-1]) if len(messages) == limit else None,
         "messages": messages,
         "content": "\n".join(formatted_lines),
     }
 
 
 @router.delete("/{source_id}")
-async def delete_source(source_id: str):
-    """ソースを削除"""
+@call_budget(reads=1, writes=1)
+async def delete_source(source_id: str, background_tasks: BackgroundTasks):
+    """ソースを削除（蓄積メッセージ・同期状態はバックグラウンドで削除）"""
     source_data = await db.get_source(source_id)
     if not source_data:
         raise HTTPException(status_code=404, detail="Source not found")
     await db.delete_source(source_id)
-    return {"status": "deleted"}
+
+    job = cascade_delete_service.create_job("source", source_id)
+    background_tasks.add_task(cascade_delete_service.run_job, job["job_id"])
+    return {"status": "deleted", "cleanup_job_id": job["job_id"]}
+
+
+@router.get("/delete-jobs/{job_id}")
+@call_budget()
+async def get_delete_job(job_id: str):
+    """関連データ削除ジョブの進捗を取得"""
+    job = cascade_delete_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -3,7 +3,7 @@
 構造化されたエラーレスポンスを提供
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class AppException(Exception):
@@ -105,3 +105,39 @@ class RateLimitError(AppException):
             status_code=429,
             details=details,
         )
+
+
+class CallBudgetExceededError(AppException):
+    """DB呼び出し回数の上限超過（テストの strict_budgets() 内）"""
+
+    def __init__(self, endpoint: str, used: Dict[str, int], budget: Dict[str, int]):
+        super().__init__(
+            message=f"DB呼び出し回数が上限を超えました: {endpoint}",
+            error_code="CALL_BUDGET_EXCEEDED",
+            status_code=500,
+            details={"endpoint": endpoint, "used": used, "budget": budget},
+        )
+
+
+class LeaseNotHeldError(AppException):
+    """リース（リーダー権）を保持していない（他のインスタンスが保持中・期限切れ）"""
+
+    def __init__(self, lease: str):
+        super().__init__(
+            message=f"他のインスタンスが処理中です: {lease}",
+            error_code="LEASE_NOT_HELD",
+            status_code=409,
+            details={"lease": lease},
+        )
+
+
+class ArtifactMissingError(AppException):
+    """生成ファイルが参照する成果物（内容ハッシュ）が保存されていない"""
+
+    def __init__(self, content_hashes: List[str]):
+        super().__init__(
+            message=f"生成ファイルの内容が見つかりません: {', '.join(content_hashes)}",
+            error_code="ARTIFACT_MISSING",
+            status_code=500,
+            details={"content_hashes": content_hashes},
+        )
@@ -11,6 +11,7 @@ import traceback
 
 from app.api import sources, issues, requirements, developments, projects, polling
 from app.services.database import db
+from app.services.db_metrics import db_metrics
 from app.services.polling_service import polling_service
 from app.services.chatwork_service import chatwork_service
 from app.exceptions import AppException
@@ -21,14 +22,14 @@ async def lifespan(app: FastAPI):
     # Startup
     print("Auto-Dev Department Backend starting...")
 
-    # Firestore接続確認
+    # DB接続確認
     try:
         # 接続テスト
-        _ = db.db.collection('_health').document('check').get()
-        print("Firestore connected successfully")
+        await db.ping()
+        print(f"Database connected successfully ({type(db).__name__})")
     except Exception as e:
-        print(f"Firestore connection warning: {e}")
-        print("Continuing with Firestore (may use emulator)...")
+        print(f"Database connection warning: {e}")
+        print(f"Continuing with {type(db).__name__}...")
 
     # Chatwork Polling自動開始（設定されていれば）
     if chatwork_service.is_configured():
@@ -69,8 +70,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+
+# DB操作の構造化ログ（DB_METRICS_LOG=true 時）にリクエスト単位の集計を追加
+@app.middleware("http")
+async def db_metrics_scope(request: Request, call_next):
+    if not db_metrics.log_enabled:
+        return await call_next(request)
+    with db_metrics.scope(f"{request.method} {request.url.path}"):
+        return await call_next(request)
+
+
 # グローバル例外ハンドラー
 @app.exception_handler(AppException)
 async def app_exception_handler(request: Request, exc: AppException):
@@ -118,3 +130,15 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/cache")
+async def cache_stats():
+    """DBキャッシュのヒット率・サイズを取得"""
+    return db.cache.stats()
+
+
+@app.get("/health/db")
+async def db_operation_stats():
+    """DB操作の回数・ドキュメント数・レイテンシ（p50/p95/p99）を取得"""
+    return db_metrics.stats()
@@ -1,8 +1,8 @@
 # Data Models
 from .source import Source, SourceCreate, SourceType, ChatworkInfo, FileInfo
 from .issue import Issue, IssueExtracted, IssueStatus, PainLevel
-from .requirement import Requirement, RequirementStatus
-from .development import Development, DevelopmentStatus, AgentLogEntry, GeneratedFile
+from .requirement import Requirement, RequirementStatus, RequirementSummary
+from .development import Development, DevelopmentStatus, DevelopmentSummary, AgentLogEntry, GeneratedFile
 from .message import ChatworkMessage, SyncStatus
 
 __all__ = [
@@ -17,8 +17,10 @@ __all__ = [
     "PainLevel",
     "Requirement",
     "RequirementStatus",
+    "RequirementSummary",
     "Development",
     "DevelopmentStatus",
+    "DevelopmentSummary",
     "AgentLogEntry",
     "GeneratedFile",
     "ChatworkMessage",
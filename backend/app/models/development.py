@@ -26,6 +26,7 @@ class GeneratedFile(BaseModel):
     path: str
     content: str
     language: str
+    content_hash: Optional[str] = None  # ArtifactStore のキー
 
 
 class Development(BaseModel):
@@ -45,3 +46,18 @@ class Development(BaseModel):
     agent_logs: List[AgentLogEntry] = []
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class DevelopmentSummary(BaseModel):
+    """一覧表示用（生成コード・ログ・設計書を含まない）"""
+    id: str
+    project_id: str
+    requirement_id: str
+    status: DevelopmentStatus = DevelopmentStatus.DESIGNING
+    error_count: int = 0
+    retry_count: int = 0
+    github_branch: Optional[str] = None
+    github_pr_id: Optional[int] = None
+    github_pr_url: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
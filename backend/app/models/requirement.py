@@ -30,3 +30,16 @@ class Requirement(BaseModel):
     github_issue_url: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class RequirementSummary(BaseModel):
+    """一覧表示用（本文・要件詳細を含まない）"""
+    id: str
+    project_id: str
+    issue_id: str
+    title: str
+    status: RequirementStatus = RequirementStatus.DRAFT
+    github_issue_id: Optional[int] = None
+    github_issue_url: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
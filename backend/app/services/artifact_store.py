@@ -0,0 +1,99 @@
+"""
+Artifact Store - 生成ファイルの保存
+ファイル内容を SHA-256 ハッシュをキーに gzip 圧縮して保存し、
+開発タスク側にはパスとハッシュの参照だけを持たせる
+"""
+
+import gzip
+import hashlib
+from datetime import datetime
+from typing import List, Dict, Any
+
+from app.exceptions import ArtifactMissingError
+from app.models.development import GeneratedFile
+from app.services.database import db
+
+
+class ArtifactStore:
+    """内容アドレス方式の成果物ストア"""
+
+    ENCODING = "gzip"
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """ファイル内容のハッシュ（成果物のキー）"""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    async def save_files(self, files: List[GeneratedFile]) -> List[Dict[str, Any]]:
+        """
+        ファイル内容を保存し、開発タスクに保存する参照リストを返す
+
+        同じ内容は開発タスク・修正イテレーションをまたいで1つだけ保存される
+
+        Returns:
+            [{"path", "language", "content_hash"}, ...]
+        """
+        artifacts: Dict[str, Dict[str, Any]] = {}
+        refs = []
+        for file in files:
+            content_hash = self.content_hash(file.content)
+            raw = file.content.encode("utf-8")
+            artifacts[content_hash] = {
+                "encoding": self.ENCODING,
+                "size": len(raw),
+                "data": gzip.compress(raw, mtime=0),
+                "created_at": datetime.now(),
+            }
+            refs.append({
+                "path": file.path,
+                "language": file.language,
+                "content_hash": content_hash,
+            })
+
+        await db.save_artifacts(artifacts)
+        return refs
+
+    async def load_files(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """参照リストにファイル内容を補完（インライン保存の旧データはそのまま）"""
+        return (await self.load_developments([{"generated_files": files}]))[0]["generated_files"]
+
+    async def load_developments(self, developments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        複数の開発タスクの generated_files に内容を補完
+
+        必要なハッシュをまとめて1回で取得する。
+        保存されていない成果物があれば空の内容で返さず ArtifactMissingError を送出する
+        """
+        hashes = [
+            f["content_hash"]
+            for dev in developments
+            for f in dev.get("generated_files", [])
+            if "content" not in f and f.get("content_hash")
+        ]
+        if not hashes:
+            return developments
+
+        artifacts = await db.get_artifacts(hashes)
+        missing = sorted(set(hashes) - set(artifacts))
+        if missing:
+            raise ArtifactMissingError(missing)
+
+        loaded = []
+        for dev in developments:
+            files = []
+            for f in dev.get("generated_files", []):
+                if "content" not in f and f.get("content_hash"):
+                    f = {**f, "content": self._decode(artifacts[f["content_hash"]])}
+                files.append(f)
+            loaded.append({**dev, "generated_files": files})
+        return loaded
+
+    def _decode(self, artifact: Dict[str, Any]) -> str:
+        data = bytes(artifact["data"])
+        if artifact.get("encoding") == "gzip":
+            data = gzip.decompress(data)
+        return data.decode("utf-8")
+
+
+# シングルトンインスタンス
+artifact_store = ArtifactStore()
@@ -0,0 +1,192 @@
+"""
+Entity Cache - FirestoreDB 用のプロセス内キャッシュ
+TTL付きLRUで同一IDの繰り返し読込を抑える
+"""
+
+import copy
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """キャッシュバックエンドの基底クラス（差し替え用）"""
+
+    @abstractmethod
+    def get(self, namespace: str, key: Hashable) -> Tuple[bool, Any]:
+        """(hit, value) を返す"""
+
+    @abstractmethod
+    def generation(self, namespace: str, key: Hashable) -> int:
+        """読込前に取得し、set() に渡す世代（読込中に invalidate されたかの判定用）"""
+
+    @abstractmethod
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        ttl 秒間 value を保持（ttl <= 0 は保持しない）
+
+        generation を渡した場合、その取得後に key が invalidate されていれば
+        読込中に更新された古い値とみなして保持しない
+        """
+
+    @abstractmethod
+    def invalidate(self, namespace: str, key: Optional[Hashable] = None) -> None:
+        """key 省略時は namespace 全体を破棄"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """すべて破棄"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """ヒット率などの統計"""
+
+
+class NullCache(CacheBackend):
+    """何もキャッシュしないバックエンド（無効化用）"""
+
+    def get(self, namespace: str, key: Hashable) -> Tuple[bool, Any]:
+        return False, None
+
+    def generation(self, namespace: str, key: Hashable) -> int:
+        return 0
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        generation: Optional[int] = None,
+    ) -> None:
+        pass
+
+    def invalidate(self, namespace: str, key: Optional[Hashable] = None) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+
+class LRUCache(CacheBackend):
+    """
+    TTL付きLRUキャッシュ
+
+    エントリ数が max_size を超えると最も古く参照されたものから破棄する。
+    呼び出し側が返却値を変更してもキャッシュが汚れないよう、
+    格納時・取得時にディープコピーする。
+
+    invalidate のたびに世代を進めてキーごとに記録し、読込中に invalidate
+    されたキーへの set() は捨てる（更新前の値を TTL の間返し続けないように）。
+    記録は max_size 件までで、溢れた分より古い世代の set() はすべて捨てる。
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._generation = 0
+        self._invalidated: "OrderedDict[Tuple[str, Hashable], int]" = OrderedDict()
+        self._namespace_invalidated: Dict[str, int] = {}
+        self._invalidated_floor = 0  # 記録から溢れた世代（これ以前の読込は set しない）
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._evictions = 0
+
+    def get(self, namespace: str, key: Hashable) -> Tuple[bool, Any]:
+        entry_key = (namespace, key)
+        entry = self._entries.get(entry_key)
+
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(entry_key)
+                self._hits[namespace] = self._hits.get(namespace, 0) + 1
+                return True, copy.deepcopy(value)
+            del self._entries[entry_key]
+
+        self._misses[namespace] = self._misses.get(namespace, 0) + 1
+        return False, None
+
+    def generation(self, namespace: str, key: Hashable) -> int:
+        return self._generation
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        generation: Optional[int] = None,
+    ) -> None:
+        if ttl <= 0:
+            return
+        entry_key = (namespace, key)
+        if generation is not None and (
+            generation < self._invalidated_floor
+            or self._namespace_invalidated.get(namespace, 0) > generation
+            or self._invalidated.get(entry_key, 0) > generation
+        ):
+            return
+        self._entries[entry_key] = (time.monotonic() + ttl, copy.deepcopy(value))
+        self._entries.move_to_end(entry_key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, namespace: str, key: Optional[Hashable] = None) -> None:
+        self._generation += 1
+        if key is not None:
+            entry_key = (namespace, key)
+            self._entries.pop(entry_key, None)
+            self._invalidated[entry_key] = self._generation
+            self._invalidated.move_to_end(entry_key)
+            while len(self._invalidated) > self.max_size:
+                _, generation = self._invalidated.popitem(last=False)
+                self._invalidated_floor = generation
+            return
+        self._namespace_invalidated[namespace] = self._generation
+        for entry_key in [k for k in self._entries if k[0] == namespace]:
+            del self._entries[entry_key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._generation += 1
+        self._invalidated.clear()
+        self._invalidated_floor = self._generation
+
+    def stats(self) -> Dict[str, Any]:
+        namespaces = sorted(set(self._hits) | set(self._misses))
+        per_namespace = {}
+        for namespace in namespaces:
+            hits = self._hits.get(namespace, 0)
+            misses = self._misses.get(namespace, 0)
+            per_namespace[namespace] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            }
+
+        total_hits = sum(self._hits.values())
+        total_misses = sum(self._misses.values())
+        return {
+            "enabled": True,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "evictions": self._evictions,
+            "hits": total_hits,
+            "misses": total_misses,
+            "hit_ratio": round(total_hits / (total_hits + total_misses), 4) if total_hits + total_misses else 0.0,
+            "namespaces": per_namespace,
+        }
@@ -0,0 +1,90 @@
+"""
+Cascade Delete Service - 関連データの一括削除
+プロジェクト・ソース削除後に残る関連ドキュメントをバックグラウンドで削除し、
+進捗をジョブとして公開する
+"""
+
+import logging
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from app.services.database import db
+
+logger = logging.getLogger(__name__)
+
+
+class CascadeDeleteService:
+    """関連データ削除ジョブの管理"""
+
+    TARGETS = ("project", "source")
+    MAX_JOBS = 100  # 保持するジョブ数（超えたら古い完了済みジョブから破棄）
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def create_job(self, target: str, target_id: str) -> Dict[str, Any]:
+        """削除ジョブを登録（実行は run_job）"""
+        if target not in self.TARGETS:
+            raise ValueError(f"Unknown cascade target: {target}")
+
+        job = {
+            "job_id": str(uuid.uuid4()),
+            "target": target,
+            "target_id": target_id,
+            "status": "pending",
+            "deleted": 0,
+            "total": None,
+            "error": None,
+            "created_at": datetime.now(),
+            "finished_at": None,
+        }
+        self._jobs[job["job_id"]] = job
+
+        finished = [j_id for j_id, j in self._jobs.items() if j["finished_at"] is not None]
+        for j_id in finished[:max(0, len(self._jobs) - self.MAX_JOBS)]:
+            del self._jobs[j_id]
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """ジョブの進捗を取得"""
+        return self._jobs.get(job_id)
+
+    async def run_job(self, job_id: str):
+        """削除ジョブを実行"""
+        job = self._jobs[job_id]
+        job["status"] = "running"
+
+        def _on_progress(deleted: int, total: int):
+            job["deleted"] = deleted
+            job["total"] = total
+
+        try:
+            if job["target"] == "project":
+                result = await db.delete_project_dependents(job["target_id"], on_progress=_on_progress)
+            else:
+                result = await db.delete_source_dependents(job["target_id"], on_progress=_on_progress)
+            deleted, total = result["deleted"], result["total"]
+            job["deleted"] = deleted
+            job["total"] = total
+            if deleted >= total:
+                job["status"] = "completed"
+                logger.info(f"Cascade delete {job['target']} {job['target_id']}: {deleted} documents")
+            else:
+                # 一部だけ削除できた場合は partial、1件も削除できなければ failed
+                job["status"] = "partial" if deleted else "failed"
+                job["error"] = result["error"] or f"{total - deleted} of {total} documents were not deleted"
+                logger.error(
+                    f"Cascade delete {job['target']} {job['target_id']} incomplete: "
+                    f"{deleted}/{total} documents deleted ({job['error']})"
+                )
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            logger.error(f"Cascade delete failed for {job['target']} {job['target_id']}: {e}")
+        finally:
+            job["finished_at"] = datetime.now()
+
+
+# シングルトンインスタンス
+cascade_delete_service = CascadeDeleteService()
@@ -4,6 +4,7 @@ Chatwork Service - Chatwork API連携
 """
 
 import os
+import time
 from typing import Optional, List, Dict, Any
 import httpx
 from datetime import datetime
@@ -15,6 +16,7 @@ from tenacity import (
 )
 
 from app.exceptions import ExternalServiceError, ConfigurationError, RateLimitError
+from app.services.rate_limiter import TokenBucket
 
 
 class ChatworkService:
@@ -24,6 +26,11 @@ class ChatworkService:
 
     def __init__(self):
         self.token = os.getenv("CHATWORK_API_TOKEN")
+        # APIトークン単位のクォータ（公式: 5分あたり300回）を全呼び出しで共有
+        self.rate_limiter = TokenBucket(
+            capacity=int(os.getenv("CHATWORK_RATE_LIMIT_REQUESTS", "300")),
+            period=float(os.getenv("CHATWORK_RATE_LIMIT_PERIOD_SECONDS", "300")),
+        )
 
     def is_configured(self) -> bool:
         """Chatwork連携が設定されているか確認"""
@@ -63,6 +70,7 @@ class ChatworkService:
         last_error = None
 
         for attempt in range(max_retries):
+            await self.rate_limiter.acquire()
             try:
                 async with httpx.AsyncClient(timeout=30.0) as client:
                     response = await client.request(
@@ -71,10 +79,12 @@ class ChatworkService:
                         headers=self._headers(),
                         params=params,
                     )
+                    self._sync_rate_limit(response)
 
                     # レート制限チェック
                     if response.status_code == 429:
                         retry_after = int(response.headers.get("Retry-After", 60))
+                        self.rate_limiter.pause(retry_after)
                         raise RateLimitError("Chatwork", retry_after)
 
                     # 204 No Content
@@ -113,6 +123,15 @@ class ChatworkService:
             raise last_error
         raise ExternalServiceError("Chatwork", "不明なエラー", retryable=False)
 
+    def _sync_rate_limit(self, response: httpx.Response):
+        """レスポンスヘッダーの残り回数をトークンバケットに反映"""
+        remaining = response.headers.get("x-ratelimit-remaining")
+        if remaining is None:
+            return
+        reset_at = response.headers.get("x-ratelimit-reset")
+        reset_in = max(0.0, float(reset_at) - time.time()) if reset_at else None
+        self.rate_limiter.sync(int(remaining), reset_in)
+
     async def get_room_info(self, room_id: str) -> Dict[str, Any]:
         """
         ルーム情報を取得
@@ -138,7 +157,9 @@ class ChatworkService:
 
         Args:
             room_id: ルームID
-            force: 最新100件を強制取得（デフォルトは未読のみ）
+            force: 最新100件を強制取得（デフォルトは未読のみ）。
+                未読差分は API トークン単位で既読位置が進むため、
+                force=False はポーリング（polling_service）以外から呼ばないこと
 
         Returns:
             List of message objects
@@ -4,33 +4,489 @@ Firestore Database Service
 """
 
 import os
-from typing import Optional, List, Dict, Any, TypeVar, Type
+import json
+import time
+import base64
+import asyncio
+import binascii
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Any, Callable, Tuple, TypeVar, Type
 from datetime import datetime
+from google.api_core.exceptions import AlreadyExists, NotFound
 from google.cloud import firestore
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions
 from pydantic import BaseModel
 
+from app.exceptions import LeaseNotHeldError, ValidationError
+from app.services.cache import CacheBackend, LRUCache, NullCache
+from app.services.db_metrics import instrument_class
+
 # Generic type for models
 T = TypeVar('T', bound=BaseModel)
 
+# Firestore の1バッチあたりの書き込み上限
+WRITE_BATCH_LIMIT = 500
+
+# 一覧APIの1ページあたりの件数（既定値・上限）
+LIST_PAGE_SIZE = 100
+MAX_LIST_PAGE_SIZE = 500
+
+# カスケード削除時の BulkWriter 書き込みレート上限（ops/秒）
+CASCADE_DELETE_OPS_PER_SECOND = int(os.getenv('CASCADE_DELETE_OPS_PER_SECOND', '500'))
+# 一括削除で1件あたりに試行する最大回数（超えたら失敗として数える）
+CASCADE_DELETE_MAX_ATTEMPTS = 5
+
+# キャッシュTTL（秒）。ここにないコレクションはキャッシュしない
+CACHE_TTL_SECONDS: Dict[str, float] = {
+    'projects': 300,
+    'sources': 60,
+    'sources:list': 60,
+    'requirements': 60,
+    'developments': 5,
+}
+
+
+def _create_cache() -> CacheBackend:
+    """DB_CACHE_MAX_SIZE に応じたキャッシュを生成（0 で無効）"""
+    max_size = int(os.getenv('DB_CACHE_MAX_SIZE', '1024'))
+    if max_size <= 0:
+        return NullCache()
+    return LRUCache(max_size=max_size)
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """ページングカーソル（並び順フィールドの値）を不透明な文字列に変換"""
+    payload = {
+        key: {"__dt__": value.isoformat()} if isinstance(value, datetime) else value
+        for key, value in values.items()
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, order_field: str) -> Dict[str, Any]:
+    """
+    document_cursor で生成したカーソルを復元
+
+    (order_field, id) 以外のキーを持つカーソル（並び順の違う一覧のカーソルなど）は
+    ValidationError にする
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = {
+            key: datetime.fromisoformat(value["__dt__"]) if isinstance(value, dict) else value
+            for key, value in payload.items()
+        }
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        raise ValidationError("不正なカーソルです", field="cursor")
+    if set(values) != {order_field, "id"}:
+        raise ValidationError("不正なカーソルです", field="cursor")
+    return values
+
+
+def build_lease(
+    current: Optional[Dict[str, Any]],
+    name: str,
+    holder_id: str,
+    ttl_seconds: float,
+    now: float,
+) -> Optional[Dict[str, Any]]:
+    """
+    リース取得・更新後のドキュメントを決める（時刻は UNIX 秒）
+
+    他の保持者のリースが有効期限内なら None。保持者が変わる（または
+    期限切れ後に取り直す）たびに fencing_token を1つ進める。
+    """
+    held = bool(current) and current.get('expires_at', 0) > now
+    if held and current.get('holder_id') != holder_id:
+        return None
+
+    token = current.get('fencing_token', 0) if current else 0
+    return {
+        'name': name,
+        'holder_id': holder_id,
+        'fencing_token': token if held else token + 1,
+        'acquired_at': current['acquired_at'] if held else now,
+        'renewed_at': now,
+        'expires_at': now + ttl_seconds,
+    }
+
+
+def lease_is_held(current: Optional[Dict[str, Any]], fencing_token: int, now: float) -> bool:
+    """fencing_token のリースが有効期限内のまま保持されているか（書き込み前の確認用）"""
+    return (
+        bool(current)
+        and current.get('fencing_token') == fencing_token
+        and current.get('expires_at', 0) > now
+    )
+
+
+class DatabaseBackend(ABC):
+    """
+    ストレージバックエンドの共通基底
+
+    FirestoreDB / SQLiteDB はこれを継承し、ここで宣言する公開の非同期メソッドを
+    すべて実装する（未実装のメソッドがあるとインスタンス化時に TypeError）
+    """
+
+    cache: CacheBackend
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 公開メソッドの呼び出しを db_metrics に記録
+        instrument_class(cls)
+
+    @abstractmethod
+    async def ping(self) -> None:
+        """接続確認（失敗時は例外）"""
+
+    # ========== Projects ==========
+
+    @abstractmethod
+    async def create_project(self, project: BaseModel) -> BaseModel:
+        """プロジェクトを作成"""
+
+    @abstractmethod
+    async def get_project(self, project_id: str) -> Optional[Dict]:
+        """プロジェクトを取得"""
+
+    @abstractmethod
+    async def list_projects(self) -> List[Dict]:
+        """プロジェクト一覧を取得"""
+
+    @abstractmethod
+    async def update_project(
+        self,
+        project_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """プロジェクトを更新"""
+
+    @abstractmethod
+    async def delete_project(self, project_id: str) -> bool:
+        """プロジェクトを削除"""
+
+    # ========== Sources ==========
+
+    @abstractmethod
+    async def create_source(self, source: BaseModel) -> BaseModel:
+        """ソースを作成"""
+
+    @abstractmethod
+    async def update_source(
+        self,
+        source_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """ソースを更新"""
+
+    @abstractmethod
+    async def get_source(self, source_id: str) -> Optional[Dict]:
+        """ソースを取得"""
+
+    @abstractmethod
+    async def list_sources(self, project_id: str = "default") -> List[Dict]:
+        """ソース一覧を取得"""
+
+    @abstractmethod
+    async def list_sources_by_type(self, source_type: str) -> List[Dict]:
+        """全プロジェクトのソースを種別で取得（プロジェクト数によらず1クエリ）"""
+
+    @abstractmethod
+    async def delete_source(self, source_id: str) -> bool:
+        """ソースを削除"""
+
+    # ========== Issues ==========
+
+    @abstractmethod
+    async def create_issue(self, issue: BaseModel) -> BaseModel:
+        """課題を作成"""
+
+    @abstractmethod
+    async def create_issues(self, issues: List[BaseModel]) -> List[BaseModel]:
+        """課題を一括作成"""
+
+    @abstractmethod
+    async def get_issue(self, issue_id: str) -> Optional[Dict]:
+        """課題を取得"""
+
+    @abstractmethod
+    async def get_issues(self, issue_ids: List[str]) -> List[Dict]:
+        """課題を一括取得（指定順で返し、存在しないIDは除外）"""
+
+    @abstractmethod
+    async def list_issues(
+        self,
+        project_id: str = "default",
+        source_id: Optional[str] = None,
+        status: Optional[str] = None,
+        pain_level: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+    ) -> List[Dict]:
+        """課題一覧を取得（抽出日時の新しい順）"""
+
+    @abstractmethod
+    async def update_issue(
+        self,
+        issue_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """課題を更新"""
+
+    @abstractmethod
+    async def delete_issue(self, issue_id: str) -> bool:
+        """課題を削除"""
+
+    # ========== Requirements ==========
+
+    @abstractmethod
+    async def create_requirement(self, requirement: BaseModel) -> BaseModel:
+        """要件定義書を作成"""
+
+    @abstractmethod
+    async def get_requirement(self, requirement_id: str) -> Optional[Dict]:
+        """要件定義書を取得"""
+
+    @abstractmethod
+    async def list_requirements(
+        self,
+        project_id: str = "default",
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """要件定義書一覧を取得（作成日時の新しい順）"""
+
+    @abstractmethod
+    async def update_requirement(
+        self,
+        requirement_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """要件定義書を更新"""
+
+    @abstractmethod
+    async def delete_requirement(self, requirement_id: str) -> bool:
+        """要件定義書を削除"""
+
+    # ========== Developments ==========
+
+    @abstractmethod
+    async def create_development(self, development: BaseModel) -> BaseModel:
+        """開発タスクを作成"""
+
+    @abstractmethod
+    async def get_development(self, development_id: str) -> Optional[Dict]:
+        """開発タスクを取得"""
+
+    @abstractmethod
+    async def list_developments(
+        self,
+        project_id: str = "default",
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """開発タスク一覧を取得（作成日時の新しい順）"""
+
+    @abstractmethod
+    async def update_development(
+        self,
+        development_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """開発タスクを更新"""
+
+    @abstractmethod
+    async def append_development_log(self, development_id: str, entry: Dict[str, Any]) -> bool:
+        """エージェントログを1件追記（既存ログを読まずに追加）"""
+
+    @abstractmethod
+    async def apply_development_progress(
+        self,
+        development_id: str,
+        updates: Dict[str, Any],
+        log_entries: List[Dict[str, Any]],
+    ) -> bool:
+        """フィールド更新とログ追記を1回の書き込みでまとめて反映"""
+
+    @abstractmethod
+    async def get_development_logs(
+        self,
+        development_id: str,
+        since: int = 0,
+    ) -> Optional[Tuple[List[Dict], int]]:
+        """エージェントログを取得（since 以降, 全件数）"""
+
+    # ========== Artifacts ==========
+
+    @abstractmethod
+    async def save_artifacts(self, artifacts: Dict[str, Dict[str, Any]]) -> int:
+        """成果物を内容ハッシュをキーに保存（既存ハッシュは書き込まない）"""
+
+    @abstractmethod
+    async def get_artifacts(self, content_hashes: List[str]) -> Dict[str, Dict]:
+        """成果物を取得"""
+
+    # ========== Messages ==========
+
+    @abstractmethod
+    async def save_message(self, message: BaseModel) -> BaseModel:
+        """メッセージを保存（重複チェック付き）"""
+
+    @abstractmethod
+    async def save_messages_batch(self, messages: List[BaseModel]) -> Dict[str, int]:
+        """メッセージを一括保存（重複排除）"""
+
+    @abstractmethod
+    async def get_messages_by_source(
+        self,
+        source_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        start_after: Optional[str] = None,
+    ) -> List[Dict]:
+        """ソース別メッセージを取得（新しい順）"""
+
+    @abstractmethod
+    async def get_messages_by_room(
+        self,
+        room_id: str,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[Dict]:
+        """ルーム別メッセージを取得"""
+
+    @abstractmethod
+    async def get_message_count_by_source(self, source_id: str) -> int:
+        """ソース別メッセージ数を取得"""
+
+    @abstractmethod
+    async def get_latest_message_id(self, source_id: str) -> Optional[str]:
+        """ソースの最新メッセージIDを取得"""
+
+    # ========== Sync Status ==========
 
-class FirestoreDB:
+    @abstractmethod
+    async def get_sync_status(self, source_id: str) -> Optional[Dict]:
+        """同期状態を取得"""
+
+    @abstractmethod
+    async def get_sync_statuses(self, source_ids: List[str]) -> Dict[str, Dict]:
+        """複数ソースの同期状態を一括取得"""
+
+    @abstractmethod
+    async def update_sync_status(
+        self,
+        source_id: str,
+        updates: Dict[str, Any],
+        fence: Optional[Tuple[str, int]] = None,
+    ) -> bool:
+        """同期状態を更新（存在しなければ作成。ソースが削除済みなら書き込まず False、fence 指定時はリース保持を確認）"""
+
+    @abstractmethod
+    async def apply_sync_result(
+        self,
+        source_id: str,
+        status_updates: Dict[str, Any],
+        source_updates: Dict[str, Any],
+        saved_count: int,
+        total_messages: Optional[int] = None,
+        fence: Optional[Tuple[str, int]] = None,
+    ) -> bool:
+        """同期結果を同期状態とソースに一括で反映（fence 指定時はリース保持を確認）"""
+
+    # ========== Leases ==========
+
+    @abstractmethod
+    async def acquire_lease(self, name: str, holder_id: str, ttl_seconds: float) -> Optional[Dict]:
+        """リースを取得・更新（取得できなければ None）"""
+
+    @abstractmethod
+    async def release_lease(self, name: str, holder_id: str, fencing_token: int) -> bool:
+        """保持中のリースを手放す（即時に他の候補が取得できるよう期限を過去にする）"""
+
+    @abstractmethod
+    async def get_lease(self, name: str) -> Optional[Dict]:
+        """リースを取得"""
+
+    # ========== Cascading Delete ==========
+
+    @abstractmethod
+    async def delete_source_dependents(
+        self,
+        source_id: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """ソースに紐づくメッセージ・同期状態を削除"""
+
+    @abstractmethod
+    async def delete_project_dependents(
+        self,
+        project_id: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """プロジェクトに紐づくソース（メッセージ・同期状態を含む）・課題・要件定義書・開発タスクを削除"""
+
+    @staticmethod
+    def document_cursor(doc: Dict, order_field: str) -> str:
+        """(order_field, id) 降順で並べた一覧の次ページ用カーソルを生成"""
+        return encode_cursor({order_field: doc[order_field], "id": doc["id"]})
+
+    @classmethod
+    def message_cursor(cls, message: Dict) -> str:
+        """get_messages_by_source の次ページ用カーソルを生成"""
+        return cls.document_cursor(message, "send_time")
+
+
+class FirestoreDB(DatabaseBackend):
     """Firestore データベースサービス"""
 
     _instance: Optional['FirestoreDB'] = None
-    _db: Optional[firestore.Client] = None
+    _clients: List[firestore.AsyncClient] = []
+    _next_client: int = 0
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance.cache = _create_cache()
         return cls._instance
 
     @property
-    def db(self) -> firestore.Client:
-        if self._db is None:
+    def db(self) -> firestore.AsyncClient:
+        """
+        AsyncClientを取得
+
+        FIRESTORE_CHANNEL_POOL_SIZE 個のクライアント（= gRPCチャネル）を
+        ラウンドロビンで払い出し、同時リクエストを複数チャネルに分散する
+        """
+        if not self._clients:
             # Emulator使用時は環境変数で自動接続
             project = os.getenv('GOOGLE_CLOUD_PROJECT', 'auto-dev-department')
-            self._db = firestore.Client(project=project)
-        return self._db
+            pool_size = max(1, int(os.getenv('FIRESTORE_CHANNEL_POOL_SIZE', '4')))
+            self._clients = [firestore.AsyncClient(project=project) for _ in range(pool_size)]
+        client = self._clients[self._next_client % len(self._clients)]
+        self._next_client += 1
+        return client
+
+    async def ping(self) -> None:
+        """接続確認"""
+        await self.db.collection('_health').document('check').get()
 
     # ========== Generic CRUD Operations ==========
 
@@ -60,6 +516,135 @@ class FirestoreDB:
                         value[k] = v.replace(tzinfo=None)
         return model_class(**doc_data)
 
+    async def _get_document(self, collection, doc_id: str) -> Optional[Dict]:
+        """ドキュメントを取得（CACHE_TTL_SECONDS 対象はキャッシュ経由）"""
+        ttl = CACHE_TTL_SECONDS.get(collection.id, 0)
+        if ttl:
+            hit, cached = self.cache.get(collection.id, doc_id)
+            if hit:
+                return cached
+            # 読込中に更新・削除されたら（invalidate されたら）古い値をキャッシュしない
+            generation = self.cache.generation(collection.id, doc_id)
+
+        doc = await collection.document(doc_id).get()
+        if not doc.exists:
+            return None
+
+        data = doc.to_dict()
+        if ttl:
+            self.cache.set(collection.id, doc_id, data, ttl, generation)
+        return data
+
+    async def _update_document(
+        self,
+        collection,
+        doc_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """
+        ドキュメントを更新（1往復）
+
+        Args:
+            current: 呼び出し側で取得済みの更新前ドキュメント。渡された場合は
+                updates をローカルでマージして返し、再読込しない
+            return_document: False の場合は書き込みのみ行い None を返す
+
+        Returns:
+            更新後のドキュメント（存在しない場合は None）
+        """
+        doc_ref = collection.document(doc_id)
+        try:
+            await doc_ref.update(updates)
+        except NotFound:
+            return None
+        finally:
+            self.cache.invalidate(collection.id, doc_id)
+
+        if not return_document:
+            return None
+        if current is not None:
+            return {**current, **updates}
+
+        doc = await doc_ref.get()
+        if doc.exists:
+            return doc.to_dict()
+        return None
+
+    async def _create_missing(self, collection_name: str, documents: Dict[str, Dict[str, Any]]) -> int:
+        """
+        存在しないドキュメントだけを一括作成
+
+        既存チェックは get_all の1往復で行い（フィールドは取得しない）、新規分は
+        WRITE_BATCH_LIMIT 件ごとのバッチに分割して並列コミットする。
+        書き込みは create() のため、既存チェック後に他の書き込みが先に作成した
+        ドキュメントは上書きせず、新規作成件数にも数えない
+
+        Returns:
+            新規作成件数
+        """
+        if not documents:
+            return 0
+
+        client = self.db
+        collection = client.collection(collection_name)
+        refs = [collection.document(doc_id) for doc_id in documents]
+
+        existing_ids = set()
+        async for doc in client.get_all(refs, field_paths=[]):
+            if doc.exists:
+                existing_ids.add(doc.id)
+
+        new_ids = [doc_id for doc_id in documents if doc_id not in existing_ids]
+
+        async def _create_one(doc_id: str) -> int:
+            try:
+                await collection.document(doc_id).create(documents[doc_id])
+            except AlreadyExists:
+                return 0
+            return 1
+
+        async def _create_chunk(chunk: List[str]) -> int:
+            batch = client.batch()
+            for doc_id in chunk:
+                batch.create(collection.document(doc_id), documents[doc_id])
+            try:
+                await batch.commit()
+            except AlreadyExists:
+                # 並行する書き込みと競合（バッチは全体が失敗する）→ 1件ずつ作成し直す
+                results = await asyncio.gather(*(_create_one(doc_id) for doc_id in chunk))
+                return sum(results)
+            return len(chunk)
+
+        counts = await asyncio.gather(*(
+            _create_chunk(new_ids[start:start + WRITE_BATCH_LIMIT])
+            for start in range(0, len(new_ids), WRITE_BATCH_LIMIT)
+        ))
+        return sum(counts)
+
+    def _ordered_page(
+        self,
+        query,
+        order_field: str,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ):
+        """(order_field, id) 降順・件数制限・カーソル・取得フィールドをクエリに適用"""
+        if fields:
+            query = query.select(fields)
+        query = (
+            query
+            .order_by(order_field, direction=firestore.Query.DESCENDING)
+            .order_by('id', direction=firestore.Query.DESCENDING)
+        )
+        if start_after:
+            query = query.start_after(decode_cursor(start_after, order_field))
+        if limit:
+            query = query.limit(limit)
+        return query
+
     # ========== Projects Collection ==========
 
     def get_projects_collection(self):
@@ -68,43 +653,52 @@ class FirestoreDB:
     async def create_project(self, project: BaseModel) -> BaseModel:
         """プロジェクトを作成"""
         data = self._serialize(project)
-        self.get_projects_collection().document(project.id).set(data)
+        await self.get_projects_collection().document(project.id).set(data)
+        self.cache.invalidate('projects', project.id)
         return project
 
     async def get_project(self, project_id: str) -> Optional[Dict]:
         """プロジェクトを取得"""
-        doc = self.get_projects_collection().document(project_id).get()
-        if doc.exists:
-            return doc.to_dict()
-        return None
+        return await self._get_document(self.get_projects_collection(), project_id)
 
     async def list_projects(self) -> List[Dict]:
         """プロジェクト一覧を取得"""
         docs = self.get_projects_collection().order_by('created_at', direction=firestore.Query.DESCENDING).stream()
-        return [doc.to_dict() for doc in docs]
+        return [doc.to_dict() async for doc in docs]
 
-    async def update_project(self, project_id: str, updates: Dict[str, Any]) -> Optional[Dict]:
+    async def update_project(
+        self,
+        project_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
         """プロジェクトを更新"""
-        doc_ref = self.get_projects_collection().document(project_id)
-        doc_ref.update(updates)
-        doc = doc_ref.get()
-        if doc.exists:
-            return doc.to_dict()
-        return None
+        return await self._update_document(
+            self.get_projects_collection(), project_id, updates,
+            current=current, return_document=return_document,
+        )
 
     async def delete_project(self, project_id: str) -> bool:
         """プロジェクトを削除"""
-        self.get_projects_collection().document(project_id).delete()
+        await self.get_projects_collection().document(project_id).delete()
+        self.cache.invalidate('projects', project_id)
         return True
 
-    async def update_source(self, source_id: str, updates: Dict[str, Any]) -> Optional[Dict]:
+    async def update_source(
+        self,
+        source_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
         """ソースを更新"""
-        doc_ref = self.get_sources_collection().document(source_id)
-        doc_ref.update(updates)
-        doc = doc_ref.get()
-        if doc.exists:
-            return doc.to_dict()
-        return None
+        updated = await self._update_document(
+            self.get_sources_collection(), source_id, updates,
+            current=current, return_document=return_document,
+        )
+        self.cache.invalidate('sources:list')
+        return updated
 
     # ========== Sources Collection ==========
 
@@ -114,24 +708,45 @@ class FirestoreDB:
     async def create_source(self, source: BaseModel) -> BaseModel:
         """ソースを作成"""
         data = self._serialize(source)
-        self.get_sources_collection().document(source.id).set(data)
+        await self.get_sources_collection().document(source.id).set(data)
+        self.cache.invalidate('sources', source.id)
+        self.cache.invalidate('sources:list')
         return source
 
     async def get_source(self, source_id: str) -> Optional[Dict]:
         """ソースを取得"""
-        doc = self.get_sources_collection().document(source_id).get()
-        if doc.exists:
-            return doc.to_dict()
-        return None
+        return await self._get_document(self.get_sources_collection(), source_id)
 
     async def list_sources(self, project_id: str = "default") -> List[Dict]:
         """ソース一覧を取得"""
+        hit, cached = self.cache.get('sources:list', project_id)
+        if hit:
+            return cached
+        generation = self.cache.generation('sources:list', project_id)
+
         docs = self.get_sources_collection().where('project_id', '==', project_id).stream()
-        return [doc.to_dict() for doc in docs]
+        sources = [doc.to_dict() async for doc in docs]
+        self.cache.set('sources:list', project_id, sources, CACHE_TTL_SECONDS['sources:list'], generation)
+        return sources
+
+    async def list_sources_by_type(self, source_type: str) -> List[Dict]:
+        """全プロジェクトのソースを種別で取得（プロジェクト数によらずコレクション全体への1クエリ）"""
+        key = ('type', source_type)
+        hit, cached = self.cache.get('sources:list', key)
+        if hit:
+            return cached
+        generation = self.cache.generation('sources:list', key)
+
+        docs = self.get_sources_collection().where('type', '==', source_type).stream()
+        sources = [doc.to_dict() async for doc in docs]
+        self.cache.set('sources:list', key, sources, CACHE_TTL_SECONDS['sources:list'], generation)
+        return sources
 
     async def delete_source(self, source_id: str) -> bool:
         """ソースを削除"""
-        self.get_sources_collection().document(source_id).delete()
+        await self.get_sources_collection().document(source_id).delete()
+        self.cache.invalidate('sources', source_id)
+        self.cache.invalidate('sources:list')
         return True
 
     # ========== Issues Collection ==========
@@ -142,24 +757,57 @@ class FirestoreDB:
     async def create_issue(self, issue: BaseModel) -> BaseModel:
         """課題を作成"""
         data = self._serialize(issue)
-        self.get_issues_collection().document(issue.id).set(data)
+        await self.get_issues_collection().document(issue.id).set(data)
         return issue
 
+    async def create_issues(self, issues: List[BaseModel]) -> List[BaseModel]:
+        """課題を一括作成（WRITE_BATCH_LIMIT 件ごとのバッチを並列コミット）"""
+        client = self.db
+        collection = client.collection('issues')
+
+        commits = []
+        for start in range(0, len(issues), WRITE_BATCH_LIMIT):
+            batch = client.batch()
+            for issue in issues[start:start + WRITE_BATCH_LIMIT]:
+                batch.set(collection.document(issue.id), self._serialize(issue))
+            commits.append(batch.commit())
+
+        if commits:
+            await asyncio.gather(*commits)
+        return issues
+
     async def get_issue(self, issue_id: str) -> Optional[Dict]:
         """課題を取得"""
-        doc = self.get_issues_collection().document(issue_id).get()
+        doc = await self.get_issues_collection().document(issue_id).get()
         if doc.exists:
             return doc.to_dict()
         return None
 
+    async def get_issues(self, issue_ids: List[str]) -> List[Dict]:
+        """課題を一括取得（get_all の1往復。指定順で返し、存在しないIDは除外）"""
+        if not issue_ids:
+            return []
+
+        client = self.db
+        collection = client.collection('issues')
+        refs = [collection.document(issue_id) for issue_id in dict.fromkeys(issue_ids)]
+
+        found = {}
+        async for doc in client.get_all(refs):
+            if doc.exists:
+                found[doc.id] = doc.to_dict()
+        return [found[issue_id] for issue_id in dict.fromkeys(issue_ids) if issue_id in found]
+
     async def list_issues(
         self,
         project_id: str = "default",
         source_id: Optional[str] = None,
         status: Optional[str] = None,
         pain_level: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
     ) -> List[Dict]:
-        """課題一覧を取得"""
+        """課題一覧を取得（抽出日時の新しい順）"""
         query = self.get_issues_collection().where('project_id', '==', project_id)
 
         if source_id:
@@ -169,21 +817,25 @@ class FirestoreDB:
         if pain_level:
             query = query.where('pain_level', '==', pain_level)
 
-        docs = query.stream()
-        return [doc.to_dict() for doc in docs]
+        docs = self._ordered_page(query, 'extracted_at', limit, start_after).stream()
+        return [doc.to_dict() async for doc in docs]
 
-    async def update_issue(self, issue_id: str, updates: Dict[str, Any]) -> Optional[Dict]:
+    async def update_issue(
+        self,
+        issue_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
         """課題を更新"""
-        doc_ref = self.get_issues_collection().document(issue_id)
-        doc_ref.update(updates)
-        doc = doc_ref.get()
-        if doc.exists:
-            return doc.to_dict()
-        return None
+        return await self._update_document(
+            self.get_issues_collection(), issue_id, updates,
+            current=current, return_document=return_document,
+        )
 
     async def delete_issue(self, issue_id: str) -> bool:
         """課題を削除"""
-        self.get_issues_collection().document(issue_id).delete()
+        await self.get_issues_collection().document(issue_id).delete()
         return True
 
     # ========== Requirements Collection ==========
@@ -194,42 +846,53 @@ class FirestoreDB:
     async def create_requirement(self, requirement: BaseModel) -> BaseModel:
         """要件定義書を作成"""
         data = self._serialize(requirement)
-        self.get_requirements_collection().document(requirement.id).set(data)
+        await self.get_requirements_collection().document(requirement.id).set(data)
+        self.cache.invalidate('requirements', requirement.id)
         return requirement
 
     async def get_requirement(self, requirement_id: str) -> Optional[Dict]:
         """要件定義書を取得"""
-        doc = self.get_requirements_collection().document(requirement_id).get()
-        if doc.exists:
-            return doc.to_dict()
-        return None
+        return await self._get_document(self.get_requirements_collection(), requirement_id)
 
     async def list_requirements(
         self,
         project_id: str = "default",
         status: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
     ) -> List[Dict]:
-        """要件定義書一覧を取得"""
+        """
+        要件定義書一覧を取得（作成日時の新しい順）
+
+        Args:
+            fields: 取得するフィールド（省略時は全フィールド）
+        """
         query = self.get_requirements_collection().where('project_id', '==', project_id)
 
         if status:
             query = query.where('status', '==', status)
 
-        docs = query.stream()
-        return [doc.to_dict() for doc in docs]
+        docs = self._ordered_page(query, 'created_at', limit, start_after, fields).stream()
+        return [doc.to_dict() async for doc in docs]
 
-    async def update_requirement(self, requirement_id: str, updates: Dict[str, Any]) -> Optional[Dict]:
+    async def update_requirement(
+        self,
+        requirement_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
         """要件定義書を更新"""
-        doc_ref = self.get_requirements_collection().document(requirement_id)
-        doc_ref.update(updates)
-        doc = doc_ref.get()
-        if doc.exists:
-            return doc.to_dict()
-        return None
+        return await self._update_document(
+            self.get_requirements_collection(), requirement_id, updates,
+            current=current, return_document=return_document,
+        )
 
     async def delete_requirement(self, requirement_id: str) -> bool:
         """要件定義書を削除"""
-        self.get_requirements_collection().document(requirement_id).delete()
+        await self.get_requirements_collection().document(requirement_id).delete()
+        self.cache.invalidate('requirements', requirement_id)
         return True
 
     # ========== Developments Collection ==========
@@ -240,40 +903,142 @@ class FirestoreDB:
     async def create_development(self, development: BaseModel) -> BaseModel:
         """開発タスクを作成"""
         data = self._serialize(development)
-        self.get_developments_collection().document(development.id).set(data)
+        await self.get_developments_collection().document(development.id).set(data)
+        self.cache.invalidate('developments', development.id)
         return development
 
     async def get_development(self, development_id: str) -> Optional[Dict]:
         """開発タスクを取得"""
-        doc = self.get_developments_collection().document(development_id).get()
-        if doc.exists:
-            return doc.to_dict()
-        return None
+        return await self._get_document(self.get_developments_collection(), development_id)
 
     async def list_developments(
         self,
         project_id: str = "default",
         status: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
     ) -> List[Dict]:
-        """開発タスク一覧を取得"""
+        """
+        開発タスク一覧を取得（作成日時の新しい順）
+
+        Args:
+            fields: 取得するフィールド（省略時は全フィールド）
+        """
         query = self.get_developments_collection().where('project_id', '==', project_id)
 
         if status:
             query = query.where('status', '==', status)
 
-        docs = query.stream()
-        return [doc.to_dict() for doc in docs]
+        docs = self._ordered_page(query, 'created_at', limit, start_after, fields).stream()
+        return [doc.to_dict() async for doc in docs]
 
-    async def update_development(self, development_id: str, updates: Dict[str, Any]) -> Optional[Dict]:
+    async def update_development(
+        self,
+        development_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
         """開発タスクを更新"""
+        return await self._update_document(
+            self.get_developments_collection(), development_id, updates,
+            current=current, return_document=return_document,
+        )
+
+    async def append_development_log(self, development_id: str, entry: Dict[str, Any]) -> bool:
+        """
+        エージェントログを1件追記（ArrayUnion で既存ログを読まずに追加）
+
+        Returns:
+            開発タスクが存在せず追記できなかった場合は False
+        """
         doc_ref = self.get_developments_collection().document(development_id)
-        doc_ref.update(updates)
-        doc = doc_ref.get()
-        if doc.exists:
-            return doc.to_dict()
-        return None
+        try:
+            await doc_ref.update({'agent_logs': firestore.ArrayUnion([entry])})
+        except NotFound:
+            return False
+        finally:
+            self.cache.invalidate('developments', development_id)
+        return True
+
+    async def apply_development_progress(
+        self,
+        development_id: str,
+        updates: Dict[str, Any],
+        log_entries: List[Dict[str, Any]],
+    ) -> bool:
+        """
+        フィールド更新とログ追記を1回の update() でまとめて反映
+
+        Returns:
+            開発タスクが存在せず反映できなかった場合は False
+        """
+        payload = dict(updates)
+        if log_entries:
+            payload['agent_logs'] = firestore.ArrayUnion(log_entries)
+        if not payload:
+            return True
+
+        doc_ref = self.get_developments_collection().document(development_id)
+        try:
+            await doc_ref.update(payload)
+        except NotFound:
+            return False
+        finally:
+            self.cache.invalidate('developments', development_id)
+        return True
+
+    async def get_development_logs(
+        self,
+        development_id: str,
+        since: int = 0,
+    ) -> Optional[Tuple[List[Dict], int]]:
+        """
+        エージェントログを取得（agent_logs フィールドのみ読込）
+
+        Args:
+            since: 取得済みの件数。この位置以降のログだけを返す
+
+        Returns:
+            (since 以降のログ, 全件数)。開発タスクがなければ None
+        """
+        doc = await self.get_developments_collection().document(development_id).get(
+            field_paths=['agent_logs']
+        )
+        if not doc.exists:
+            return None
+        logs = (doc.to_dict() or {}).get('agent_logs', [])
+        return logs[since:], len(logs)
 
 
+    # ========== Artifacts Collection ==========
+
+    def get_artifacts_collection(self):
+        return self.db.collection('artifacts')
+
+    async def save_artifacts(self, artifacts: Dict[str, Dict[str, Any]]) -> int:
+        """
+        成果物を内容ハッシュをキーに保存（既存ハッシュは書き込まない）
+
+        Returns:
+            新規保存件数
+        """
+        return await self._create_missing('artifacts', artifacts)
+
+    async def get_artifacts(self, content_hashes: List[str]) -> Dict[str, Dict]:
+        """
+        成果物を取得
+
+        1件で最大 1MiB 近くになり件数上限のエンティティキャッシュには載せないため、常に読み込む
+        """
+        if not content_hashes:
+            return {}
+        client = self.db
+        collection = client.collection('artifacts')
+        refs = [collection.document(content_hash) for content_hash in set(content_hashes)]
+        return {doc.id: doc.to_dict() async for doc in client.get_all(refs) if doc.exists}
+
     # ========== Messages Collection ==========
 
     def get_messages_collection(self):
@@ -283,51 +1048,50 @@ class FirestoreDB:
         """メッセージを保存（重複チェック付き）"""
         # message.id は Chatwork の message_id を使用
         doc_ref = self.get_messages_collection().document(message.id)
-        doc = doc_ref.get()
-
-        # 既存なら何もしない（重複排除）
-        if doc.exists:
-            return message
 
-        data = self._serialize(message)
-        doc_ref.set(data)
+        # create() は既存ドキュメントがあれば失敗する → 重複として無視
+        try:
+            await doc_ref.create(self._serialize(message))
+        except AlreadyExists:
+            pass
         return message
 
-    async def save_messages_batch(self, messages: List[BaseModel]) -> int:
-        """メッセージを一括保存（重複排除）"""
-        batch = self.db.batch()
-        saved_count = 0
-
-        for message in messages:
-            doc_ref = self.get_messages_collection().document(message.id)
-            doc = doc_ref.get()
-
-            if not doc.exists:
-                data = self._serialize(message)
-                batch.set(doc_ref, data)
-                saved_count += 1
+    async def save_messages_batch(self, messages: List[BaseModel]) -> Dict[str, int]:
+        """
+        メッセージを一括保存（重複排除）
 
-        if saved_count > 0:
-            batch.commit()
+        Returns:
+            {"saved": 新規保存件数, "skipped": 重複によりスキップした件数}
+        """
+        if not messages:
+            return {"saved": 0, "skipped": 0}
 
-        return saved_count
+        # 入力内の重複も排除（同じ message_id は1件にまとめる）
+        documents = {message.id: self._serialize(message) for message in messages}
+        saved_count = await self._create_missing('messages', documents)
+        return {"saved": saved_count, "skipped": len(messages) - saved_count}
 
     async def get_messages_by_source(
         self,
         source_id: str,
         limit: int = 100,
         offset: int = 0,
+        start_after: Optional[str] = None,
     ) -> List[Dict]:
-        """ソース別メッセージを取得（新しい順）"""
-        query = (
-            self.get_messages_collection()
-            .where('source_id', '==', source_id)
-            .order_by('send_time', direction=firestore.Query.DESCENDING)
-            .limit(limit)
-            .offset(offset)
-        )
+        """
+        ソース別メッセージを取得（新しい順）
+
+        Args:
+            start_after: 前ページの message_cursor()。指定時は offset を使わず
+                (send_time, id) の続きから取得するため、深いページでもコストが一定
+        """
+        query = self.get_messages_collection().where('source_id', '==', source_id)
+        query = self._ordered_page(query, 'send_time', limit, start_after)
+        if offset and not start_after:
+            query = query.offset(offset)
+
         docs = query.stream()
-        return [doc.to_dict() for doc in docs]
+        return [doc.to_dict() async for doc in docs]
 
     async def get_messages_by_room(
         self,
@@ -343,12 +1107,19 @@ class FirestoreDB:
 
         query = query.order_by('send_time', direction=firestore.Query.DESCENDING).limit(limit)
         docs = query.stream()
-        return [doc.to_dict() for doc in docs]
+        return [doc.to_dict() async for doc in docs]
 
     async def get_message_count_by_source(self, source_id: str) -> int:
-        """ソース別メッセージ数を取得"""
-        docs = self.get_messages_collection().where('source_id', '==', source_id).stream()
-        return sum(1 for _ in docs)
+        """ソース別メッセージ数を取得（集計クエリでサーバー側カウント）"""
+        query = (
+            self.get_messages_collection()
+            .where('source_id', '==', source_id)
+            .count(alias='total')
+        )
+        results = await query.get()
+        if results and results[0]:
+            return int(results[0][0].value)
+        return 0
 
     async def get_latest_message_id(self, source_id: str) -> Optional[str]:
         """ソースの最新メッセージIDを取得"""
@@ -358,7 +1129,7 @@ class FirestoreDB:
             .order_by('send_time', direction=firestore.Query.DESCENDING)
             .limit(1)
         )
-        docs = list(query.stream())
+        docs = [doc async for doc in query.stream()]
         if docs:
             return docs[0].to_dict().get('id')
         return None
@@ -370,23 +1141,287 @@ class FirestoreDB:
 
     async def get_sync_status(self, source_id: str) -> Optional[Dict]:
         """同期状態を取得"""
-        doc = self.get_sync_status_collection().document(source_id).get()
+        doc = await self.get_sync_status_collection().document(source_id).get()
         if doc.exists:
             return doc.to_dict()
         return None
 
-    async def update_sync_status(self, source_id: str, updates: Dict[str, Any]) -> Dict:
-        """同期状態を更新"""
-        doc_ref = self.get_sync_status_collection().document(source_id)
-        doc = doc_ref.get()
+    async def get_sync_statuses(self, source_ids: List[str]) -> Dict[str, Dict]:
+        """複数ソースの同期状態を一括取得（get_all の1往復）"""
+        if not source_ids:
+            return {}
+
+        client = self.db
+        collection = client.collection('sync_status')
+        refs = [collection.document(source_id) for source_id in dict.fromkeys(source_ids)]
+
+        statuses = {}
+        async for doc in client.get_all(refs):
+            if doc.exists:
+                statuses[doc.id] = doc.to_dict()
+        return statuses
 
+    async def update_sync_status(
+        self,
+        source_id: str,
+        updates: Dict[str, Any],
+        fence: Optional[Tuple[str, int]] = None,
+    ) -> bool:
+        """
+        同期状態を更新（存在しなければ作成）
+
+        削除済みソースの同期状態を作り直さないよう、トランザクション内でソースの
+        存在を確認する。fence=(リース名, fencing_token) を渡した場合は同じ
+        トランザクションでリースも確認し、保持していなければ LeaseNotHeldError
+
+        Returns:
+            ソースが削除済みで書き込まなかった場合は False
+        """
+        client = self.db
+        status_ref = client.collection('sync_status').document(source_id)
+        source_ref = client.collection('sources').document(source_id)
+
+        @firestore.async_transactional
+        async def _update(transaction) -> bool:
+            await self._check_fence(transaction, fence)
+            snapshot = await source_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return False
+            transaction.set(status_ref, updates, merge=True)
+            return True
+
+        return await _update(client.transaction())
+
+    async def apply_sync_result(
+        self,
+        source_id: str,
+        status_updates: Dict[str, Any],
+        source_updates: Dict[str, Any],
+        saved_count: int,
+        total_messages: Optional[int] = None,
+        fence: Optional[Tuple[str, int]] = None,
+    ) -> bool:
+        """
+        同期結果を同期状態とソースに1バッチで反映
+
+        メッセージ件数は数え直さず saved_count だけ加算する（Increment）。
+        total_messages を渡した場合（定期フル取得時の再集計）はその値で上書きする。
+        fence=(リース名, fencing_token) を渡した場合はトランザクション内でリースを
+        確認し、保持していなければ書き込まずに LeaseNotHeldError
+
+        Returns:
+            ソースが削除済みで反映できなかった場合は False
+        """
+        count = firestore.Increment(saved_count) if total_messages is None else total_messages
+        client = self.db
+        status_ref = client.collection('sync_status').document(source_id)
+        source_ref = client.collection('sources').document(source_id)
+
+        def _write(writer):
+            writer.set(status_ref, {**status_updates, 'total_messages': count}, merge=True)
+            writer.update(source_ref, {**source_updates, 'message_count': count})
+
+        @firestore.async_transactional
+        async def _fenced(transaction):
+            await self._check_fence(transaction, fence)
+            _write(transaction)
+
+        try:
+            if fence is None:
+                batch = client.batch()
+                _write(batch)
+                await batch.commit()
+            else:
+                await _fenced(client.transaction())
+        except NotFound:
+            return False
+        finally:
+            self.cache.invalidate('sources', source_id)
+            self.cache.invalidate('sources:list')
+        return True
+
+    # ========== Leases Collection ==========
+
+    def get_leases_collection(self):
+        return self.db.collection('leases')
+
+    async def _check_fence(self, transaction, fence: Optional[Tuple[str, int]]):
+        """トランザクション内で fence=(リース名, fencing_token) のリースを保持しているか確認"""
+        if fence is None:
+            return
+        lease_name, fencing_token = fence
+        snapshot = await self.get_leases_collection().document(lease_name).get(transaction=transaction)
+        if not lease_is_held(snapshot.to_dict() if snapshot.exists else None, fencing_token, time.time()):
+            raise LeaseNotHeldError(lease_name)
+
+    async def acquire_lease(self, name: str, holder_id: str, ttl_seconds: float) -> Optional[Dict]:
+        """
+        リースを取得・更新（トランザクション内で保持者と期限を確認）
+
+        Returns:
+            取得できたリース。他の保持者が有効期限内なら None
+        """
+        client = self.db
+        doc_ref = client.collection('leases').document(name)
+
+        @firestore.async_transactional
+        async def _acquire(transaction) -> Optional[Dict]:
+            snapshot = await doc_ref.get(transaction=transaction)
+            current = snapshot.to_dict() if snapshot.exists else None
+            lease = build_lease(current, name, holder_id, ttl_seconds, time.time())
+            if lease is not None:
+                transaction.set(doc_ref, lease)
+            return lease
+
+        return await _acquire(client.transaction())
+
+    async def release_lease(self, name: str, holder_id: str, fencing_token: int) -> bool:
+        """
+        保持中のリースを手放す（即時に他の候補が取得できるよう期限を過去にする）
+
+        fencing_token を引き継ぐためドキュメントは削除しない
+        """
+        client = self.db
+        doc_ref = client.collection('leases').document(name)
+
+        @firestore.async_transactional
+        async def _release(transaction) -> bool:
+            snapshot = await doc_ref.get(transaction=transaction)
+            current = snapshot.to_dict() if snapshot.exists else None
+            if not current or current.get('holder_id') != holder_id or current.get('fencing_token') != fencing_token:
+                return False
+            transaction.update(doc_ref, {'expires_at': 0})
+            return True
+
+        return await _release(client.transaction())
+
+    async def get_lease(self, name: str) -> Optional[Dict]:
+        """リースを取得"""
+        doc = await self.get_leases_collection().document(name).get()
         if doc.exists:
-            doc_ref.update(updates)
-        else:
-            doc_ref.set(updates)
+            return doc.to_dict()
+        return None
+
+    # ========== Cascading Delete ==========
 
-        return doc_ref.get().to_dict()
+    async def _collect_refs(self, query) -> List:
+        """クエリに一致するドキュメント参照を取得（フィールドは取得しない）"""
+        # 空の射影は全フィールドを返すため、ドキュメント名だけを指定する
+        return [doc.reference async for doc in query.select(['__name__']).stream()]
+
+    async def _bulk_delete(
+        self,
+        refs: List,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        BulkWriter で一括削除
+
+        BulkWriter は同期API（内部でスレッド並列）のため別スレッドで実行する。
+        書き込みレートは CASCADE_DELETE_OPS_PER_SECOND で制限する。
+        BulkWriter はバッチのコミット自体の失敗を呼び出し元に伝えないため、
+        成功の通知を受けた件数だけを削除件数として数える
+
+        Returns:
+            {"deleted": 削除件数, "total": 対象件数, "error": 最初の失敗内容}
+        """
+        total = len(refs)
+        if not total:
+            return {"deleted": 0, "total": 0, "error": None}
+
+        def _run() -> Dict[str, Any]:
+            lock = threading.Lock()
+            deleted = 0
+            errors: List[str] = []
+
+            def _on_result(reference, result, bulk_writer):
+                nonlocal deleted
+                with lock:
+                    deleted += 1
+                    count = deleted
+                if on_progress:
+                    on_progress(count, total)
+
+            def _on_error(failure, bulk_writer) -> bool:
+                if failure.attempts < CASCADE_DELETE_MAX_ATTEMPTS:
+                    return True
+                with lock:
+                    errors.append(f"{failure.operation.reference.path}: {failure.message}")
+                return False
+
+            writer = self.db.bulk_writer(BulkWriterOptions(
+                initial_ops_per_second=CASCADE_DELETE_OPS_PER_SECOND,
+                max_ops_per_second=CASCADE_DELETE_OPS_PER_SECOND,
+            ))
+            writer.on_write_result(_on_result)
+            writer.on_write_error(_on_error)
+            for ref in refs:
+                writer.delete(ref)
+            writer.close()
+            return {"deleted": deleted, "total": total, "error": errors[0] if errors else None}
+
+        return await asyncio.to_thread(_run)
+
+    async def delete_source_dependents(
+        self,
+        source_id: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        ソースに紐づくメッセージ・同期状態を削除
+
+        Returns:
+            {"deleted": 削除件数, "total": 対象件数, "error": 最初の失敗内容}
+        """
+        refs = await self._collect_refs(
+            self.get_messages_collection().where('source_id', '==', source_id)
+        )
+        refs.append(self.get_sync_status_collection().document(source_id))
+        return await self._bulk_delete(refs, on_progress)
+
+    async def delete_project_dependents(
+        self,
+        project_id: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        プロジェクトに紐づくソース（メッセージ・同期状態を含む）・課題・要件定義書・開発タスクを削除
+
+        成果物（artifacts）は開発タスク間で共有されるため削除しない
+
+        Returns:
+            {"deleted": 削除件数, "total": 対象件数, "error": 最初の失敗内容}
+        """
+        source_refs = await self._collect_refs(
+            self.get_sources_collection().where('project_id', '==', project_id)
+        )
+        queries = [
+            self.get_messages_collection().where('source_id', '==', ref.id) for ref in source_refs
+        ] + [
+            self.get_issues_collection().where('project_id', '==', project_id),
+            self.get_requirements_collection().where('project_id', '==', project_id),
+            self.get_developments_collection().where('project_id', '==', project_id),
+        ]
+        collected = await asyncio.gather(*[self._collect_refs(q) for q in queries])
+
+        refs = [ref for group in collected for ref in group]
+        refs.extend(self.get_sync_status_collection().document(ref.id) for ref in source_refs)
+        refs.extend(source_refs)
+
+        result = await self._bulk_delete(refs, on_progress)
+        for namespace in ('sources', 'sources:list', 'requirements', 'developments'):
+            self.cache.invalidate(namespace)
+        return result
+
+
+def _create_db() -> DatabaseBackend:
+    """DATABASE_BACKEND（firestore | sqlite）に応じたバックエンドを生成"""
+    backend = os.getenv('DATABASE_BACKEND', 'firestore').lower()
+    if backend == 'sqlite':
+        from app.services.sqlite_database import SQLiteDB
+        return SQLiteDB()
+    return FirestoreDB()
 
 
 # シングルトンインスタンス
-db = FirestoreDB()
+db = _create_db()
@@ -0,0 +1,354 @@
+"""
+DB Metrics - データベース操作の計測
+操作種別・コレクション・ドキュメント数・レイテンシをプロセス内に集計する
+"""
+
+import os
+import json
+import math
+import time
+import logging
+import functools
+import inspect
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.exceptions import CallBudgetExceededError
+
+logger = logging.getLogger(__name__)
+
+# メソッド名の先頭語 → 操作種別
+OPERATION_TYPES: Dict[str, str] = {
+    'get': 'read',
+    'list': 'read',
+    'ping': 'read',
+    'create': 'write',
+    'save': 'write',
+    'update': 'write',
+    'append': 'write',
+    'apply': 'write',
+    'acquire': 'write',
+    'release': 'write',
+    'delete': 'delete',
+}
+
+# メソッド名に含まれる語 → コレクション名
+COLLECTION_NAMES: Dict[str, str] = {
+    'project': 'projects',
+    'source': 'sources',
+    'issue': 'issues',
+    'requirement': 'requirements',
+    'development': 'developments',
+    'artifact': 'artifacts',
+    'message': 'messages',
+    'sync_status': 'sync_status',
+    'lease': 'leases',
+}
+
+# レイテンシのパーセンタイル計算に保持する直近サンプル数
+RESERVOIR_SIZE = 1024
+
+# call_budget の扱い: off（検査しない）/ warn（警告ログ）/ strict（例外でリクエストを失敗させる）
+# strict は書き込みの確定後に500を返すためテスト専用（strict_budgets()）。環境変数では off / warn のみ
+CALL_BUDGET_MODES = ('off', 'warn', 'strict')
+ENV_CALL_BUDGET_MODES = ('off', 'warn')
+
+# 現在の操作の外側で計測中かどうか（ネストした呼び出しを二重計上しない）
+_in_operation: ContextVar[bool] = ContextVar('db_metrics_in_operation', default=False)
+
+# 有効な集計スコープ（API呼び出し・ポーリング1周期などの単位）
+_scopes: ContextVar[Tuple['OperationScope', ...]] = ContextVar('db_metrics_scopes', default=())
+
+
+def describe_operation(method_name: str) -> Tuple[str, str]:
+    """メソッド名から (操作種別, コレクション名) を推定"""
+    verb, _, rest = method_name.partition('_')
+    op_type = OPERATION_TYPES.get(verb, 'other')
+
+    # 最初に現れる語をコレクションとみなす（get_messages_by_source → messages）
+    matches = [(rest.find(word), name) for word, name in COLLECTION_NAMES.items() if word in rest]
+    collection = min(matches)[1] if matches else '-'
+    return op_type, collection
+
+
+def count_documents(method_name: str, result: Any) -> int:
+    """戻り値から読み書きしたドキュメント数を推定"""
+    if result is None or result is False:
+        return 0
+    if '_count' in method_name:
+        # count() 集計は件数に関わらず1回の読込
+        return 1
+    if isinstance(result, bool):
+        return 1
+    if isinstance(result, int):
+        return result
+    if isinstance(result, tuple):
+        return len(result[0]) if result and isinstance(result[0], list) else 1
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        if 'saved' in result and 'skipped' in result:
+            return result['saved'] + result['skipped']
+        # ID → ドキュメントの辞書か、単一ドキュメントか
+        if all(isinstance(v, dict) for v in result.values()):
+            return len(result)
+        return 1
+    if isinstance(result, BaseModel):
+        return 1
+    return 1
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """最近傍法でパーセンタイルを計算"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+class OperationScope:
+    """スコープ内で実行された操作の集計"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.operations: Dict[str, int] = {}
+        self.documents: Dict[str, int] = {}
+        self.latency_ms = 0.0
+
+    def add(self, op_type: str, documents: int, latency_ms: float):
+        self.operations[op_type] = self.operations.get(op_type, 0) + 1
+        self.documents[op_type] = self.documents.get(op_type, 0) + documents
+        self.latency_ms += latency_ms
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "scope": self.name,
+            "operations": dict(self.operations),
+            "documents": dict(self.documents),
+            "latency_ms": round(self.latency_ms, 2),
+        }
+
+
+class _OperationStats:
+    """1メソッド分の統計"""
+
+    def __init__(self, op_type: str, collection: str):
+        self.op_type = op_type
+        self.collection = collection
+        self.calls = 0
+        self.errors = 0
+        self.documents = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=RESERVOIR_SIZE)
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "type": self.op_type,
+            "collection": self.collection,
+            "calls": self.calls,
+            "errors": self.errors,
+            "documents": self.documents,
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "p50_ms": round(percentile(ordered, 50), 2),
+            "p95_ms": round(percentile(ordered, 95), 2),
+            "p99_ms": round(percentile(ordered, 99), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class DBMetrics:
+    """
+    DB操作メトリクスのレジストリ
+
+    DatabaseBackend の公開メソッドは instrument() でラップされ、
+    呼び出しごとに record() される。DB_METRICS_LOG=true のときは
+    1操作ごとに構造化ログ（JSON）も出力する。
+    """
+
+    def __init__(self):
+        self._operations: Dict[str, _OperationStats] = {}
+        self.log_enabled = os.getenv('DB_METRICS_LOG', 'false').lower() == 'true'
+        self.budget_mode = os.getenv('DB_CALL_BUDGET', 'warn').lower()
+        if self.budget_mode not in ENV_CALL_BUDGET_MODES:
+            logger.warning(f"DB_CALL_BUDGET={self.budget_mode} is not supported, using warn")
+            self.budget_mode = 'warn'
+        self.budgets: Dict[str, Dict[str, int]] = {}
+        self.started_at = time.time()
+
+    def record(
+        self,
+        backend: str,
+        method: str,
+        documents: int,
+        latency_ms: float,
+        error: Optional[BaseException] = None,
+    ):
+        """1操作分を記録"""
+        stats = self._operations.get(method)
+        if stats is None:
+            stats = self._operations[method] = _OperationStats(*describe_operation(method))
+
+        stats.calls += 1
+        stats.documents += documents
+        stats.total_ms += latency_ms
+        stats.max_ms = max(stats.max_ms, latency_ms)
+        stats.samples.append(latency_ms)
+        if error is not None:
+            stats.errors += 1
+
+        for scope in _scopes.get():
+            scope.add(stats.op_type, documents, latency_ms)
+
+        if self.log_enabled:
+            logger.info(json.dumps({
+                "event": "db_operation",
+                "backend": backend,
+                "method": method,
+                "type": stats.op_type,
+                "collection": stats.collection,
+                "documents": documents,
+                "latency_ms": round(latency_ms, 2),
+                "error": type(error).__name__ if error is not None else None,
+            }))
+
+    @contextmanager
+    def scope(self, name: str) -> Iterator[OperationScope]:
+        """
+        with 内（およびそこから生成したタスク）の操作を集計する
+
+        例: with db_metrics.scope("polling_cycle") as scope: ...
+        """
+        current = OperationScope(name)
+        token = _scopes.set(_scopes.get() + (current,))
+        try:
+            yield current
+        finally:
+            _scopes.reset(token)
+            if self.log_enabled:
+                logger.info(json.dumps({"event": "db_scope", **current.summary()}))
+
+    @contextmanager
+    def strict_budgets(self) -> Iterator[None]:
+        """テスト用: with 内では上限超過を CallBudgetExceededError にする"""
+        previous = self.budget_mode
+        self.budget_mode = 'strict'
+        try:
+            yield
+        finally:
+            self.budget_mode = previous
+
+    def check_budget(self, endpoint: str, scope: OperationScope):
+        """スコープ内の呼び出し回数を endpoint の上限と比較"""
+        budget = self.budgets[endpoint]
+        used = {
+            "reads": scope.operations.get('read', 0),
+            "writes": scope.operations.get('write', 0) + scope.operations.get('delete', 0),
+        }
+        if used["reads"] <= budget["reads"] and used["writes"] <= budget["writes"]:
+            return
+
+        budget["violations"] += 1
+        limits = {"reads": budget["reads"], "writes": budget["writes"]}
+        logger.warning(f"DB call budget exceeded for {endpoint}: used={used} budget={limits}")
+        if self.budget_mode == 'strict':
+            raise CallBudgetExceededError(endpoint, used, limits)
+
+    def stats(self) -> Dict[str, Any]:
+        """メソッド別・操作種別ごとの集計を取得"""
+        totals: Dict[str, Dict[str, int]] = {}
+        for stats in self._operations.values():
+            total = totals.setdefault(stats.op_type, {"calls": 0, "documents": 0, "errors": 0})
+            total["calls"] += stats.calls
+            total["documents"] += stats.documents
+            total["errors"] += stats.errors
+
+        return {
+            "since": self.started_at,
+            "totals": totals,
+            "operations": {name: s.to_dict() for name, s in sorted(self._operations.items())},
+            "budget_mode": self.budget_mode,
+            "budgets": {name: dict(b) for name, b in sorted(self.budgets.items())},
+        }
+
+    def reset(self):
+        self._operations.clear()
+        for budget in self.budgets.values():
+            budget["violations"] = 0
+        self.started_at = time.time()
+
+
+def instrument(method: Callable, backend: str) -> Callable:
+    """非同期メソッドをラップして所要時間と戻り値のドキュメント数を記録"""
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        if _in_operation.get():
+            return await method(*args, **kwargs)
+
+        token = _in_operation.set(True)
+        started = time.perf_counter()
+        try:
+            result = await method(*args, **kwargs)
+        except BaseException as e:
+            db_metrics.record(backend, method.__name__, 0, (time.perf_counter() - started) * 1000, error=e)
+            raise
+        finally:
+            _in_operation.reset(token)
+
+        db_metrics.record(
+            backend, method.__name__, count_documents(method.__name__, result),
+            (time.perf_counter() - started) * 1000,
+        )
+        return result
+
+    return wrapper
+
+
+def call_budget(reads: int = 0, writes: int = 0) -> Callable:
+    """
+    エンドポイントのDB呼び出し回数の上限を宣言するデコレータ
+
+    1リクエストあたりの読込・書込（削除を含む）の呼び出し回数が上限を
+    超えると警告ログ、テスト（strict_budgets()）では CallBudgetExceededError。
+    N+1 読込などの回帰を tests/test_call_budgets.py がローカルバックエンド
+    （sqlite）で検出する。BackgroundTasks で実行される処理は含まない。
+
+    例:
+        @router.get("/{issue_id}")
+        @call_budget(reads=1)
+        async def get_issue(issue_id: str): ...
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        name = f"{endpoint.__module__.rsplit('.', 1)[-1]}.{endpoint.__name__}"
+        db_metrics.budgets[name] = {"reads": reads, "writes": writes, "violations": 0}
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            if db_metrics.budget_mode == 'off':
+                return await endpoint(*args, **kwargs)
+            with db_metrics.scope(name) as scope:
+                result = await endpoint(*args, **kwargs)
+            db_metrics.check_budget(name, scope)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_class(cls: type):
+    """クラスに定義された公開の非同期メソッドをすべて計測対象にする"""
+    for name, member in list(vars(cls).items()):
+        if name.startswith('_') or not inspect.iscoroutinefunction(member):
+            continue
+        setattr(cls, name, instrument(member, cls.__name__))
+
+
+# シングルトンインスタンス
+db_metrics = DBMetrics()
@@ -0,0 +1,100 @@
+"""
+Development Progress - 開発パイプラインの進捗書き込みバッファ
+ステータス・ログ・成果物参照などの更新をメモリ上でまとめ、
+一定間隔またはフェーズの区切りで1回の書き込みとして反映する
+"""
+
+import os
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from app.models.development import DevelopmentStatus
+from app.services.database import db
+
+logger = logging.getLogger(__name__)
+
+# バッファを自動で書き出すまでの待ち時間（秒）
+FLUSH_INTERVAL_SECONDS = float(os.getenv("DEVELOPMENT_PROGRESS_FLUSH_SECONDS", "1.0"))
+
+
+class DevelopmentProgressBuffer:
+    """
+    1件の開発タスクに対する write-behind バッファ
+
+    同じフィールドへの更新は最後の値だけが残り、ログは順序を保って
+    まとめて追記される。ステータス変更時（フェーズの区切り）は即座に、
+    それ以外は flush_interval 秒後に書き出す。パイプライン終了時は
+    close() で残りを必ず書き出すこと。
+    """
+
+    def __init__(self, development_id: str, flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        self.development_id = development_id
+        self.flush_interval = flush_interval
+        self._updates: Dict[str, Any] = {}
+        self._logs: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self.writes = 0
+
+    def log(self, agent: str, message: str, level: str = "info"):
+        """ログエントリを追加（書き込みは遅延）"""
+        self._logs.append({
+            "timestamp": datetime.now(),
+            "agent": agent,
+            "message": message,
+            "level": level,
+        })
+        self._schedule()
+
+    def update(self, fields: Dict[str, Any]):
+        """フィールド更新を追加（書き込みは遅延）"""
+        self._updates.update(fields)
+        self._updates["updated_at"] = datetime.now()
+        self._schedule()
+
+    async def set_status(self, status: DevelopmentStatus):
+        """ステータスを更新し、それまでの内容と合わせて即座に書き出す"""
+        self._updates["status"] = status.value
+        self._updates["updated_at"] = datetime.now()
+        await self.flush()
+
+    async def flush(self):
+        """溜まっている更新を1回の書き込みで反映"""
+        async with self._lock:
+            if not self._updates and not self._logs:
+                return
+
+            updates, logs = self._updates, self._logs
+            self._updates, self._logs = {}, []
+            try:
+                await db.apply_development_progress(self.development_id, updates, logs)
+                self.writes += 1
+            except BaseException:
+                # 失敗・キャンセル時は次回の書き出しに回す（後から入った更新を優先）
+                self._updates = {**updates, **self._updates}
+                self._logs = logs + self._logs
+                raise
+
+    async def close(self):
+        """タイマーを止めて残りを書き出す（パイプライン終了時に必ず呼ぶ）"""
+        if self._timer and not self._timer.done():
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+        self._timer = None
+        await self.flush()
+
+    def _schedule(self):
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush progress for development {self.development_id}: {e}")
@@ -0,0 +1,167 @@
+"""
+Leader Election - 複数インスタンス間のリーダー選出
+ストレージ上のリース（TTL + fencing token）で、ある処理を実行する
+インスタンスを常に1つに絞る
+"""
+
+import os
+import time
+import uuid
+import socket
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, AsyncIterator, Tuple
+
+from app.exceptions import LeaseNotHeldError
+from app.services.database import db
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    """
+    リースによるリーダー選出
+
+    全候補が ttl/3 秒ごとにリースの取得・更新を試み、取得できた1つだけが
+    リーダーになる。リーダーが落ちても ttl 秒以内に他の候補が引き継ぐ。
+    リーダーは更新に失敗したまま期限を迎えた時点で自らリーダーをやめる。
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, enabled: bool = True):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.holder_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.fencing_token: Optional[int] = None
+        self._expires_at = 0.0  # time.monotonic() 基準（サーバー上の期限より早めに見積もる）
+        self._elected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._started = False  # start() で常駐させているか（hold() の一時的な取得と区別）
+        self._last_error: Optional[str] = None
+
+    @property
+    def renew_interval(self) -> float:
+        return self.ttl_seconds / 3
+
+    @property
+    def is_leader(self) -> bool:
+        """リースを保持しているか（選出無効時は常に True）"""
+        if not self.enabled:
+            return True
+        return self.fencing_token is not None and time.monotonic() < self._expires_at
+
+    @property
+    def fence(self) -> Optional[Tuple[str, Optional[int]]]:
+        """書き込み時にストレージ側で確認する (リース名, fencing_token)（選出無効時は None）"""
+        if not self.enabled:
+            return None
+        return (self.name, self.fencing_token)
+
+    def start(self):
+        """選出ループを開始"""
+        self._started = True
+        self._ensure_task()
+
+    def _ensure_task(self):
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        """
+        リースを保持した状態で処理を実行する（手動同期など選出ループ外の処理用）
+
+        既にリーダーならそのまま実行する。選出ループが動いていなければ
+        その場で取得を試み、処理中は更新を続けて終了後に手放す。
+        他のインスタンスが保持している場合は LeaseNotHeldError
+        """
+        if self.is_leader:
+            yield
+            return
+        if self._started:
+            raise LeaseNotHeldError(self.name)
+
+        await self._try_acquire()
+        if not self.is_leader:
+            raise LeaseNotHeldError(self.name)
+        self._ensure_task()
+        try:
+            yield
+        finally:
+            if not self._started:
+                await self.stop()
+
+    async def stop(self):
+        """選出ループを止め、保持中のリースを手放す"""
+        self._started = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self.enabled and self.fencing_token is not None:
+            token = self.fencing_token
+            self._demote()
+            try:
+                await db.release_lease(self.name, self.holder_id, token)
+                logger.info(f"Released lease {self.name} (token {token})")
+            except Exception as e:
+                logger.error(f"Failed to release lease {self.name}: {e}")
+
+    async def wait_until_leader(self):
+        """リーダーになるまで待機"""
+        while not self.is_leader:
+            self._elected.clear()
+            try:
+                await asyncio.wait_for(self._elected.wait(), timeout=self.renew_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self):
+        while True:
+            try:
+                await self._try_acquire()
+                self._last_error = None
+            except Exception as e:
+                self._last_error = str(e)
+                logger.error(f"Lease {self.name} renewal failed: {e}")
+                if not self.is_leader:
+                    self._demote()
+            await asyncio.sleep(self.renew_interval)
+
+    async def _try_acquire(self):
+        started = time.monotonic()
+        lease = await db.acquire_lease(self.name, self.holder_id, self.ttl_seconds)
+
+        if lease is None:
+            if self.fencing_token is not None:
+                logger.warning(f"Lost lease {self.name} to another instance")
+            self._demote()
+            return
+
+        if lease["fencing_token"] != self.fencing_token:
+            logger.info(f"Acquired lease {self.name} (token {lease['fencing_token']}, holder {self.holder_id})")
+        self.fencing_token = lease["fencing_token"]
+        # 取得要求を送った時刻から数えて期限を見積もる
+        self._expires_at = started + self.ttl_seconds
+        self._elected.set()
+
+    def _demote(self):
+        self.fencing_token = None
+        self._expires_at = 0.0
+        self._elected.clear()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "lease": self.name,
+            "holder_id": self.holder_id,
+            "is_leader": self.is_leader,
+            "fencing_token": self.fencing_token,
+            "lease_expires_in_seconds": round(max(0.0, self._expires_at - time.monotonic()), 1) if self.enabled else None,
+            "last_error": self._last_error,
+        }
@@ -0,0 +1,160 @@
+"""
+Polling Metrics - メッセージ自動取得の計測
+ルームごとの取得レイテンシ・取り込み件数・重複率と、周期ごとの所要時間を集計する
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional
+
+from app.services.db_metrics import percentile
+
+# 直近サンプルの保持数
+RESERVOIR_SIZE = 256
+
+# 取得レイテンシのヒストグラム境界（秒）
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """累積バケット + 直近サンプルのパーセンタイル"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.samples: Deque[float] = deque(maxlen=RESERVOIR_SIZE)
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.samples.append(seconds)
+        self.total += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        count = sum(self.counts)
+        buckets = {f"le_{bound}": n for bound, n in zip(LATENCY_BUCKETS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": count,
+            "avg_ms": round(self.total / count * 1000, 1) if count else 0.0,
+            "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 1),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+            "buckets": buckets,
+        }
+
+
+class RoomMetrics:
+    """1ルーム分の取得状況"""
+
+    def __init__(self):
+        self.fetch_latency = LatencyHistogram()
+        self.syncs = 0
+        self.errors = 0
+        self.fetched = 0  # API から受け取ったメッセージ数
+        self.ingested = 0  # 新たに保存したメッセージ数
+        self.recent_ingested: Deque[int] = deque(maxlen=RESERVOIR_SIZE)
+        self.last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        recent = list(self.recent_ingested)
+        return {
+            "fetch_latency": self.fetch_latency.to_dict(),
+            "syncs": self.syncs,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "messages_fetched": self.fetched,
+            "messages_ingested": self.ingested,
+            "ingested_per_sync": {
+                "last": recent[-1] if recent else 0,
+                "avg": round(sum(recent) / len(recent), 2) if recent else 0.0,
+                "max": max(recent, default=0),
+            },
+            # 取得したうち既に保存済みだった割合（差分取得が効いていれば低い）
+            "dedupe_hit_ratio": round(1 - self.ingested / self.fetched, 4) if self.fetched else 0.0,
+        }
+
+
+class PollingMetrics:
+    """PollingService の計測値"""
+
+    def __init__(self):
+        self.rooms: Dict[str, RoomMetrics] = {}
+        self.cycle_seconds: Deque[float] = deque(maxlen=RESERVOIR_SIZE)
+        self.last_cycle: Optional[Dict[str, Any]] = None
+        self.cycle_overruns = 0
+        self.started_at = time.time()
+
+    def room(self, source_id: str) -> RoomMetrics:
+        metrics = self.rooms.get(source_id)
+        if metrics is None:
+            metrics = self.rooms[source_id] = RoomMetrics()
+        return metrics
+
+    def discard(self, source_id: str):
+        self.rooms.pop(source_id, None)
+
+    def record_fetch(self, source_id: str, seconds: float, messages: int):
+        """Chatwork API からの取得1回分"""
+        room = self.room(source_id)
+        room.fetch_latency.observe(seconds)
+        room.fetched += messages
+
+    def record_sync(self, source_id: str, ingested: Optional[int], error: Optional[str] = None):
+        """ルーム同期1回分（ingested=None は失敗）"""
+        room = self.room(source_id)
+        room.syncs += 1
+        if ingested is None:
+            room.errors += 1
+            room.last_error = error
+            return
+        room.ingested += ingested
+        room.recent_ingested.append(ingested)
+
+    def record_cycle(self, seconds: float, rooms: int, interval: float) -> bool:
+        """
+        ポーリング1周期分（interval は基本間隔）
+
+        Returns:
+            所要時間が基本間隔を超えた（オーバーラン）か
+        """
+        overrun = seconds > interval
+        if overrun:
+            self.cycle_overruns += 1
+        self.cycle_seconds.append(seconds)
+        self.last_cycle = {
+            "finished_at": datetime.now().isoformat(),
+            "duration_seconds": round(seconds, 3),
+            "rooms_synced": rooms,
+            "interval_seconds": interval,
+            "utilization": round(seconds / interval, 4) if interval else 0.0,
+            "overrun": overrun,
+        }
+        return overrun
+
+    def cycle_stats(self) -> Dict[str, Any]:
+        ordered = sorted(self.cycle_seconds)
+        return {
+            "count": len(ordered),
+            "p50_seconds": round(percentile(ordered, 50), 3),
+            "p95_seconds": round(percentile(ordered, 95), 3),
+            "max_seconds": round(ordered[-1], 3) if ordered else 0.0,
+            "overruns": self.cycle_overruns,
+            "last": self.last_cycle,
+        }
+
+    def rooms_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {source_id: metrics.to_dict() for source_id, metrics in self.rooms.items()}
+
+    def reset(self):
+        self.rooms.clear()
+        self.cycle_seconds.clear()
+        self.last_cycle = None
+        self.cycle_overruns = 0
+        self.started_at = time.time()
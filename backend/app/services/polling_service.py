@@ -3,18 +3,106 @@ Polling Service - Chatworkメッセージ自動取得
 登録された全ルームから定期的にメッセージを取得し、Firestoreに蓄積する
 """
 
+import os
+import math
+import time
+import random
 import asyncio
 import logging
+import itertools
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List, Dict, Any, Set, Tuple
 
+from app.exceptions import LeaseNotHeldError, NotFoundError
 from app.models.source import Source, SourceType
 from app.models.message import ChatworkMessage, SyncStatus
 from app.services.database import db
+from app.services.cascade_delete_service import cascade_delete_service
+from app.services.db_metrics import db_metrics
 from app.services.chatwork_service import chatwork_service
+from app.services.polling_metrics import PollingMetrics
+from app.services.leader_election import LeaderElection
+from app.services.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Chatwork のメッセージ取得APIが1回で返す最大件数
+CHATWORK_MESSAGE_LIMIT = 100
+
+
+# ルームごとのポーリング間隔の下限（秒）・伸縮の係数
+MIN_INTERVAL_SECONDS = 30
+QUIET_BACKOFF = 1.5  # 新着なしのとき間隔を伸ばす倍率
+ERROR_BACKOFF = 2.0  # 同期失敗時に間隔を伸ばす倍率
+JITTER_RATIO = 0.1  # 次回時刻を ±10% ずらして一斉実行を避ける
+
+
+def _message_key(message_id: str):
+    """メッセージIDの大小比較用キー（数値IDは数値として比較）"""
+    return (0, int(message_id), "") if message_id.isdigit() else (1, 0, message_id)
+
+
+class RoomSchedule:
+    """
+    ルームごとのポーリング予定
+
+    新着があれば間隔を半分（下限 MIN_INTERVAL_SECONDS）に、なければ
+    QUIET_BACKOFF 倍（上限 max_interval）に伸ばし、次回時刻にジッターを加える。
+    次回時刻は実行時刻ではなく予定時刻から数えるため同期の所要時間で
+    ずれていかない。予定時刻を1周期以上過ぎていた場合は取りこぼした
+    回をまとめて1回とし、skipped_ticks に数える。
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.next_due = 0.0  # time.monotonic() 基準。初回は即時
+        self.last_polled_at: Optional[datetime] = None
+        self.last_new_messages = 0
+        self.consecutive_errors = 0
+        self.skipped_ticks = 0
+
+    def is_due(self, now: float) -> bool:
+        return now >= self.next_due
+
+    def record(self, new_messages: Optional[int], max_interval: float):
+        """同期結果から次回の間隔を決める（new_messages=None は失敗）"""
+        if new_messages is None:
+            self.consecutive_errors += 1
+            self.interval = min(max_interval, self.interval * ERROR_BACKOFF)
+        else:
+            self.consecutive_errors = 0
+            self.last_new_messages = new_messages
+            if new_messages > 0:
+                self.interval = max(MIN_INTERVAL_SECONDS, self.interval / 2)
+            else:
+                self.interval = min(max_interval, self.interval * QUIET_BACKOFF)
+
+        self.last_polled_at = datetime.now()
+        now = time.monotonic()
+        # 予定どおり（または遅れて）実行した場合は予定時刻から、予定外の手動同期は現在時刻から数える
+        anchor = self.next_due if 0 < self.next_due <= now else now
+        jitter = random.uniform(1 - JITTER_RATIO, 1 + JITTER_RATIO)
+        next_due = anchor + self.interval * jitter
+        if next_due <= now:
+            missed = math.ceil((now - next_due) / self.interval)
+            next_due += missed * self.interval
+            self.skipped_ticks += missed
+        self.next_due = next_due
+
+    def defer(self, seconds: float):
+        """間隔は変えずに次回時刻を遅らせる（API 枠が空いていない場合）"""
+        self.next_due = max(self.next_due, time.monotonic() + max(1.0, seconds))
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "interval_seconds": round(self.interval, 1),
+            "next_poll_in_seconds": round(max(0.0, self.next_due - now), 1),
+            "last_polled_at": self.last_polled_at.isoformat() if self.last_polled_at else None,
+            "last_new_messages": self.last_new_messages,
+            "consecutive_errors": self.consecutive_errors,
+            "skipped_ticks": self.skipped_ticks,
+        }
+
 
 class PollingService:
     """Chatworkメッセージ自動取得サービス"""
@@ -22,10 +110,46 @@ class PollingService:
     def __init__(self):
         self._running = False
         self._task: Optional[asyncio.Task] = None
-        self._interval_seconds = 60  # デフォルト: 1分間隔
+        self._interval_seconds = 60  # デフォルト: 1分間隔（ルームごとの初期間隔）
+        # 新着のないルームの間隔の上限
+        self._max_interval_seconds = int(os.getenv("POLLING_MAX_INTERVAL_SECONDS", "300"))
+        # 同時に同期するルーム数の上限（API呼び出し数は chatwork_service のトークンバケットで制限）
+        self._max_concurrency = max(1, int(os.getenv("POLLING_MAX_CONCURRENCY", "8")))
+        # 差分取得（force=0）で漏れがないか確認するための定期フル取得の間隔
+        self._full_sync_seconds = int(os.getenv("POLLING_FULL_SYNC_SECONDS", "3600"))
         self._last_poll_at: Optional[datetime] = None
         self._poll_count = 0
         self._error_count = 0
+        # ソースごとの取り込み済み最新メッセージID（ハイウォーターマーク）
+        self._watermarks: Dict[str, Optional[str]] = {}
+        self._last_full_sync: Dict[str, float] = {}
+        # 差分取得の取りこぼし確認用。ルームのメッセージ数（GET /rooms の message_num）と、
+        # ソースごとの (基準時点のメッセージ数, その後に差分で受け取った件数)
+        self._room_message_nums: Dict[str, int] = {}
+        self._diff_baselines: Dict[str, Tuple[int, int]] = {}
+        self._schedules: Dict[str, RoomSchedule] = {}
+        # 登録済みルームの一覧（予定時刻ごとに起きても、読み直すのは基本間隔ごと）
+        self._sources: List[Source] = []
+        self._discovered_at: Optional[float] = None
+        self._metrics = PollingMetrics()
+        # 複数インスタンス起動時もポーリングするのはリースを持つ1台だけ
+        self._leader = LeaderElection(
+            "chatwork-polling",
+            ttl_seconds=float(os.getenv("POLLING_LEASE_TTL_SECONDS", "60")),
+            enabled=os.getenv("POLLING_LEADER_ELECTION", "true").lower() == "true",
+        )
+        self._leader_token: Optional[int] = None
+        # 同期中のルーム（ループと sync_now が同じルームを重ねて同期しないよう共有）
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_size = 0
+        # プロジェクトごとの Chatwork API 呼び出し枠（1プロジェクトが全体のクォータを使い切らないように）
+        # None（auto）は全体の枠をプロジェクト数で等分する
+        project_limit = os.getenv("POLLING_PROJECT_RATE_LIMIT_REQUESTS", "auto").lower()
+        self._project_rate_limit: Optional[int] = None if project_limit == "auto" else int(project_limit)
+        self._project_buckets: Dict[str, TokenBucket] = {}
+        self._source_projects: Dict[str, str] = {}
+        self._prepaid: Set[str] = set()  # 同期枠の取得前にプロジェクト枠を確保済みのソース
 
     @property
     def is_running(self) -> bool:
@@ -34,19 +158,58 @@ class PollingService:
     @property
     def status(self) -> dict:
         """現在のPolling状態を取得"""
+        now = time.monotonic()
         return {
             "is_running": self._running,
             "interval_seconds": self._interval_seconds,
+            "max_concurrency": self._max_concurrency,
+            "rate_limit": chatwork_service.rate_limiter.stats(),
             "last_poll_at": self._last_poll_at.isoformat() if self._last_poll_at else None,
             "poll_count": self._poll_count,
             "error_count": self._error_count,
+            "max_interval_seconds": self._ceiling_interval,
+            "leader": self._leader.status(),
+            "cycle_overruns": self._metrics.cycle_overruns,
+            "skipped_ticks": sum(schedule.skipped_ticks for schedule in self._schedules.values()),
+            "in_flight": len(self._in_flight),
+            "projects": self._project_stats(),
+            "rooms": {
+                source_id: schedule.to_dict(now)
+                for source_id, schedule in self._schedules.items()
+            },
+        }
+
+    @property
+    def _ceiling_interval(self) -> float:
+        return max(self._max_interval_seconds, self._interval_seconds)
+
+    @property
+    def metrics(self) -> dict:
+        """ルームごとの取得レイテンシ・取り込み件数・重複率と周期の所要時間"""
+        now = time.monotonic()
+        rooms = self._metrics.rooms_stats()
+        for source_id, schedule in self._schedules.items():
+            rooms.setdefault(source_id, {})["schedule"] = schedule.to_dict(now)
+        return {
+            "since": self._metrics.started_at,
+            "interval_seconds": self._interval_seconds,
+            "cycles": self._metrics.cycle_stats(),
+            "rate_limit": chatwork_service.rate_limiter.stats(),
+            "rooms": rooms,
         }
 
     def set_interval(self, seconds: int):
-        """Polling間隔を設定（最小30秒）"""
-        self._interval_seconds = max(30, seconds)
+        """Polling間隔を設定（最小30秒）。各ルームの間隔もこの値から再調整する"""
+        self._interval_seconds = max(MIN_INTERVAL_SECONDS, seconds)
+        for schedule in self._schedules.values():
+            schedule.interval = self._interval_seconds
         logger.info(f"Polling interval set to {self._interval_seconds} seconds")
 
+    def set_max_concurrency(self, workers: int):
+        """同時同期数を設定（次の周期から反映）"""
+        self._max_concurrency = max(1, workers)
+        logger.info(f"Polling concurrency set to {self._max_concurrency}")
+
     async def start(self):
         """Pollingを開始"""
         if self._running:
@@ -58,6 +221,7 @@ class PollingService:
             raise ValueError("Chatwork連携が設定されていません")
 
         self._running = True
+        self._leader.start()
         self._task = asyncio.create_task(self._polling_loop())
         logger.info("Polling service started")
 
@@ -73,71 +237,441 @@ class PollingService:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        await self._leader.stop()
         logger.info("Polling service stopped")
 
     async def _polling_loop(self):
-        """メインのPollingループ"""
+        """メインのPollingループ（予定時刻を過ぎたルームだけを同期）"""
         while self._running:
+            # リーダーでない間は待機し、リーダーになったら他インスタンスが
+            # 進めたハイウォーターマークをストレージから読み直す
+            await self._leader.wait_until_leader()
+            self._refresh_leadership()
+
             try:
-                await self._poll_all_sources()
+                started = time.monotonic()
+                with db_metrics.scope("polling_cycle"):
+                    rooms = await self._poll_all_sources(due_only=True)
+                elapsed = time.monotonic() - started
+                if self._metrics.record_cycle(elapsed, rooms, self._interval_seconds):
+                    logger.warning(
+                        f"Polling cycle overran: {elapsed:.1f}s for {rooms} rooms "
+                        f"(interval {self._interval_seconds}s)"
+                    )
                 self._poll_count += 1
                 self._last_poll_at = datetime.now()
             except Exception as e:
                 self._error_count += 1
                 logger.error(f"Polling error: {e}")
 
-            # 次のPollまで待機
-            await asyncio.sleep(self._interval_seconds)
-
-    async def _poll_all_sources(self):
-        """全ての登録済みChatworkルームからメッセージを取得"""
-        # Chatworkタイプのソースを全て取得
-        all_sources = await db.list_sources(project_id="default")
-
-        chatwork_sources = [
-            Source(**s) for s in all_sources
-            if s.get("type") == SourceType.CHATWORK_ROOM.value
-        ]
+            # 次に予定時刻を迎えるルームまで待機（予定時刻は monotonic の絶対時刻）
+            await asyncio.sleep(self._seconds_until_next_due())
+
+    def _refresh_leadership(self):
+        """リースを取り直していたら、他インスタンスが進めたハイウォーターマークを読み直す"""
+        if self._leader.fencing_token != self._leader_token:
+            self._leader_token = self._leader.fencing_token
+            self._watermarks.clear()
+            self._last_full_sync.clear()
+            self._diff_baselines.clear()
+
+    def _check_lease(self):
+        """書き込み直前にリースを保持しているか確認（API 枠の待ちの間に失っている場合がある）"""
+        if not self._leader.is_leader:
+            raise LeaseNotHeldError(self._leader.name)
+
+    def _seconds_until_next_due(self) -> float:
+        """
+        次のルームの予定時刻までの秒数
+
+        新しく登録されたルームを拾うため、最長でも基本間隔ごとに起きる
+        """
+        now = time.monotonic()
+        wait = min(
+            (schedule.next_due - now for schedule in self._schedules.values()),
+            default=self._interval_seconds,
+        )
+        return min(max(1.0, wait), self._interval_seconds)
+
+    async def _poll_all_sources(self, due_only: bool = False) -> int:
+        """
+        全ての登録済みChatworkルームからメッセージを取得
+
+        Args:
+            due_only: True なら予定時刻を過ぎたルームだけを同期
+
+        Returns:
+            同期したルーム数
+        """
+        chatwork_sources = await self._discover_sources(refresh=not due_only)
 
         if not chatwork_sources:
             logger.debug("No Chatwork sources registered")
-            return
+            return 0
 
+        if due_only:
+            now = time.monotonic()
+            chatwork_sources = [s for s in chatwork_sources if self._schedules[s.id].is_due(now)]
+            if not chatwork_sources:
+                return 0
+
+        chatwork_sources = self._interleave_by_project(chatwork_sources)
         logger.info(f"Polling {len(chatwork_sources)} Chatwork rooms")
 
+        await self._load_watermarks([source.id for source in chatwork_sources])
+        await self._refresh_room_message_nums()
+
+        # ルームを並行して同期（Chatwork API の呼び出しはトークンバケットで全体制限）
+        async def _sync_one(source: Source) -> bool:
+            try:
+                return await self._sync_coalesced(source, scheduled=due_only) is not None
+            except Exception:
+                return True  # _sync_and_record で記録済み。他のルームは続行
+
+        synced = await asyncio.gather(*(_sync_one(source) for source in chatwork_sources))
+        return sum(synced)
+
+    async def _discover_sources(self, refresh: bool = False) -> List[Source]:
+        """
+        全プロジェクトのChatworkソースを取得
+
+        予定時刻ごとに一覧を読み直さないよう、基本間隔が経つまでは前回の結果を使う。
+        新しく登録されたルームは最長で基本間隔の後に拾われる
+        """
+        now = time.monotonic()
+        if (
+            not refresh
+            and self._discovered_at is not None
+            and now - self._discovered_at < self._interval_seconds
+        ):
+            return self._sources
+
+        # 全プロジェクトのChatworkソースを1クエリで取得
+        all_sources = await db.list_sources_by_type(SourceType.CHATWORK_ROOM.value)
+        chatwork_sources = [Source(**s) for s in all_sources]
+
+        # 削除されたソースの状態を破棄し、新しいソースの予定を作る
+        current_ids = {source.id for source in chatwork_sources}
+        for source_id in [sid for sid in self._schedules if sid not in current_ids]:
+            del self._schedules[source_id]
+            self._watermarks.pop(source_id, None)
+            self._last_full_sync.pop(source_id, None)
+            self._diff_baselines.pop(source_id, None)
+            self._source_projects.pop(source_id, None)
+            self._metrics.discard(source_id)
         for source in chatwork_sources:
+            self._source_projects[source.id] = source.project_id
+            if source.id not in self._schedules:
+                self._schedules[source.id] = RoomSchedule(self._interval_seconds)
+        active_projects = set(self._source_projects.values())
+        for project_id in [pid for pid in self._project_buckets if pid not in active_projects]:
+            del self._project_buckets[project_id]
+
+        self._sources = chatwork_sources
+        self._discovered_at = now
+        return chatwork_sources
+
+    def _interleave_by_project(self, sources: List[Source]) -> List[Source]:
+        """
+        プロジェクトごとに1ルームずつ交互に並べる
+
+        同時同期数の枠は到着順に割り当てられるため、ルーム数の多い
+        プロジェクトが周期の前半を占有しないようにする。
+        先頭のプロジェクトは周期ごとにずらす。
+        """
+        groups: Dict[str, List[Source]] = {}
+        for source in sources:
+            groups.setdefault(source.project_id, []).append(source)
+        if len(groups) <= 1:
+            return sources
+
+        project_ids = sorted(groups)
+        offset = self._poll_count % len(project_ids)
+        rotated = project_ids[offset:] + project_ids[:offset]
+        return [
+            source
+            for batch in itertools.zip_longest(*(groups[pid] for pid in rotated))
+            for source in batch
+            if source is not None
+        ]
+
+    def _project_capacity(self) -> int:
+        """
+        1プロジェクトあたりの API 呼び出し枠（0 は制限なし）
+
+        auto の場合は全体の枠をルームのあるプロジェクト数で等分する。
+        1プロジェクトだけなら全体の枠をそのまま使えるよう制限しない
+        """
+        if self._project_rate_limit is not None:
+            return max(0, self._project_rate_limit)
+        projects = len(set(self._source_projects.values()))
+        if projects <= 1:
+            return 0
+        return max(1, chatwork_service.rate_limiter.capacity // projects)
+
+    def _project_bucket(self, project_id: str) -> Optional[TokenBucket]:
+        """プロジェクトの API 呼び出し枠（制限なしの場合は None）"""
+        capacity = self._project_capacity()
+        if capacity <= 0:
+            self._project_buckets.clear()
+            return None
+        bucket = self._project_buckets.get(project_id)
+        if bucket is None:
+            bucket = self._project_buckets[project_id] = TokenBucket(
+                capacity=capacity,
+                period=chatwork_service.rate_limiter.period,
+            )
+        elif bucket.capacity != capacity:
+            # プロジェクト数が変わったら枠を配分し直す
+            bucket.set_capacity(capacity)
+        return bucket
+
+    def _project_stats(self) -> Dict[str, Dict[str, Any]]:
+        projects: Dict[str, Dict[str, Any]] = {}
+        for project_id in self._source_projects.values():
+            project = projects.setdefault(project_id, {"rooms": 0})
+            project["rooms"] += 1
+        for project_id, project in projects.items():
+            bucket = self._project_buckets.get(project_id)
+            project["rate_limit"] = bucket.stats() if bucket else None
+        return projects
+
+    def _worker_slots(self) -> asyncio.Semaphore:
+        """同時同期数の上限（ループと sync_now で共有）"""
+        if self._semaphore is None or self._semaphore_size != self._max_concurrency:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._semaphore_size = self._max_concurrency
+        return self._semaphore
+
+    async def _sync_coalesced(self, source: Source, scheduled: bool = False) -> Optional[int]:
+        """
+        ルームを同期（既に同期中ならその完了を待って結果を共有する）
+
+        Args:
+            scheduled: ループからの定期同期か。True ならリースを失っていた場合は
+                同期せず、プロジェクトの枠が空なら待たずに次の周期へ回す
+
+        Returns:
+            新たに保存したメッセージ数（同期しなかった場合は None）
+        """
+        task = self._in_flight.get(source.id)
+        if task is None or task.done():
+            task = asyncio.create_task(self._sync_and_record(source, scheduled))
+            self._in_flight[source.id] = task
+
+            def _done(finished: asyncio.Task, source_id: str = source.id):
+                if self._in_flight.get(source_id) is finished:
+                    del self._in_flight[source_id]
+
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    async def _sync_and_record(self, source: Source, scheduled: bool) -> Optional[int]:
+        """同時同期数の枠内でルームを同期し、予定とメトリクスに反映"""
+        # プロジェクト枠の待ちで同期枠を塞がないよう、最初の1回分は枠の外で確保する
+        bucket = self._project_bucket(self._source_projects.get(source.id, "default"))
+        if bucket:
+            if scheduled:
+                if not bucket.try_acquire():
+                    # 枠が空のプロジェクトは待たずに後回しにし、他のプロジェクトの周期を止めない
+                    schedule = self._schedules.get(source.id)
+                    if schedule:
+                        schedule.defer(bucket.seconds_until_available())
+                    return None
+            else:
+                await bucket.acquire()
+            self._prepaid.add(source.id)
+
+        async with self._worker_slots():
+            if scheduled and not self._leader.is_leader:
+                # 周期の途中でリースを失ったら残りのルームは新しいリーダーに任せる
+                self._prepaid.discard(source.id)
+                return None
+
+            schedule = self._schedules.get(source.id)
             try:
-                await self._sync_source(source)
+                new_messages = await self._sync_source(source)
+            except LeaseNotHeldError:
+                # 同期中にリースを失った。書き込みは新しいリーダーに任せる
+                self._prepaid.discard(source.id)
+                logger.warning(f"Lost polling lease while syncing source {source.id}; skipped writes")
+                if scheduled:
+                    return None
+                raise
+            except NotFoundError:
+                # 同期中にソースが削除された
+                self._prepaid.discard(source.id)
+                await self._discard_deleted_source(source.id)
+                return None
             except Exception as e:
+                self._prepaid.discard(source.id)
+                if schedule:
+                    schedule.record(None, self._ceiling_interval)
+                self._metrics.record_sync(source.id, None, str(e))
                 logger.error(f"Failed to sync source {source.id}: {e}")
-                # エラーを記録して続行
-                await db.update_sync_status(source.id, {
-                    "error": str(e),
-                    "updated_at": datetime.now(),
-                })
-
-    async def _sync_source(self, source: Source):
-        """個別ソースの同期"""
-        if not source.chatwork:
+                # エラーは _sync_source が同期状態に記録済み
+                raise
+
+            if schedule:
+                schedule.record(new_messages, self._ceiling_interval)
+            self._metrics.record_sync(source.id, new_messages)
+            return new_messages
+
+    async def _load_watermarks(self, source_ids: List[str]):
+        """未読込のソースのハイウォーターマークを同期状態から一括で読み込む"""
+        missing = [source_id for source_id in source_ids if source_id not in self._watermarks]
+        if not missing:
             return
 
-        room_id = source.chatwork.get("room_id") if isinstance(source.chatwork, dict) else source.chatwork.room_id
+        statuses = await db.get_sync_statuses(missing)
+        now = time.monotonic()
+        for source_id in missing:
+            last_message_id = statuses.get(source_id, {}).get("last_message_id")
+            self._watermarks[source_id] = last_message_id
+            if last_message_id:
+                # 再起動直後は差分取得で再開し、フル取得は通常の間隔で行う
+                self._last_full_sync[source_id] = now
+
+    def _needs_full_sync(self, source_id: str) -> bool:
+        """ハイウォーターマークがない、または定期フル取得の時期か"""
+        if not self._watermarks.get(source_id):
+            return True
+        last_full = self._last_full_sync.get(source_id)
+        return last_full is None or time.monotonic() - last_full >= self._full_sync_seconds
+
+    async def _fetch_new_messages(self, source_id: str, room_id: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        ハイウォーターマークより新しいメッセージを取得
+
+        通常は差分（force=0）だけを取得し、ハイウォーターマークがない・
+        差分が上限件数に達した・ルームのメッセージ数の増分より差分が少ない
+        （取りこぼしの可能性がある）・定期フル取得の時期のいずれかの場合のみ
+        最新100件（force=1）を取得する。
+
+        Returns:
+            (新着メッセージ, フル取得したか)
+        """
+        watermark = self._watermarks.get(source_id)
+        raw_messages: List[Dict[str, Any]] = []
+        full = self._needs_full_sync(source_id)
+
+        if not full:
+            raw_messages = await self._get_messages(source_id, room_id, force=False)
+            if len(raw_messages) >= CHATWORK_MESSAGE_LIMIT:
+                logger.info(f"Diff for room {room_id} hit the {CHATWORK_MESSAGE_LIMIT} message limit, falling back to full fetch")
+                full = True
+            elif self._diff_has_gap(source_id, room_id, len(raw_messages)):
+                logger.info(f"Diff for room {room_id} missed messages counted by the room, falling back to full fetch")
+                full = True
+
+        if full:
+            # 同期中フラグを設定（フル取得時のみ）
+            self._check_lease()
+            if not await db.update_sync_status(source_id, {
+                "source_id": source_id,
+                "room_id": room_id,
+                "is_syncing": True,
+                "updated_at": datetime.now(),
+            }, fence=self._leader.fence):
+                raise NotFoundError("ソース", source_id)
+
+            fetched = await self._get_messages(source_id, room_id, force=True)
+            if (
+                watermark
+                and len(fetched) >= CHATWORK_MESSAGE_LIMIT
+                and min(_message_key(str(msg.get("message_id"))) for msg in fetched) > _message_key(watermark)
+            ):
+                # 最新100件の最古もハイウォーターマークより新しく、その間は API から取り直せない
+                logger.warning(
+                    f"Room {room_id} has more than {CHATWORK_MESSAGE_LIMIT} messages after "
+                    f"watermark {watermark}; older ones could not be fetched"
+                )
+            by_id = {str(msg.get("message_id")): msg for msg in raw_messages + fetched}
+            raw_messages = list(by_id.values())
+            self._last_full_sync[source_id] = time.monotonic()
+            self._reset_diff_baseline(source_id, room_id)
+
+        if watermark:
+            raw_messages = [
+                msg for msg in raw_messages
+                if _message_key(str(msg.get("message_id"))) > _message_key(watermark)
+            ]
+        return raw_messages, full
+
+    async def _refresh_room_message_nums(self):
+        """参加中ルームのメッセージ数を1回の API 呼び出しでまとめて取得（差分の取りこぼし確認用）"""
+        try:
+            rooms = await chatwork_service.get_rooms() or []
+        except Exception as e:
+            # 前回の値のまま続行（取りこぼしは次に取得できた周期で検出される）
+            logger.warning(f"Failed to fetch Chatwork room list: {e}")
+            return
+        self._room_message_nums = {str(room.get("room_id")): room.get("message_num", 0) for room in rooms}
+
+    def _diff_has_gap(self, source_id: str, room_id: str, received: int) -> bool:
+        """
+        差分で受け取っていないメッセージがあるか
+
+        基準時点からのルームのメッセージ数の増分より、その後に差分で受け取った
+        件数の累計が少なければ、他の呼び出し元に差分を消費されるなどして
+        届いていないメッセージがある。基準がなければ今回を基準にする
+        """
+        message_num = self._room_message_nums.get(str(room_id))
+        if message_num is None:
+            return False
+        baseline = self._diff_baselines.get(source_id)
+        if baseline is None:
+            self._diff_baselines[source_id] = (message_num, 0)
+            return False
+        base_num, seen = baseline[0], baseline[1] + received
+        self._diff_baselines[source_id] = (base_num, seen)
+        return seen < message_num - base_num
+
+    def _reset_diff_baseline(self, source_id: str, room_id: str):
+        """フル取得したルームは現在のメッセージ数を新しい基準にする"""
+        message_num = self._room_message_nums.get(str(room_id))
+        if message_num is None:
+            self._diff_baselines.pop(source_id, None)
+        else:
+            self._diff_baselines[source_id] = (message_num, 0)
 
-        # 同期中フラグを設定
-        await db.update_sync_status(source.id, {
-            "source_id": source.id,
-            "room_id": room_id,
-            "is_syncing": True,
-            "updated_at": datetime.now(),
-        })
+    async def _get_messages(self, source_id: str, room_id: str, force: bool) -> List[Dict[str, Any]]:
+        """Chatwork API からメッセージを取得し、レイテンシと件数を記録"""
+        if source_id in self._prepaid:
+            self._prepaid.discard(source_id)
+        else:
+            bucket = self._project_bucket(self._source_projects.get(source_id, "default"))
+            if bucket:
+                await bucket.acquire()
+
+        started = time.monotonic()
+        messages = await chatwork_service.get_messages(room_id, force=force) or []
+        self._metrics.record_fetch(source_id, time.monotonic() - started, len(messages))
+        return messages
+
+    async def _sync_source(self, source: Source) -> int:
+        """
+        個別ソースの同期
+
+        新着がないルームでは Chatwork API を1回呼ぶだけで DB の読み書きは行わない
+
+        Returns:
+            新たに保存したメッセージ数
+        """
+        if not source.chatwork:
+            return 0
+
+        room_id = source.chatwork.get("room_id") if isinstance(source.chatwork, dict) else source.chatwork.room_id
 
         try:
-            # Chatwork APIからメッセージ取得（force=Trueで最新100件）
-            raw_messages = await chatwork_service.get_messages(room_id, force=True)
+            raw_messages, full = await self._fetch_new_messages(source.id, room_id)
 
             if not raw_messages:
-                logger.debug(f"No messages from room {room_id}")
-                return
+                logger.debug(f"No new messages from room {room_id}")
+                if full:
+                    # フル取得時に立てた同期中フラグを解除し、件数を再集計
+                    await self._record_sync_result(source, room_id, None, 0, full)
+                return 0
 
             # メッセージをモデルに変換
             messages = []
@@ -155,53 +689,109 @@ class PollingService:
                 messages.append(message)
 
             # バッチ保存（重複排除込み）
-            saved_count = await db.save_messages_batch(messages)
-
-            # 統計更新
-            total_messages = await db.get_message_count_by_source(source.id)
-            latest_message_id = await db.get_latest_message_id(source.id)
-
-            # 同期状態を更新
-            await db.update_sync_status(source.id, {
-                "source_id": source.id,
-                "room_id": room_id,
-                "last_message_id": latest_message_id,
-                "last_sync_at": datetime.now(),
-                "total_messages": total_messages,
-                "is_syncing": False,
-                "error": None,
-                "updated_at": datetime.now(),
-            })
-
-            # Sourceのメッセージ数も更新
-            await db.update_source(source.id, {
-                "message_count": total_messages,
-                "last_sync_at": datetime.now(),
-                "updated_at": datetime.now(),
-            })
-
-            logger.info(f"Synced room {room_id}: {saved_count} new messages (total: {total_messages})")
-
+            self._check_lease()
+            result = await db.save_messages_batch(messages)
+            saved_count = result["saved"]
+
+            # ハイウォーターマークを進める
+            latest_message_id = max((m.id for m in messages), key=_message_key)
+            watermark = self._watermarks.get(source.id)
+            if watermark and _message_key(watermark) > _message_key(latest_message_id):
+                latest_message_id = watermark
+
+            if not await self._record_sync_result(source, room_id, latest_message_id, saved_count, full):
+                raise NotFoundError("ソース", source.id)
+            self._watermarks[source.id] = latest_message_id
+
+            logger.info(
+                f"Synced room {room_id}: {saved_count} new messages, "
+                f"{result['skipped']} duplicates skipped"
+            )
+            return saved_count
+
+        except (LeaseNotHeldError, NotFoundError):
+            raise
         except Exception as e:
-            # エラー時は同期中フラグを解除
-            await db.update_sync_status(source.id, {
+            # エラー時は同期中フラグを解除してエラーを記録
+            if not await db.update_sync_status(source.id, {
                 "is_syncing": False,
                 "error": str(e),
                 "updated_at": datetime.now(),
-            })
+            }, fence=self._leader.fence):
+                raise NotFoundError("ソース", source.id) from e
             raise
 
+    async def _discard_deleted_source(self, source_id: str):
+        """
+        同期中に削除されたソースの後始末
+
+        削除時のカスケード削除より後に保存したメッセージが残らないよう、
+        カスケード削除をもう一度実行し、次の周期でソース一覧を読み直す
+        """
+        logger.info(f"Source {source_id} was deleted during sync; removing messages written meanwhile")
+        self._discovered_at = None
+        job = cascade_delete_service.create_job("source", source_id)
+        await cascade_delete_service.run_job(job["job_id"])
+
+    async def _record_sync_result(
+        self,
+        source: Source,
+        room_id: str,
+        latest_message_id: Optional[str],
+        saved_count: int,
+        full: bool,
+    ) -> bool:
+        """
+        同期状態とソースの統計を1バッチで更新
+
+        通常は取り込み件数の差分を加算するだけだが、フル取得時は count() 集計で
+        件数を数え直し、並行書き込みなどで生じたずれを補正する
+
+        Returns:
+            ソースが削除済みで反映できなかった場合は False
+        """
+        total_messages = await db.get_message_count_by_source(source.id) if full else None
+        now = datetime.now()
+        status_updates: Dict[str, Any] = {
+            "source_id": source.id,
+            "room_id": room_id,
+            "last_sync_at": now,
+            "is_syncing": False,
+            "error": None,
+            "updated_at": now,
+        }
+        if latest_message_id:
+            status_updates["last_message_id"] = latest_message_id
+        return await db.apply_sync_result(
+            source.id,
+            status_updates,
+            {"last_sync_at": now, "updated_at": now},
+            saved_count,
+            total_messages=total_messages,
+            fence=self._leader.fence,
+        )
+
     async def sync_now(self, source_id: Optional[str] = None):
-        """手動で即時同期を実行"""
-        if source_id:
-            # 特定のソースのみ
-            source_data = await db.get_source(source_id)
-            if source_data:
-                source = Source(**source_data)
-                await self._sync_source(source)
-        else:
-            # 全ソース
-            await self._poll_all_sources()
+        """
+        手動で即時同期を実行（ループが同期中のルームは、その完了を待つ）
+
+        ポーリングのリースを保持している（または取得できる）インスタンスだけが
+        同期する。他のインスタンスが保持している場合は LeaseNotHeldError
+        """
+        async with self._leader.hold():
+            self._refresh_leadership()
+            if source_id:
+                # 特定のソースのみ
+                source_data = await db.get_source(source_id)
+                if source_data:
+                    source = Source(**source_data)
+                    self._source_projects[source.id] = source.project_id
+                    await self._load_watermarks([source.id])
+                    await self._refresh_room_message_nums()
+                    await self._sync_coalesced(source)
+            else:
+                # 全ソース
+                await self._poll_all_sources()
 
 
 # シングルトンインスタンス
@@ -0,0 +1,117 @@
+"""
+Rate Limiter - 外部APIのレート制限
+トークンバケットで呼び出し回数をクォータ内に抑える
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+
+class TokenBucket:
+    """
+    非同期トークンバケット
+
+    capacity 個のトークンが period 秒で満タンまで回復する。
+    acquire() はトークンが取れるまで待ち、待機中の呼び出しは到着順に処理される。
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self._acquired = 0
+        self._waited_seconds = 0.0
+        self._server_remaining: Optional[int] = None
+
+    @property
+    def rate(self) -> float:
+        """1秒あたりの回復トークン数"""
+        return self.capacity / self.period
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    async def acquire(self, tokens: int = 1):
+        """トークンを取得（不足時は回復するまで待機）"""
+        async with self._lock:
+            started = time.monotonic()
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    break
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+            self._acquired += tokens
+            self._waited_seconds += time.monotonic() - started
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """待たずにトークンを取得（不足時・停止中・待機中の呼び出しがある場合は False）"""
+        if self._lock.locked():
+            return False
+        now = time.monotonic()
+        if now < self._paused_until:
+            return False
+        self._refill(now)
+        if self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        self._acquired += tokens
+        return True
+
+    def seconds_until_available(self, tokens: int = 1) -> float:
+        """トークンが取れるようになるまでのおおよその秒数"""
+        now = time.monotonic()
+        self._refill(now)
+        paused = max(0.0, self._paused_until - now)
+        return paused + max(0.0, tokens - self._tokens) / self.rate
+
+    def set_capacity(self, capacity: int):
+        """上限を変更（残量は新しい上限までに切り詰める）"""
+        self._refill(time.monotonic())
+        self.capacity = capacity
+        self._tokens = min(self._tokens, float(capacity))
+
+    def sync(self, remaining: int, reset_in: Optional[float] = None):
+        """
+        API側の残り回数に合わせる（他クライアントと共有するクォータ用）
+
+        ローカルの残量が API の残り回数より多い場合だけ減らす
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self._server_remaining = remaining
+        self._tokens = min(self._tokens, float(max(0, remaining)))
+        if remaining <= 0 and reset_in:
+            self.pause(reset_in)
+
+    def pause(self, seconds: float):
+        """429 を受けた場合など、指定秒数は払い出しを止める"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        self._updated_at = max(self._updated_at, self._paused_until)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "capacity": self.capacity,
+            "period_seconds": self.period,
+            "available": round(self._tokens, 2),
+            "server_remaining": self._server_remaining,
+            "paused_for_seconds": round(max(0.0, self._paused_until - now), 2),
+            "acquired": self._acquired,
+            "waited_seconds": round(self._waited_seconds, 2),
+        }
@@ -0,0 +1,756 @@
+"""
+SQLite Database Service
+FirestoreDB と同じインターフェースを持つ組み込みストレージ
+（ローカルベンチマーク・負荷試験・単一ノード運用向け）
+"""
+
+import os
+import json
+import time
+import sqlite3
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+from typing import Optional, List, Dict, Any, Callable, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from app.services.cache import NullCache
+from app.exceptions import LeaseNotHeldError
+from app.services.database import DatabaseBackend, build_lease, decode_cursor, lease_is_held
+
+# コレクション → 検索・並び替えに使う列（ドキュメント本体は data 列にJSONで保存）
+COLLECTION_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'projects': ('created_at',),
+    'sources': ('project_id', 'type'),
+    'issues': ('project_id', 'source_id', 'status', 'pain_level', 'extracted_at'),
+    'requirements': ('project_id', 'status', 'created_at'),
+    'developments': ('project_id', 'status', 'created_at'),
+    'messages': ('source_id', 'room_id', 'send_time'),
+    'sync_status': (),
+    'leases': (),
+}
+
+# 既存クエリに合わせたインデックス
+INDEXES: Tuple[str, ...] = (
+    "CREATE INDEX IF NOT EXISTS idx_projects_created ON projects (created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_sources_project ON sources (project_id, type)",
+    "CREATE INDEX IF NOT EXISTS idx_sources_type ON sources (type)",
+    "CREATE INDEX IF NOT EXISTS idx_issues_project_extracted ON issues (project_id, extracted_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_issues_project_status ON issues (project_id, status, extracted_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_issues_project_source ON issues (project_id, source_id, extracted_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_requirements_project_created ON requirements (project_id, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_requirements_project_status ON requirements (project_id, status, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_developments_project_created ON developments (project_id, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_developments_project_status ON developments (project_id, status, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_source_time ON messages (source_id, send_time DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_room_time ON messages (room_id, send_time DESC)",
+)
+
+
+def _encode_value(value: Any) -> Any:
+    """JSON保存用に datetime / Enum を変換"""
+    if isinstance(value, datetime):
+        return {"__dt__": value.isoformat()}
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {k: _encode_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(v) for v in value]
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """_encode_value の逆変換"""
+    if isinstance(value, dict):
+        if set(value) == {"__dt__"}:
+            return datetime.fromisoformat(value["__dt__"])
+        return {k: _decode_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    return value
+
+
+def _column_value(value: Any) -> Any:
+    """検索用の列値（datetime は桁を揃えたISO文字列で辞書順 = 時系列順）"""
+    if isinstance(value, datetime):
+        return value.isoformat(timespec='microseconds')
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class SQLiteDB(DatabaseBackend):
+    """
+    SQLite データベースサービス（WALモード）
+
+    sqlite3 はブロッキングAPIのため、全クエリを専用の1スレッドで実行して
+    イベントループを止めない。単一スレッドで直列化されるので
+    読み込み→書き込みの更新処理もアトミックになる。
+    """
+
+    _instance: Optional['SQLiteDB'] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.cache = NullCache()
+            cls._instance._conn = None
+            cls._instance._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+        return cls._instance
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            path = os.getenv('SQLITE_PATH', 'auto_dev.db')
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for collection, columns in COLLECTION_COLUMNS.items():
+                column_defs = "".join(f", {c}" for c in columns)
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {collection} (id TEXT PRIMARY KEY{column_defs}, data TEXT NOT NULL)"
+                )
+            # 成果物は圧縮バイナリをそのまま保存する
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts (id TEXT PRIMARY KEY, encoding TEXT, size INTEGER, data BLOB NOT NULL)"
+            )
+            for statement in INDEXES:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, func: Callable, *args) -> Any:
+        """専用スレッドでDB処理を実行"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def ping(self) -> None:
+        """接続確認"""
+        await self._run(lambda: self.conn.execute("SELECT 1").fetchone())
+
+    # ========== Generic Operations ==========
+
+    def _serialize(self, obj: BaseModel) -> Dict[str, Any]:
+        """Pydanticモデルを dict に変換"""
+        return obj.model_dump()
+
+    def _put(self, collection: str, doc_id: str, data: Dict[str, Any], replace: bool = True) -> bool:
+        """ドキュメントを書き込み（replace=False なら既存時は何もしない）"""
+        columns = COLLECTION_COLUMNS[collection]
+        values = [doc_id] + [_column_value(data.get(c)) for c in columns] + [json.dumps(_encode_value(data))]
+        placeholders = ", ".join("?" for _ in values)
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        cursor = self.conn.execute(
+            f"{verb} INTO {collection} (id{''.join(', ' + c for c in columns)}, data) VALUES ({placeholders})",
+            values,
+        )
+        return cursor.rowcount > 0
+
+    def _get(self, collection: str, doc_id: str) -> Optional[Dict]:
+        row = self.conn.execute(f"SELECT data FROM {collection} WHERE id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return None
+        return _decode_value(json.loads(row["data"]))
+
+    def _select(
+        self,
+        collection: str,
+        filters: Dict[str, Any],
+        order_by: Sequence[str] = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        extra_where: str = "",
+        extra_params: Sequence[Any] = (),
+    ) -> List[Dict]:
+        """列の等値条件で検索"""
+        clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+        params: List[Any] = [_column_value(v) for v in filters.values() if v is not None]
+        if extra_where:
+            clauses.append(extra_where)
+            params.extend(extra_params)
+
+        sql = f"SELECT data FROM {collection}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by:
+            sql += " ORDER BY " + ", ".join(order_by)
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+
+        rows = self.conn.execute(sql, params).fetchall()
+        return [_decode_value(json.loads(row["data"])) for row in rows]
+
+    def _merge(self, collection: str, doc_id: str, updates: Dict[str, Any], upsert: bool = False) -> Optional[Dict]:
+        """既存ドキュメントに updates をマージして保存"""
+        current = self._get(collection, doc_id)
+        if current is None:
+            if not upsert:
+                return None
+            current = {}
+        current.update(updates)
+        self._put(collection, doc_id, current)
+        return current
+
+    def _check_fence(self, fence: Optional[Tuple[str, int]]):
+        """fence=(リース名, fencing_token) のリースを保持しているか確認（トランザクション内で呼ぶ）"""
+        if fence is not None and not lease_is_held(self._get('leases', fence[0]), fence[1], time.time()):
+            raise LeaseNotHeldError(fence[0])
+
+    def _delete(self, collection: str, doc_id: str) -> bool:
+        self.conn.execute(f"DELETE FROM {collection} WHERE id = ?", (doc_id,))
+        return True
+
+    def _select_page(
+        self,
+        collection: str,
+        filters: Dict[str, Any],
+        order_field: str,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """(order_field, id) 降順で1ページ分を取得（FirestoreDB._ordered_page 相当）"""
+        extra_where, extra_params = "", ()
+        if start_after:
+            cursor = decode_cursor(start_after, order_field)
+            value = _column_value(cursor[order_field])
+            extra_where = f"({order_field} < ? OR ({order_field} = ? AND id < ?))"
+            extra_params = (value, value, cursor["id"])
+            offset = 0
+
+        docs = self._select(
+            collection,
+            filters,
+            order_by=(f'{order_field} DESC', 'id DESC'),
+            limit=limit if limit else -1,
+            offset=offset,
+            extra_where=extra_where,
+            extra_params=extra_params,
+        )
+        if fields:
+            docs = [{k: v for k, v in doc.items() if k in fields} for doc in docs]
+        return docs
+
+    async def _update_document(
+        self,
+        collection: str,
+        doc_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """ドキュメントを更新（FirestoreDB._update_document と同じ戻り値）"""
+        updated = await self._run(self._merge, collection, doc_id, updates)
+        return updated if return_document else None
+
+    # ========== Projects ==========
+
+    async def create_project(self, project: BaseModel) -> BaseModel:
+        """プロジェクトを作成"""
+        await self._run(self._put, 'projects', project.id, self._serialize(project))
+        return project
+
+    async def get_project(self, project_id: str) -> Optional[Dict]:
+        """プロジェクトを取得"""
+        return await self._run(self._get, 'projects', project_id)
+
+    async def list_projects(self) -> List[Dict]:
+        """プロジェクト一覧を取得"""
+        return await self._run(lambda: self._select('projects', {}, order_by=('created_at DESC',)))
+
+    async def update_project(
+        self,
+        project_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """プロジェクトを更新"""
+        return await self._update_document('projects', project_id, updates, current, return_document)
+
+    async def delete_project(self, project_id: str) -> bool:
+        """プロジェクトを削除"""
+        return await self._run(self._delete, 'projects', project_id)
+
+    # ========== Sources ==========
+
+    async def create_source(self, source: BaseModel) -> BaseModel:
+        """ソースを作成"""
+        await self._run(self._put, 'sources', source.id, self._serialize(source))
+        return source
+
+    async def get_source(self, source_id: str) -> Optional[Dict]:
+        """ソースを取得"""
+        return await self._run(self._get, 'sources', source_id)
+
+    async def list_sources(self, project_id: str = "default") -> List[Dict]:
+        """ソース一覧を取得"""
+        return await self._run(lambda: self._select('sources', {'project_id': project_id}))
+
+    async def list_sources_by_type(self, source_type: str) -> List[Dict]:
+        """全プロジェクトのソースを種別で取得"""
+        return await self._run(lambda: self._select('sources', {'type': source_type}))
+
+    async def update_source(
+        self,
+        source_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """ソースを更新"""
+        return await self._update_document('sources', source_id, updates, current, return_document)
+
+    async def delete_source(self, source_id: str) -> bool:
+        """ソースを削除"""
+        return await self._run(self._delete, 'sources', source_id)
+
+    # ========== Issues ==========
+
+    async def create_issue(self, issue: BaseModel) -> BaseModel:
+        """課題を作成"""
+        await self._run(self._put, 'issues', issue.id, self._serialize(issue))
+        return issue
+
+    async def create_issues(self, issues: List[BaseModel]) -> List[BaseModel]:
+        """課題を一括作成"""
+        def _save() -> None:
+            with self.conn:
+                self.conn.execute("BEGIN")
+                for issue in issues:
+                    self._put('issues', issue.id, self._serialize(issue))
+
+        if issues:
+            await self._run(_save)
+        return issues
+
+    async def get_issue(self, issue_id: str) -> Optional[Dict]:
+        """課題を取得"""
+        return await self._run(self._get, 'issues', issue_id)
+
+    async def get_issues(self, issue_ids: List[str]) -> List[Dict]:
+        """課題を一括取得（指定順で返し、存在しないIDは除外）"""
+        def _load() -> List[Dict]:
+            found = [self._get('issues', issue_id) for issue_id in dict.fromkeys(issue_ids)]
+            return [issue for issue in found if issue is not None]
+
+        return await self._run(_load)
+
+    async def list_issues(
+        self,
+        project_id: str = "default",
+        source_id: Optional[str] = None,
+        status: Optional[str] = None,
+        pain_level: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+    ) -> List[Dict]:
+        """課題一覧を取得（抽出日時の新しい順）"""
+        filters = {
+            'project_id': project_id,
+            'source_id': source_id,
+            'status': status,
+            'pain_level': pain_level,
+        }
+        return await self._run(self._select_page, 'issues', filters, 'extracted_at', limit, start_after)
+
+    async def update_issue(
+        self,
+        issue_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """課題を更新"""
+        return await self._update_document('issues', issue_id, updates, current, return_document)
+
+    async def delete_issue(self, issue_id: str) -> bool:
+        """課題を削除"""
+        return await self._run(self._delete, 'issues', issue_id)
+
+    # ========== Requirements ==========
+
+    async def create_requirement(self, requirement: BaseModel) -> BaseModel:
+        """要件定義書を作成"""
+        await self._run(self._put, 'requirements', requirement.id, self._serialize(requirement))
+        return requirement
+
+    async def get_requirement(self, requirement_id: str) -> Optional[Dict]:
+        """要件定義書を取得"""
+        return await self._run(self._get, 'requirements', requirement_id)
+
+    async def list_requirements(
+        self,
+        project_id: str = "default",
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """要件定義書一覧を取得（作成日時の新しい順）"""
+        filters = {'project_id': project_id, 'status': status}
+        return await self._run(
+            self._select_page, 'requirements', filters, 'created_at', limit, start_after, 0, fields,
+        )
+
+    async def update_requirement(
+        self,
+        requirement_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """要件定義書を更新"""
+        return await self._update_document('requirements', requirement_id, updates, current, return_document)
+
+    async def delete_requirement(self, requirement_id: str) -> bool:
+        """要件定義書を削除"""
+        return await self._run(self._delete, 'requirements', requirement_id)
+
+    # ========== Developments ==========
+
+    async def create_development(self, development: BaseModel) -> BaseModel:
+        """開発タスクを作成"""
+        await self._run(self._put, 'developments', development.id, self._serialize(development))
+        return development
+
+    async def get_development(self, development_id: str) -> Optional[Dict]:
+        """開発タスクを取得"""
+        return await self._run(self._get, 'developments', development_id)
+
+    async def list_developments(
+        self,
+        project_id: str = "default",
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """開発タスク一覧を取得（作成日時の新しい順）"""
+        filters = {'project_id': project_id, 'status': status}
+        return await self._run(
+            self._select_page, 'developments', filters, 'created_at', limit, start_after, 0, fields,
+        )
+
+    async def update_development(
+        self,
+        development_id: str,
+        updates: Dict[str, Any],
+        current: Optional[Dict] = None,
+        return_document: bool = True,
+    ) -> Optional[Dict]:
+        """開発タスクを更新"""
+        return await self._update_document('developments', development_id, updates, current, return_document)
+
+    async def append_development_log(self, development_id: str, entry: Dict[str, Any]) -> bool:
+        """エージェントログを1件追記"""
+        def _append() -> bool:
+            current = self._get('developments', development_id)
+            if current is None:
+                return False
+            current.setdefault('agent_logs', []).append(entry)
+            self._put('developments', development_id, current)
+            return True
+
+        return await self._run(_append)
+
+    async def apply_development_progress(
+        self,
+        development_id: str,
+        updates: Dict[str, Any],
+        log_entries: List[Dict[str, Any]],
+    ) -> bool:
+        """フィールド更新とログ追記をまとめて反映"""
+        def _apply() -> bool:
+            current = self._get('developments', development_id)
+            if current is None:
+                return False
+            current.update(updates)
+            current.setdefault('agent_logs', []).extend(log_entries)
+            self._put('developments', development_id, current)
+            return True
+
+        return await self._run(_apply)
+
+    async def get_development_logs(
+        self,
+        development_id: str,
+        since: int = 0,
+    ) -> Optional[Tuple[List[Dict], int]]:
+        """エージェントログを取得（since 以降, 全件数）"""
+        current = await self._run(self._get, 'developments', development_id)
+        if current is None:
+            return None
+        logs = current.get('agent_logs', [])
+        return logs[since:], len(logs)
+
+    # ========== Artifacts ==========
+
+    async def save_artifacts(self, artifacts: Dict[str, Dict[str, Any]]) -> int:
+        """成果物を内容ハッシュをキーに保存（既存ハッシュは書き込まない）"""
+        def _save() -> int:
+            saved = 0
+            with self.conn:
+                self.conn.execute("BEGIN")
+                for content_hash, artifact in artifacts.items():
+                    cursor = self.conn.execute(
+                        "INSERT OR IGNORE INTO artifacts (id, encoding, size, data) VALUES (?, ?, ?, ?)",
+                        (content_hash, artifact['encoding'], artifact['size'], artifact['data']),
+                    )
+                    saved += cursor.rowcount
+            return saved
+
+        if not artifacts:
+            return 0
+        return await self._run(_save)
+
+    async def get_artifacts(self, content_hashes: List[str]) -> Dict[str, Dict]:
+        """成果物を取得"""
+        def _load() -> Dict[str, Dict]:
+            hashes = list(set(content_hashes))
+            placeholders = ", ".join("?" for _ in hashes)
+            rows = self.conn.execute(
+                f"SELECT id, encoding, size, data FROM artifacts WHERE id IN ({placeholders})", hashes,
+            ).fetchall()
+            return {
+                row["id"]: {"encoding": row["encoding"], "size": row["size"], "data": row["data"]}
+                for row in rows
+            }
+
+        if not content_hashes:
+            return {}
+        return await self._run(_load)
+
+    # ========== Messages ==========
+
+    async def save_message(self, message: BaseModel) -> BaseModel:
+        """メッセージを保存（重複チェック付き）"""
+        await self._run(self._put, 'messages', message.id, self._serialize(message), False)
+        return message
+
+    async def save_messages_batch(self, messages: List[BaseModel]) -> Dict[str, int]:
+        """
+        メッセージを一括保存（重複排除）
+
+        Returns:
+            {"saved": 新規保存件数, "skipped": 重複によりスキップした件数}
+        """
+        def _save() -> int:
+            saved = 0
+            with self.conn:
+                self.conn.execute("BEGIN")
+                for message in messages:
+                    if self._put('messages', message.id, self._serialize(message), replace=False):
+                        saved += 1
+            return saved
+
+        if not messages:
+            return {"saved": 0, "skipped": 0}
+
+        saved_count = await self._run(_save)
+        return {"saved": saved_count, "skipped": len(messages) - saved_count}
+
+    async def get_messages_by_source(
+        self,
+        source_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        start_after: Optional[str] = None,
+    ) -> List[Dict]:
+        """ソース別メッセージを取得（新しい順）"""
+        return await self._run(
+            self._select_page, 'messages', {'source_id': source_id}, 'send_time', limit, start_after, offset,
+        )
+
+    async def get_messages_by_room(
+        self,
+        room_id: str,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> List[Dict]:
+        """ルーム別メッセージを取得"""
+        extra_where, extra_params = "", ()
+        if since:
+            extra_where, extra_params = "send_time > ?", (_column_value(since),)
+
+        return await self._run(lambda: self._select(
+            'messages',
+            {'room_id': room_id},
+            order_by=('send_time DESC',),
+            limit=limit,
+            extra_where=extra_where,
+            extra_params=extra_params,
+        ))
+
+    async def get_message_count_by_source(self, source_id: str) -> int:
+        """ソース別メッセージ数を取得"""
+        def _count() -> int:
+            row = self.conn.execute("SELECT COUNT(*) FROM messages WHERE source_id = ?", (source_id,)).fetchone()
+            return row[0]
+
+        return await self._run(_count)
+
+    async def get_latest_message_id(self, source_id: str) -> Optional[str]:
+        """ソースの最新メッセージIDを取得"""
+        docs = await self.get_messages_by_source(source_id, limit=1)
+        if docs:
+            return docs[0].get('id')
+        return None
+
+    # ========== Sync Status ==========
+
+    async def get_sync_status(self, source_id: str) -> Optional[Dict]:
+        """同期状態を取得"""
+        return await self._run(self._get, 'sync_status', source_id)
+
+    async def get_sync_statuses(self, source_ids: List[str]) -> Dict[str, Dict]:
+        """複数ソースの同期状態を一括取得"""
+        def _load() -> Dict[str, Dict]:
+            statuses = {}
+            for source_id in dict.fromkeys(source_ids):
+                status = self._get('sync_status', source_id)
+                if status is not None:
+                    statuses[source_id] = status
+            return statuses
+
+        return await self._run(_load)
+
+    async def update_sync_status(
+        self,
+        source_id: str,
+        updates: Dict[str, Any],
+        fence: Optional[Tuple[str, int]] = None,
+    ) -> bool:
+        """
+        同期状態を更新（存在しなければ作成。ソースが削除済みなら書き込まず False）
+
+        fence=(リース名, fencing_token) を保持していなければ LeaseNotHeldError
+        """
+        def _update() -> bool:
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                self._check_fence(fence)
+                if self._get('sources', source_id) is None:
+                    return False
+                self._merge('sync_status', source_id, updates, True)
+                return True
+
+        return await self._run(_update)
+
+    async def apply_sync_result(
+        self,
+        source_id: str,
+        status_updates: Dict[str, Any],
+        source_updates: Dict[str, Any],
+        saved_count: int,
+        total_messages: Optional[int] = None,
+        fence: Optional[Tuple[str, int]] = None,
+    ) -> bool:
+        """
+        同期結果を同期状態とソースに1トランザクションで反映
+
+        件数は saved_count だけ加算（total_messages 指定時は上書き）。
+        fence=(リース名, fencing_token) を保持していなければ LeaseNotHeldError
+        """
+        def _apply() -> bool:
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                self._check_fence(fence)
+                source = self._get('sources', source_id)
+                if source is None:
+                    return False
+                status = self._get('sync_status', source_id) or {}
+                status.update(status_updates)
+                if total_messages is None:
+                    status['total_messages'] = status.get('total_messages', 0) + saved_count
+                    source['message_count'] = source.get('message_count', 0) + saved_count
+                else:
+                    status['total_messages'] = source['message_count'] = total_messages
+                self._put('sync_status', source_id, status)
+                source.update(source_updates)
+                self._put('sources', source_id, source)
+                return True
+
+        return await self._run(_apply)
+
+    # ========== Leases ==========
+
+    async def acquire_lease(self, name: str, holder_id: str, ttl_seconds: float) -> Optional[Dict]:
+        """リースを取得・更新（複数プロセスで共有する場合も BEGIN IMMEDIATE で排他）"""
+        def _acquire() -> Optional[Dict]:
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                lease = build_lease(self._get('leases', name), name, holder_id, ttl_seconds, time.time())
+                if lease is not None:
+                    self._put('leases', name, lease)
+                return lease
+
+        return await self._run(_acquire)
+
+    async def release_lease(self, name: str, holder_id: str, fencing_token: int) -> bool:
+        """保持中のリースを手放す"""
+        def _release() -> bool:
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                current = self._get('leases', name)
+                if not current or current.get('holder_id') != holder_id or current.get('fencing_token') != fencing_token:
+                    return False
+                current['expires_at'] = 0
+                self._put('leases', name, current)
+                return True
+
+        return await self._run(_release)
+
+    async def get_lease(self, name: str) -> Optional[Dict]:
+        """リースを取得"""
+        return await self._run(self._get, 'leases', name)
+
+    # ========== Cascading Delete ==========
+
+    def _delete_where(self, statements: List[Tuple[str, Sequence[Any]]]) -> int:
+        """複数の DELETE を1トランザクションで実行し、削除件数を返す"""
+        deleted = 0
+        with self.conn:
+            self.conn.execute("BEGIN")
+            for sql, params in statements:
+                deleted += self.conn.execute(sql, params).rowcount
+        return deleted
+
+    async def delete_source_dependents(
+        self,
+        source_id: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """ソースに紐づくメッセージ・同期状態を削除"""
+        deleted = await self._run(self._delete_where, [
+            ("DELETE FROM messages WHERE source_id = ?", (source_id,)),
+            ("DELETE FROM sync_status WHERE id = ?", (source_id,)),
+        ])
+        if on_progress:
+            on_progress(deleted, deleted)
+        return {"deleted": deleted, "total": deleted, "error": None}
+
+    async def delete_project_dependents(
+        self,
+        project_id: str,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """プロジェクトに紐づくソース・メッセージ・同期状態・課題・要件定義書・開発タスクを削除"""
+        source_ids = "SELECT id FROM sources WHERE project_id = ?"
+        deleted = await self._run(self._delete_where, [
+            (f"DELETE FROM messages WHERE source_id IN ({source_ids})", (project_id,)),
+            (f"DELETE FROM sync_status WHERE id IN ({source_ids})", (project_id,)),
+            ("DELETE FROM sources WHERE project_id = ?", (project_id,)),
+            ("DELETE FROM issues WHERE project_id = ?", (project_id,)),
+            ("DELETE FROM requirements WHERE project_id = ?", (project_id,)),
+            ("DELETE FROM developments WHERE project_id = ?", (project_id,)),
+        ])
+        if on_progress:
+            on_progress(deleted, deleted)
+        return {"deleted": deleted, "total": deleted, "error": None}
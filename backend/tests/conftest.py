@@ -0,0 +1,39 @@
+"""
+テスト共通設定
+
+アプリはローカルバックエンド（SQLite のメモリDB）で起動し、
+外部サービス（Chatwork・GitHub）は未設定として扱い、AI エージェントは実行しない。
+実行: cd backend && python -m pytest
+"""
+
+import os
+
+os.environ["DATABASE_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = ":memory:"
+os.environ["POLLING_LEADER_ELECTION"] = "false"
+os.environ["DB_CALL_BUDGET"] = "warn"
+for key in ("CHATWORK_API_TOKEN", "GITHUB_TOKEN", "GITHUB_REPO"):
+    os.environ.pop(key, None)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import developments, issues, requirements
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def no_background_agents(monkeypatch):
+    """BackgroundTasks で起動する AI エージェントの処理は実行しない"""
+    async def _noop(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(issues, "_run_extraction", _noop)
+    monkeypatch.setattr(requirements, "_run_generation", _noop)
+    monkeypatch.setattr(developments, "_run_development_pipeline", _noop)
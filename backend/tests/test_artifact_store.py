@@ -0,0 +1,52 @@
+"""
+成果物ストア（生成ファイルの内容）のテスト
+"""
+
+import uuid
+
+from app.models.development import Development, GeneratedFile
+from app.services.artifact_store import artifact_store
+from app.services.database import db
+
+
+def _create_development(client, content: str) -> str:
+    development_id = f"development-{uuid.uuid4().hex[:8]}"
+
+    async def _create():
+        await db.create_development(Development(id=development_id, project_id="artifacts", requirement_id="r"))
+        refs = await artifact_store.save_files([GeneratedFile(path="main.py", content=content, language="python")])
+        await db.update_development(development_id, {"generated_files": refs})
+
+    client.portal.call(_create)
+    return development_id
+
+
+def test_download_restores_stored_content(client):
+    content = f"print('{uuid.uuid4().hex}')"
+    development_id = _create_development(client, content)
+
+    response = client.get(f"/api/developments/{development_id}")
+    assert response.status_code == 200
+    assert response.json()["generated_files"][0]["content"] == content
+
+    assert client.get(f"/api/developments/{development_id}/download").status_code == 200
+
+
+def test_missing_artifact_is_an_error(client):
+    """成果物が欠けていれば空ファイルとして返さずエラーにする"""
+    content = f"print('{uuid.uuid4().hex}')"
+    development_id = _create_development(client, content)
+    content_hash = artifact_store.content_hash(content)
+
+    async def _drop_artifact():
+        def _delete():
+            with db.conn:
+                db.conn.execute("DELETE FROM artifacts WHERE id = ?", (content_hash,))
+        await db._run(_delete)
+
+    client.portal.call(_drop_artifact)
+
+    response = client.get(f"/api/developments/{development_id}/download")
+    assert response.status_code == 500
+    assert response.json()["error_code"] == "ARTIFACT_MISSING"
+    assert response.json()["details"]["content_hashes"] == [content_hash]
@@ -0,0 +1,46 @@
+"""
+エンティティキャッシュ（LRUCache）のテスト
+"""
+
+from app.services.cache import LRUCache
+
+
+def test_set_after_invalidate_during_read_is_dropped():
+    """読込中に invalidate されたキーは、読み込んだ（更新前の）値をキャッシュしない"""
+    cache = LRUCache()
+    generation = cache.generation("projects", "p1")
+    cache.invalidate("projects", "p1")  # 読込の await 中に更新が完了した
+    cache.set("projects", "p1", {"name": "old"}, 60, generation)
+    assert cache.get("projects", "p1") == (False, None)
+
+    # invalidate 後に始めた読込はキャッシュする
+    generation = cache.generation("projects", "p1")
+    cache.set("projects", "p1", {"name": "new"}, 60, generation)
+    assert cache.get("projects", "p1") == (True, {"name": "new"})
+
+
+def test_invalidate_of_other_key_does_not_drop_set():
+    cache = LRUCache()
+    generation = cache.generation("projects", "p1")
+    cache.invalidate("projects", "p2")
+    cache.set("projects", "p1", {"name": "p1"}, 60, generation)
+    assert cache.get("projects", "p1") == (True, {"name": "p1"})
+
+
+def test_namespace_invalidate_drops_pending_sets():
+    cache = LRUCache()
+    generation = cache.generation("sources:list", "default")
+    cache.invalidate("sources:list")
+    cache.set("sources:list", "default", [], 60, generation)
+    assert cache.get("sources:list", "default") == (False, None)
+
+
+def test_overflowed_invalidation_records_drop_older_reads():
+    """invalidate の記録が max_size を超えたら、それより前に始めた読込は安全側で捨てる"""
+    cache = LRUCache(max_size=2)
+    generation = cache.generation("projects", "p1")
+    cache.invalidate("projects", "p1")
+    cache.invalidate("projects", "p2")
+    cache.invalidate("projects", "p3")  # p1 の記録が溢れる
+    cache.set("projects", "p1", {"name": "old"}, 60, generation)
+    assert cache.get("projects", "p1") == (False, None)
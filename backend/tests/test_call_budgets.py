@@ -0,0 +1,191 @@
+"""
+エンドポイントのDB呼び出し回数の上限（call_budget）のテスト
+
+各ルーターのエンドポイントを SQLite バックエンドで実行し、
+宣言した読込・書込の上限を超えたら失敗させる（N+1 読込などの回帰検出）
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.exceptions import CallBudgetExceededError
+from app.models.development import Development, GeneratedFile
+from app.models.issue import Issue, PainLevel
+from app.models.message import ChatworkMessage
+from app.models.project import Project
+from app.models.requirement import Requirement
+from app.models.source import Source, SourceType
+from app.services.database import db
+from app.services.db_metrics import call_budget, db_metrics
+
+
+# (call_budget 名, メソッド, パス, リクエストの追加引数)。パスの {…} は seeded の ID で置換
+ENDPOINT_CALLS = [
+    ("projects.list_projects", "GET", "/api/projects/", {}),
+    ("projects.get_project", "GET", "/api/projects/{project_id}", {}),
+    ("projects.create_project", "POST", "/api/projects/", {"json": {"name": "new"}}),
+    ("projects.update_project", "PATCH", "/api/projects/{project_id}", {"json": {"name": "renamed"}}),
+    ("projects.delete_project", "DELETE", "/api/projects/{project_id}", {}),
+    ("projects.get_delete_job", "GET", "/api/projects/delete-jobs/unknown", {}),
+    ("sources.get_chatwork_status", "GET", "/api/sources/chatwork/status", {}),
+    ("sources.get_chatwork_rooms", "GET", "/api/sources/chatwork/rooms", {}),
+    ("sources.get_chatwork_room_info", "GET", "/api/sources/chatwork/rooms/1", {}),
+    ("sources.list_sources", "GET", "/api/sources/?project_id={project_id}", {}),
+    ("sources.get_source", "GET", "/api/sources/{source_id}", {}),
+    ("sources.upload_file", "POST", "/api/sources/upload?project_id={project_id}",
+     {"files": {"file": ("log.txt", b"line1\nline2", "text/plain")}}),
+    ("sources.connect_chatwork", "POST", "/api/sources/chatwork",
+     {"json": {"room_id": "2", "room_name": "room", "project_id": "{project_id}"}}),
+    ("sources.get_source_messages", "GET", "/api/sources/{source_id}/messages", {}),
+    ("sources.get_stored_messages", "GET", "/api/sources/{source_id}/stored-messages", {}),
+    ("sources.delete_source", "DELETE", "/api/sources/{source_id}", {}),
+    ("sources.get_delete_job", "GET", "/api/sources/delete-jobs/unknown", {}),
+    ("issues.list_issues", "GET", "/api/issues/?project_id={project_id}", {}),
+    ("issues.get_issue", "GET", "/api/issues/{issue_id}", {}),
+    ("issues.extract_issues", "POST", "/api/issues/extract",
+     {"json": {"project_id": "{project_id}", "source_id": "{source_id}", "content": "log"}}),
+    ("issues.update_issue_status", "PATCH", "/api/issues/{issue_id}/status?status=selected", {}),
+    ("issues.select_issue", "POST", "/api/issues/{issue_id}/select", {}),
+    ("issues.delete_issue", "DELETE", "/api/issues/{issue_id}", {}),
+    ("requirements.list_requirements", "GET", "/api/requirements/?project_id={project_id}", {}),
+    ("requirements.get_requirement", "GET", "/api/requirements/{requirement_id}", {}),
+    ("requirements.generate_requirement", "POST", "/api/requirements/generate",
+     {"json": {"project_id": "{project_id}", "issue_ids": ["{issue_id}"]}}),
+    ("requirements.update_requirement", "PATCH", "/api/requirements/{requirement_id}",
+     {"json": {"markdown_content": "# updated"}}),
+    ("requirements.approve_requirement", "POST", "/api/requirements/{requirement_id}/approve", {}),
+    ("requirements.create_github_issue", "POST", "/api/requirements/{requirement_id}/create-github-issue", {}),
+    ("requirements.delete_requirement", "DELETE", "/api/requirements/{requirement_id}", {}),
+    ("developments.list_developments", "GET", "/api/developments/?project_id={project_id}", {}),
+    ("developments.get_development", "GET", "/api/developments/{development_id}", {}),
+    ("developments.get_agent_logs", "GET", "/api/developments/{development_id}/logs", {}),
+    ("developments.start_development", "POST", "/api/developments/start",
+     {"json": {"project_id": "{project_id}", "requirement_id": "{requirement_id}"}}),
+    ("developments.get_github_status", "GET", "/api/developments/github/status", {}),
+    ("developments.create_pull_request", "POST", "/api/developments/{development_id}/create-pr", {}),
+    ("developments.download_generated_code", "GET", "/api/developments/{development_id}/download", {}),
+    ("polling.get_polling_status", "GET", "/api/polling/status", {}),
+    ("polling.get_polling_metrics", "GET", "/api/polling/metrics", {}),
+    ("polling.start_polling", "POST", "/api/polling/start", {}),
+    ("polling.stop_polling", "POST", "/api/polling/stop", {}),
+    ("polling.configure_polling", "POST", "/api/polling/config", {"json": {"interval_seconds": 60}}),
+    ("polling.get_all_sync_status", "GET", "/api/polling/sync-status?project_id={project_id}", {}),
+    ("polling.get_source_sync_status", "GET", "/api/polling/sync-status/{source_id}", {}),
+]
+
+
+def _fill(value, ids):
+    """リクエスト定義内の {…} を seeded の ID で置換"""
+    if isinstance(value, str):
+        return value.format(**ids)
+    if isinstance(value, dict):
+        return {key: _fill(item, ids) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, ids) for item in value]
+    return value
+
+
+@pytest.fixture
+def seeded(client):
+    """テストごとに独立したプロジェクト・ソース・課題・要件定義書・開発タスクを作成"""
+    suffix = uuid.uuid4().hex[:8]
+    ids = {
+        "project_id": f"project-{suffix}",
+        "source_id": f"source-{suffix}",
+        "issue_id": f"issue-{suffix}",
+        "requirement_id": f"requirement-{suffix}",
+        "development_id": f"development-{suffix}",
+    }
+    now = datetime.now()
+
+    async def _seed():
+        await db.create_project(Project(id=ids["project_id"], name="project", created_at=now, updated_at=now))
+        await db.create_source(Source(
+            id=ids["source_id"],
+            project_id=ids["project_id"],
+            type=SourceType.CHATWORK_ROOM,
+            label="room",
+            chatwork={"room_id": f"room-{suffix}", "room_name": "room"},
+        ))
+        await db.save_messages_batch([
+            ChatworkMessage(
+                id=f"{suffix}-{i}",
+                source_id=ids["source_id"],
+                room_id=f"room-{suffix}",
+                body=f"message {i}",
+                account_id="1",
+                account_name="user",
+                send_time=now,
+            )
+            for i in range(3)
+        ])
+        await db.create_issue(Issue(
+            id=ids["issue_id"],
+            project_id=ids["project_id"],
+            source_id=ids["source_id"],
+            source_type="chatwork_room",
+            source_label="room",
+            title="issue",
+            description="issue",
+            category="ops",
+            pain_level=PainLevel.HIGH,
+            original_context="context",
+            tech_approach="approach",
+            expected_outcome="outcome",
+            extraction_batch_id="batch",
+        ))
+        await db.create_requirement(Requirement(
+            id=ids["requirement_id"],
+            project_id=ids["project_id"],
+            issue_id=ids["issue_id"],
+            title="requirement",
+            background="background",
+            problem_statement="problem",
+            tech_approach="approach",
+            markdown_content="# requirement",
+        ))
+        await db.create_development(Development(
+            id=ids["development_id"],
+            project_id=ids["project_id"],
+            requirement_id=ids["requirement_id"],
+            generated_files=[GeneratedFile(path="main.py", content="print(1)", language="python")],
+        ))
+
+    client.portal.call(_seed)
+    return ids
+
+
+def test_every_budgeted_endpoint_is_exercised():
+    """call_budget を宣言したエンドポイントはすべて ENDPOINT_CALLS で実行する"""
+    assert {name for name, *_ in ENDPOINT_CALLS} == set(db_metrics.budgets)
+
+
+@pytest.mark.parametrize("name,method,path,kwargs", ENDPOINT_CALLS, ids=[c[0] for c in ENDPOINT_CALLS])
+def test_endpoint_stays_within_call_budget(client, seeded, name, method, path, kwargs):
+    violations = db_metrics.budgets[name]["violations"]
+
+    with db_metrics.strict_budgets():
+        response = client.request(method, _fill(path, seeded), **_fill(kwargs, seeded))
+
+    body = response.json() if response.headers.get("content-type") == "application/json" else {}
+    assert not (isinstance(body, dict) and body.get("error_code") == "CALL_BUDGET_EXCEEDED"), body
+    assert db_metrics.budgets[name]["violations"] == violations
+    assert response.status_code < 500, response.text
+
+
+def test_strict_mode_fails_over_budget_endpoint(client, seeded):
+    @call_budget(reads=1)
+    async def over_budget():
+        await db.get_project(seeded["project_id"])
+        await db.get_source(seeded["source_id"])
+
+    try:
+        with db_metrics.strict_budgets():
+            with pytest.raises(CallBudgetExceededError):
+                client.portal.call(over_budget)
+        # warn（本番）では記録だけしてリクエストは失敗させない
+        client.portal.call(over_budget)
+    finally:
+        db_metrics.budgets.pop("test_call_budgets.over_budget")
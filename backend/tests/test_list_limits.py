@@ -0,0 +1,71 @@
+"""
+一覧APIの limit / cursor のテスト
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.services.database import LIST_PAGE_SIZE, MAX_LIST_PAGE_SIZE, encode_cursor
+
+
+LIST_PATHS = [
+    "/api/issues/",
+    "/api/requirements/",
+    "/api/developments/",
+    "/api/sources/unknown/stored-messages",
+]
+
+
+@pytest.mark.parametrize("path", LIST_PATHS)
+@pytest.mark.parametrize("limit", [0, -1, MAX_LIST_PAGE_SIZE + 1])
+def test_invalid_limit_is_rejected(client, path, limit):
+    response = client.get(path, params={"limit": limit})
+    assert response.status_code == 422
+
+
+def test_list_is_paged_by_default(client):
+    """limit 未指定でも既定の件数で区切り、続きはカーソルで取得する"""
+    project_id = "paging"
+    created = 0
+    while created < LIST_PAGE_SIZE + 1:
+        response = client.post("/api/developments/start", json={"project_id": project_id, "requirement_id": "r"})
+        assert response.status_code == 200
+        created += 1
+
+    first = client.get("/api/developments/", params={"project_id": project_id, "view": "summary"})
+    assert len(first.json()) == LIST_PAGE_SIZE
+    cursor = first.headers["X-Next-Cursor"]
+
+    rest = client.get("/api/developments/", params={"project_id": project_id, "view": "summary", "cursor": cursor})
+    assert len(rest.json()) == 1
+    assert "X-Next-Cursor" not in rest.headers
+
+
+
+def _cursor(order_field: str) -> str:
+    return encode_cursor({order_field: datetime(2024, 1, 1), "id": "a"})
+
+
+@pytest.mark.parametrize("path,cursor", [
+    ("/api/issues/", "not-a-cursor"),
+    ("/api/issues/", encode_cursor({"x": 1})),
+    # 並び順の違う一覧のカーソル
+    ("/api/issues/", _cursor("created_at")),
+    ("/api/requirements/", _cursor("extracted_at")),
+    ("/api/developments/", _cursor("send_time")),
+    ("/api/issues/", _cursor("send_time")),
+])
+def test_cursor_of_another_list_is_rejected(client, path, cursor):
+    response = client.get(path, params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "VALIDATION_ERROR"
+
+
+@pytest.mark.parametrize("path,order_field", [
+    ("/api/issues/", "extracted_at"),
+    ("/api/requirements/", "created_at"),
+    ("/api/developments/", "created_at"),
+])
+def test_cursor_of_same_list_is_accepted(client, path, order_field):
+    assert client.get(path, params={"cursor": _cursor(order_field)}).status_code == 200
@@ -0,0 +1,114 @@
+"""
+Chatwork ポーリング（同期処理）のテスト
+
+Chatwork API はテストごとの偽実装に差し替え、SQLite バックエンドに書き込む
+"""
+
+import uuid
+
+import pytest
+
+from app.exceptions import LeaseNotHeldError
+from app.models.source import Source, SourceType
+from app.services.chatwork_service import chatwork_service
+from app.services.database import db
+from app.services.polling_service import PollingService
+
+
+def _message(message_id: str) -> dict:
+    return {
+        "message_id": message_id,
+        "body": f"message {message_id}",
+        "account": {"account_id": 1, "name": "user"},
+        "send_time": 0,
+    }
+
+
+@pytest.fixture
+def source_id(client):
+    source_id = f"source-{uuid.uuid4().hex[:8]}"
+    client.portal.call(db.create_source, Source(
+        id=source_id,
+        project_id="polling",
+        type=SourceType.CHATWORK_ROOM,
+        label="room",
+        chatwork={"room_id": f"room-{source_id}", "room_name": "room"},
+    ))
+    return source_id
+
+
+def test_source_deleted_during_sync_leaves_no_orphans(client, monkeypatch, source_id):
+    """同期中にソースが削除されたら、その間に書き込んだメッセージ・同期状態を消す"""
+    async def _get_messages(room_id, force=False):
+        # 取得中に削除 API（ソース削除とカスケード削除）が完了したとする
+        await db.delete_source(source_id)
+        await db.delete_source_dependents(source_id)
+        return [_message("1"), _message("2")]
+
+    monkeypatch.setattr(chatwork_service, "get_messages", _get_messages)
+
+    client.portal.call(PollingService().sync_now, source_id)
+
+    assert client.portal.call(db.get_message_count_by_source, source_id) == 0
+    assert client.portal.call(db.get_sync_status, source_id) is None
+
+
+def test_sync_status_write_is_fenced(client, source_id):
+    """リースを失った（fencing_token が古い）インスタンスは同期状態を書き込めない"""
+    lease_name = f"lease-{source_id}"
+    current = client.portal.call(db.acquire_lease, lease_name, "new-leader", 60)
+
+    with pytest.raises(LeaseNotHeldError):
+        client.portal.call(
+            db.update_sync_status, source_id, {"is_syncing": True},
+            (lease_name, current["fencing_token"] - 1),
+        )
+    assert client.portal.call(db.get_sync_status, source_id) is None
+
+    assert client.portal.call(
+        db.update_sync_status, source_id, {"is_syncing": True},
+        (lease_name, current["fencing_token"]),
+    )
+    assert client.portal.call(db.get_sync_status, source_id)["is_syncing"] is True
+
+
+def test_diff_gap_falls_back_to_full_fetch(client, monkeypatch, source_id):
+    """ルームのメッセージ数の増分より差分が少なければ取りこぼしとみなしてフル取得する"""
+    room = {"message_num": 2, "history": [_message("1"), _message("2")], "diff": []}
+    calls = []
+
+    async def _get_rooms():
+        return [{"room_id": f"room-{source_id}", "message_num": room["message_num"]}]
+
+    async def _get_messages(room_id, force=False):
+        calls.append(force)
+        return room["history"][-100:] if force else room["diff"]
+
+    monkeypatch.setattr(chatwork_service, "get_rooms", _get_rooms)
+    monkeypatch.setattr(chatwork_service, "get_messages", _get_messages)
+    polling = PollingService()
+
+    # 初回はハイウォーターマークがないためフル取得
+    client.portal.call(polling.sync_now, source_id)
+    assert calls == [True]
+
+    # 差分は1件だが、ルームには3件増えている（2件は他の呼び出し元が差分を消費した）
+    room["history"] += [_message("3"), _message("4"), _message("5")]
+    room["message_num"], room["diff"] = 5, [_message("5")]
+    client.portal.call(polling.sync_now, source_id)
+    assert calls == [True, False, True]
+    assert client.portal.call(db.get_message_count_by_source, source_id) == 5
+
+    # 増分と差分が一致していればフル取得しない
+    room["history"].append(_message("6"))
+    room["message_num"], room["diff"] = 6, [_message("6")]
+    client.portal.call(polling.sync_now, source_id)
+    assert calls == [True, False, True, False]
+    assert client.portal.call(db.get_message_count_by_source, source_id) == 6
+
+
+def test_manual_fetch_cannot_consume_diff(client, source_id):
+    """未読差分はポーリング専用（手動取得で消費させない）"""
+    response = client.get(f"/api/sources/{source_id}/messages", params={"force": "false"})
+    assert response.status_code == 400
+    assert "force=false" in response.json()["detail"]
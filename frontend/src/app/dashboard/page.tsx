@@ -38,7 +38,7 @@ import {
   ArrowUp,
   ArrowDown,
 } from 'lucide-react'
-import { issuesAPI, requirementsAPI, sourcesAPI, Issue, Requirement, Source } from '@/lib/api'
+import { issuesAPI, requirementsAPI, sourcesAPI, Issue, RequirementSummary, Source } from '@/lib/api'
 import { useProject } from '@/contexts/project-context'
 
 // カラーパレット（モダンなグラデーション対応）
@@ -71,7 +71,7 @@ export default function DashboardPage() {
   const router = useRouter()
   const { currentProject } = useProject()
   const [issues, setIssues] = useState<Issue[]>([])
-  const [requirements, setRequirements] = useState<Requirement[]>([])
+  const [requirements, setRequirements] = useState<RequirementSummary[]>([])
   const [sources, setSources] = useState<Source[]>([])
   const [isLoading, setIsLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
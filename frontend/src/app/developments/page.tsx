@@ -22,7 +22,7 @@ import {
   Check,
   Download,
 } from 'lucide-react'
-import { developmentsAPI, requirementsAPI, Development, Requirement, GitHubStatus, getErrorMessage, APIError } from '@/lib/api'
+import { developmentsAPI, requirementsAPI, Development, DevelopmentSummary, RequirementSummary, GitHubStatus, getErrorMessage, APIError } from '@/lib/api'
 import { useToast } from '@/components/ui/toast'
 import { ProcessingOverlay } from '@/components/ui/processing-overlay'
 import { useProject } from '@/contexts/project-context'
@@ -82,12 +82,15 @@ const agentLabels: Record<string, string> = {
   pm: 'PM',
 }
 
+// パイプライン実行中（ログが追記されうる）ステータス
+const ACTIVE_STATUSES: Development['status'][] = ['designing', 'coding', 'testing']
+
 export default function DevelopmentsPage() {
   const router = useRouter()
   const toast = useToast()
   const { currentProject } = useProject()
-  const [developments, setDevelopments] = useState<Development[]>([])
-  const [requirements, setRequirements] = useState<Requirement[]>([])
+  const [developments, setDevelopments] = useState<DevelopmentSummary[]>([])
+  const [requirements, setRequirements] = useState<RequirementSummary[]>([])
   const [selectedDev, setSelectedDev] = useState<Development | null>(null)
   const [isLoading, setIsLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
@@ -110,14 +113,23 @@ export default function DevelopmentsPage() {
       setDevelopments(devsData)
       setRequirements(reqsData.filter(r => r.status === 'approved'))
 
-      // 選択中のdevを更新
-      if (selectedDev) {
-        const updated = devsData.find(d => d.id === selectedDev.id)
-        if (updated) {
-          setSelectedDev(updated)
+      // 選択中のdevだけ詳細（生成コード・ログ）を取得。更新がなければ取り直さない
+      const target = selectedDev
+        ? devsData.find(d => d.id === selectedDev.id)
+        : devsData[0]
+      if (target && target.updated_at !== selectedDev?.updated_at) {
+        setSelectedDev(await developmentsAPI.get(target.id))
+      } else if (target && selectedDev && ACTIVE_STATUSES.includes(target.status)) {
+        // ログだけの書き出しは updated_at を変えないため、実行中は新着ログを差分取得する
+        const since = selectedDev.agent_logs.length
+        const { logs } = await developmentsAPI.getLogs(target.id, since)
+        if (logs.length > 0) {
+          setSelectedDev(prev =>
+            prev && prev.id === target.id
+              ? { ...prev, agent_logs: [...prev.agent_logs.slice(0, since), ...logs] }
+              : prev
+          )
         }
-      } else if (devsData.length > 0) {
-        setSelectedDev(devsData[0])
       }
     } catch (err) {
       console.error('Failed to load developments:', err)
@@ -146,6 +158,15 @@ export default function DevelopmentsPage() {
     return () => clearInterval(interval)
   }, [autoRefresh, loadData])
 
+  const selectDevelopment = async (developmentId: string) => {
+    try {
+      setSelectedDev(await developmentsAPI.get(developmentId))
+    } catch (err) {
+      console.error('Failed to load development:', err)
+      toast.error('開発情報の取得に失敗しました', getErrorMessage(err))
+    }
+  }
+
   const handleStartDevelopment = async () => {
     if (!selectedReqId || !currentProject) return
 
@@ -330,7 +351,7 @@ export default function DevelopmentsPage() {
                 return (
                   <button
                     key={dev.id}
-                    onClick={() => setSelectedDev(dev)}
+                    onClick={() => selectDevelopment(dev.id)}
                     className={`w-full rounded-lg border bg-card p-4 text-left transition-all ${
                       selectedDev?.id === dev.id
                         ? 'border-primary ring-2 ring-primary/20'
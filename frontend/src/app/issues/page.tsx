@@ -1,6 +1,6 @@
 'use client'
 
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect, useCallback, useMemo } from 'react'
 import { useRouter } from 'next/navigation'
 import {
   Lightbulb,
@@ -12,7 +12,7 @@ import {
   Loader2,
   RefreshCw,
 } from 'lucide-react'
-import { issuesAPI, requirementsAPI, Issue, getErrorMessage } from '@/lib/api'
+import { issuesAPI, requirementsAPI, Issue, IssueFilters, getErrorMessage } from '@/lib/api'
 import { useToast } from '@/components/ui/toast'
 import { ProcessingOverlay } from '@/components/ui/processing-overlay'
 import { useProject } from '@/contexts/project-context'
@@ -40,28 +40,52 @@ export default function IssuesPage() {
   const toast = useToast()
   const { currentProject } = useProject()
   const [issues, setIssues] = useState<Issue[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [isLoading, setIsLoading] = useState(true)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
   const [selectedIds, setSelectedIds] = useState<Set<string>>(new Set())
   const [filterPainLevel, setFilterPainLevel] = useState<string>('all')
   const [error, setError] = useState<string | null>(null)
   const [isGenerating, setIsGenerating] = useState(false)
 
+  const issueFilters = useMemo<IssueFilters | undefined>(
+    () => (filterPainLevel !== 'all' ? { pain_level: filterPainLevel } : undefined),
+    [filterPainLevel]
+  )
+
   const loadIssues = useCallback(async () => {
     if (!currentProject) return
 
     setIsLoading(true)
     setError(null)
     try {
-      const filters = filterPainLevel !== 'all' ? { pain_level: filterPainLevel } : undefined
-      const data = await issuesAPI.list(currentProject.id, filters)
-      setIssues(data)
+      const page = await issuesAPI.listPage(currentProject.id, issueFilters)
+      setIssues(page.items)
+      setNextCursor(page.nextCursor)
     } catch (err) {
       console.error('Failed to load issues:', err)
       setError(`課題の読み込みに失敗しました: ${getErrorMessage(err)}`)
     } finally {
       setIsLoading(false)
     }
-  }, [filterPainLevel, currentProject])
+  }, [issueFilters, currentProject])
+
+  // 続きのページ（より古い課題）を追加で読み込む
+  const loadMoreIssues = async () => {
+    if (!currentProject || !nextCursor) return
+
+    setIsLoadingMore(true)
+    try {
+      const page = await issuesAPI.listPage(currentProject.id, issueFilters, nextCursor)
+      setIssues((prev) => [...prev, ...page.items])
+      setNextCursor(page.nextCursor)
+    } catch (err) {
+      console.error('Failed to load more issues:', err)
+      toast.error('課題の読み込みに失敗しました', getErrorMessage(err))
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }
 
   useEffect(() => {
     loadIssues()
@@ -153,7 +177,7 @@ export default function IssuesPage() {
                 : 'bg-muted text-muted-foreground'
             }`}
           >
-            すべて ({issues.length})
+            すべて ({issues.length}{nextCursor ? '+' : ''})
           </button>
           <button
             onClick={() => setFilterPainLevel('high')}
@@ -274,6 +298,16 @@ export default function IssuesPage() {
               </div>
             )
           })}
+          {nextCursor && (
+            <button
+              onClick={loadMoreIssues}
+              disabled={isLoadingMore}
+              className="flex w-full items-center justify-center gap-2 rounded-lg border bg-card px-4 py-2 text-sm transition-colors hover:bg-muted"
+            >
+              {isLoadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+              さらに読み込む
+            </button>
+          )}
         </div>
       )}
 
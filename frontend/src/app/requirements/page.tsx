@@ -14,7 +14,7 @@ import {
   Sparkles,
   Trash2,
 } from 'lucide-react'
-import { requirementsAPI, Requirement, getErrorMessage, APIError } from '@/lib/api'
+import { requirementsAPI, Requirement, RequirementSummary, getErrorMessage, APIError } from '@/lib/api'
 import { useToast } from '@/components/ui/toast'
 import ReactMarkdown from 'react-markdown'
 import { useProject } from '@/contexts/project-context'
@@ -33,7 +33,7 @@ export default function RequirementsPage() {
   const toast = useToast()
   const { currentProject } = useProject()
 
-  const [requirements, setRequirements] = useState<Requirement[]>([])
+  const [requirements, setRequirements] = useState<RequirementSummary[]>([])
   const [selectedReq, setSelectedReq] = useState<Requirement | null>(null)
   const [isLoading, setIsLoading] = useState(true)
   const [isGenerating, setIsGenerating] = useState(false)
@@ -51,18 +51,18 @@ export default function RequirementsPage() {
       const data = await requirementsAPI.list(currentProject.id)
       setRequirements(data)
 
-      // URLパラメータで指定されたIDがあれば選択
+      // URLパラメータで指定されたIDがあれば選択（一覧は概要のみのため本文は個別に取得）
       if (targetId) {
         const target = data.find((r) => r.id === targetId)
         if (target) {
-          setSelectedReq(target)
+          setSelectedReq(await requirementsAPI.get(target.id))
           setIsGenerating(false)
         } else {
           // まだ生成中かもしれないので、ポーリング
           setIsGenerating(true)
         }
       } else if (data.length > 0 && !selectedReq) {
-        setSelectedReq(data[0])
+        setSelectedReq(await requirementsAPI.get(data[0].id))
       }
     } catch (err) {
       console.error('Failed to load requirements:', err)
@@ -83,11 +83,11 @@ export default function RequirementsPage() {
 
     const interval = setInterval(async () => {
       try {
-        const data = await requirementsAPI.list()
+        const data = await requirementsAPI.list(currentProject?.id)
         const target = data.find((r) => r.id === targetId)
         if (target) {
           setRequirements(data)
-          setSelectedReq(target)
+          setSelectedReq(await requirementsAPI.get(target.id))
           setIsGenerating(false)
         }
       } catch (err) {
@@ -96,7 +96,16 @@ export default function RequirementsPage() {
     }, 2000)
 
     return () => clearInterval(interval)
-  }, [isGenerating, targetId])
+  }, [isGenerating, targetId, currentProject])
+
+  const selectRequirement = async (requirementId: string) => {
+    try {
+      setSelectedReq(await requirementsAPI.get(requirementId))
+    } catch (err) {
+      console.error('Failed to load requirement:', err)
+      toast.error('要件定義の取得に失敗しました', getErrorMessage(err))
+    }
+  }
 
   const handleApprove = async () => {
     if (!selectedReq) return
@@ -240,7 +249,7 @@ export default function RequirementsPage() {
                 return (
                   <button
                     key={req.id}
-                    onClick={() => setSelectedReq(req)}
+                    onClick={() => selectRequirement(req.id)}
                     className={`w-full rounded-lg border bg-card p-4 text-left transition-all ${
                       selectedReq?.id === req.id
                         ? 'border-primary ring-2 ring-primary/20'
@@ -149,6 +149,12 @@ export interface Requirement {
   updated_at: string
 }
 
+// 一覧用（view=summary）。本文は requirementsAPI.get で取得
+export type RequirementSummary = Pick<
+  Requirement,
+  'id' | 'project_id' | 'issue_id' | 'title' | 'status' | 'github_issue_url' | 'created_at' | 'updated_at'
+>
+
 export interface GenerateResponse {
   status: string
   requirement_id: string
@@ -169,6 +175,14 @@ async function fetchAPI<T>(
   endpoint: string,
   options?: FetchOptions
 ): Promise<T> {
+  return (await fetchWithHeaders<T>(endpoint, options)).data
+}
+
+// レスポンスヘッダー（ページングカーソルなど）も必要な場合用
+async function fetchWithHeaders<T>(
+  endpoint: string,
+  options?: FetchOptions
+): Promise<{ data: T; headers: Headers }> {
   const { maxRetries = 3, timeout = 30000, ...fetchOptions } = options || {}
 
   let lastError: Error | null = null
@@ -216,7 +230,7 @@ async function fetchAPI<T>(
         )
       }
 
-      return res.json()
+      return { data: await res.json(), headers: res.headers }
     } catch (error) {
       if (error instanceof APIError) {
         throw error
@@ -251,6 +265,40 @@ async function fetchAPI<T>(
   throw lastError || new APIError('不明なエラー', 'UNKNOWN_ERROR', 500)
 }
 
+// 一覧APIのページ（続きがあれば nextCursor を次の cursor に渡す）
+export interface Page<T> {
+  items: T[]
+  nextCursor: string | null
+}
+
+// 全件取得時の1ページの件数（バックエンドの MAX_LIST_PAGE_SIZE）
+const FETCH_ALL_PAGE_SIZE = 500
+
+async function fetchPage<T>(
+  endpoint: string,
+  params: URLSearchParams,
+  cursor?: string | null
+): Promise<Page<T>> {
+  const query = new URLSearchParams(params)
+  if (cursor) query.set('cursor', cursor)
+  const { data, headers } = await fetchWithHeaders<T[]>(`${endpoint}?${query}`)
+  return { items: data, nextCursor: headers.get('X-Next-Cursor') }
+}
+
+// X-Next-Cursor をたどって最後のページまで取得（集計や選択肢など全件が必要な箇所用）
+async function fetchAllPages<T>(endpoint: string, params: URLSearchParams): Promise<T[]> {
+  const query = new URLSearchParams(params)
+  query.set('limit', String(FETCH_ALL_PAGE_SIZE))
+  const items: T[] = []
+  let cursor: string | null = null
+  do {
+    const page: Page<T> = await fetchPage<T>(endpoint, query, cursor)
+    items.push(...page.items)
+    cursor = page.nextCursor
+  } while (cursor)
+  return items
+}
+
 // Chatwork Types
 export interface ChatworkStatus {
   configured: boolean
@@ -340,18 +388,27 @@ export const sourcesAPI = {
 }
 
 // Issues API
+export interface IssueFilters {
+  source_id?: string
+  status?: string
+  pain_level?: string
+}
+
+function issueParams(projectId: string, filters?: IssueFilters): URLSearchParams {
+  const params = new URLSearchParams({ project_id: projectId })
+  if (filters?.source_id) params.append('source_id', filters.source_id)
+  if (filters?.status) params.append('status', filters.status)
+  if (filters?.pain_level) params.append('pain_level', filters.pain_level)
+  return params
+}
+
 export const issuesAPI = {
-  list: (projectId = 'default', filters?: {
-    source_id?: string
-    status?: string
-    pain_level?: string
-  }) => {
-    const params = new URLSearchParams({ project_id: projectId })
-    if (filters?.source_id) params.append('source_id', filters.source_id)
-    if (filters?.status) params.append('status', filters.status)
-    if (filters?.pain_level) params.append('pain_level', filters.pain_level)
-    return fetchAPI<Issue[]>(`/api/issues/?${params}`)
-  },
+  list: (projectId = 'default', filters?: IssueFilters) =>
+    fetchAllPages<Issue>('/api/issues/', issueParams(projectId, filters)),
+
+  // 新しい順に1ページ分を取得（続きは nextCursor を渡して取得）
+  listPage: (projectId = 'default', filters?: IssueFilters, cursor?: string | null) =>
+    fetchPage<Issue>('/api/issues/', issueParams(projectId, filters), cursor),
 
   get: (issueId: string) =>
     fetchAPI<Issue>(`/api/issues/${issueId}`),
@@ -380,7 +437,10 @@ export const issuesAPI = {
 // Requirements API
 export const requirementsAPI = {
   list: (projectId = 'default') =>
-    fetchAPI<Requirement[]>(`/api/requirements/?project_id=${projectId}`),
+    fetchAllPages<RequirementSummary>(
+      '/api/requirements/',
+      new URLSearchParams({ project_id: projectId, view: 'summary' })
+    ),
 
   get: (requirementId: string) =>
     fetchAPI<Requirement>(`/api/requirements/${requirementId}`),
@@ -451,6 +511,12 @@ export interface Development {
   updated_at: string
 }
 
+// 一覧用（view=summary）。生成コード・ログは developmentsAPI.get で取得
+export type DevelopmentSummary = Omit<
+  Development,
+  'design_doc' | 'generated_files' | 'test_results' | 'max_retries' | 'agent_logs'
+>
+
 export interface StartDevelopmentResponse {
   status: string
   development_id: string
@@ -472,16 +538,21 @@ export interface CreatePRResponse {
 
 export const developmentsAPI = {
   list: (projectId = 'default', status?: string) => {
-    const params = new URLSearchParams({ project_id: projectId })
+    const params = new URLSearchParams({ project_id: projectId, view: 'summary' })
     if (status) params.append('status', status)
-    return fetchAPI<Development[]>(`/api/developments/?${params}`)
+    return fetchAllPages<DevelopmentSummary>('/api/developments/', params)
   },
 
   get: (developmentId: string) =>
     fetchAPI<Development>(`/api/developments/${developmentId}`),
 
-  getLogs: (developmentId: string) =>
-    fetchAPI<AgentLogEntry[]>(`/api/developments/${developmentId}/logs`),
+  // since 件目以降の新着ログを取得（next を次回の since に渡す）
+  getLogs: async (developmentId: string, since = 0) => {
+    const { data, headers } = await fetchWithHeaders<AgentLogEntry[]>(
+      `/api/developments/${developmentId}/logs?since=${since}`
+    )
+    return { logs: data, next: Number(headers.get('X-Next-Cursor') ?? since + data.length) }
+  },
 
   start: (requirementId: string, projectId = 'default') =>
     fetchAPI<StartDevelopmentResponse>('/api/developments/start', {